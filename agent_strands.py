@@ -213,29 +213,34 @@ def calculate_risk_based_loan_eligibility(inputs: str) -> str:
 #    model_id="apac.anthropic.claude-sonnet-4-20250514-v1:0"
 #)
 
-print("✅ AWS Bedrock model configured for Strands!")
-print("🎯 Ready to create your agentsssssss")
-
 # ===========================================
 # 🔹 Create Strands Agent
 # ===========================================
-budget_agent = Agent(
-    #model=model,
-    tools=[
-        greet_user,
-        verify_aa_data,
-        verify_pan_details,
-        verify_bank_account,
-        calculate_risk_based_loan_eligibility
-    ]
-)
-
-# ===========================================
-# 🔹 Sample Query
-# ===========================================
-sample_query = (
-    "verify bank account details in aa_data.json and extracted_documents_1.json and calculate how much can loan can the user avail"
-)
-
-response = budget_agent(sample_query)
-print("\n🧠 Agent Response:\n", response)
+def create_budget_agent():
+    return Agent(
+        #model=model,
+        tools=[
+            greet_user,
+            verify_aa_data,
+            verify_pan_details,
+            verify_bank_account,
+            calculate_risk_based_loan_eligibility
+        ]
+    )
+
+
+if __name__ == "__main__":
+    print("✅ AWS Bedrock model configured for Strands!")
+    print("🎯 Ready to create your agentsssssss")
+
+    budget_agent = create_budget_agent()
+
+    # ===========================================
+    # 🔹 Sample Query
+    # ===========================================
+    sample_query = (
+        "verify bank account details in aa_data.json and extracted_documents_1.json and calculate how much can loan can the user avail"
+    )
+
+    response = budget_agent(sample_query)
+    print("\n🧠 Agent Response:\n", response)
@@ -0,0 +1,54 @@
+# ============================================================
+# 🔹 Background Artifact Uploader
+# ============================================================
+# GradCAM overlays used to be uploaded with a blocking put_object inside the
+# page loop, so every suspicious page stalled the forensic pipeline on an S3
+# round-trip. ArtifactUploader queues the puts on a small thread pool and
+# retries transient failures; callers keep the returned future and wait on
+# it (DocumentAnalyzerCore.flush_uploads) before the workflow finalizes.
+
+import concurrent.futures
+import os
+import random
+import time
+
+import telemetry
+
+
+class ArtifactUploader:
+    """Concurrent S3 put_object queue with retries, shared across workflows."""
+
+    def __init__(self, s3_client, max_workers=None, max_attempts=None, backoff_s=0.2):
+        self.s3_client = s3_client
+        if max_workers is None:
+            max_workers = int(os.getenv("ARTIFACT_UPLOAD_WORKERS", "8"))
+        if max_attempts is None:
+            max_attempts = int(os.getenv("ARTIFACT_UPLOAD_ATTEMPTS", "3"))
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_s = backoff_s
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="artifact-upload"
+        )
+
+    def _put(self, bucket, key, body, content_type):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with telemetry.span("s3.put_object"):
+                    self.s3_client.put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+                s3_url = f"s3://{bucket}/{key}"
+                print(f"✅ Uploaded to S3: {s3_url}")
+                return s3_url
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    print(f"❌ S3 upload failed after {attempt} attempt(s): {key}: {e}")
+                    raise
+                delay = self.backoff_s * (2 ** (attempt - 1)) * (1 + random.random())
+                print(f"⚠️ S3 upload attempt {attempt} failed for {key}, retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
+
+    def submit(self, bucket, key, body, content_type="image/png") -> concurrent.futures.Future:
+        """Queue one upload; the future resolves to the s3:// URL or raises the last error."""
+        return self._executor.submit(telemetry.in_context(self._put), bucket, key, body, content_type)
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,201 @@
+# ============================================================
+# 🔹 Workflow Job Queue
+# ============================================================
+# Bounded worker pool for long-running verification workflows. Jobs are
+# persisted to a local store so queued/running jobs survive a restart.
+# Progress events reported by the handler are kept in memory for streaming.
+
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds ``max_queue_depth`` pending jobs."""
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class LocalJobStore:
+    """Stand-in persistent backend: one JSON file per job in a local directory."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def save(self, job: dict):
+        path = self._path(job["job_id"])
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump(job, f, indent=2)
+            os.replace(tmp_path, path)
+
+    def load(self, job_id: str):
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def load_all(self) -> list:
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                job = self.load(name[:-len(".json")])
+                if job:
+                    jobs.append(job)
+        return sorted(jobs, key=lambda j: j.get("created_at", ""))
+
+
+class JobQueue:
+    """Runs ``handler(payload, emit)`` for submitted jobs on ``concurrency`` worker threads.
+
+    ``emit(event_dict)`` lets the handler publish progress events for the job.
+    """
+
+    def __init__(self, handler, store, concurrency=2, max_queue_depth=50, max_event_logs=200):
+        self.handler = handler
+        self.store = store
+        self.concurrency = max(1, int(concurrency))
+        self.max_queue_depth = max(1, int(max_queue_depth))
+        self.max_event_logs = max_event_logs
+
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._events = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._stopping = threading.Event()
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        """Re-enqueue unfinished jobs from the store and start the workers."""
+        for job in self.store.load_all():
+            if job["status"] in ("queued", "running"):
+                job["status"] = "queued"
+                job["started_at"] = None
+                self._jobs[job["job_id"]] = job
+                self.store.save(job)
+                self._queue.put(job["job_id"])
+                print(f"♻️ Recovered job {job['job_id']} from previous run")
+
+        for i in range(self.concurrency):
+            worker = threading.Thread(target=self._worker_loop, name=f"workflow-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        print(f"✅ Job queue started with {self.concurrency} worker(s), max depth {self.max_queue_depth}")
+
+    def shutdown(self):
+        """Stop accepting work; unfinished jobs stay persisted for the next start."""
+        self._stopping.set()
+        for _ in self._workers:
+            self._queue.put(None)
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] == "queued")
+
+    def submit(self, payload: dict) -> dict:
+        """Persist and enqueue a new job. Raises QueueFullError when at capacity."""
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job["status"] == "queued")
+            if pending >= self.max_queue_depth:
+                raise QueueFullError(f"Job queue is full ({pending} pending)")
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "status": "queued",
+                "payload": payload,
+                "created_at": _utc_now(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["job_id"]] = job
+            self.store.save(job)
+
+        self._queue.put(job["job_id"])
+        return dict(job)
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        # Finished jobs from a previous run are only on disk
+        return self.store.load(job_id)
+
+    def events_since(self, job_id: str, cursor: int = 0):
+        """Return (events after ``cursor``, finished flag) for a job's progress stream."""
+        with self._lock:
+            log = self._events.get(job_id)
+            events = list(log[cursor:]) if log else []
+        if log:
+            finished = log[-1]["event"] in ("job_completed", "job_failed")
+        else:
+            # No live log (unknown job, or finished before this process started)
+            job = self.get(job_id)
+            finished = job is None or job["status"] in ("completed", "failed")
+        return events, finished
+
+    # -----------------------------
+    # Worker
+    # -----------------------------
+    def _record_event(self, job_id, event: dict):
+        with self._lock:
+            if job_id not in self._events:
+                self._events[job_id] = []
+                # Keep progress logs for the most recent jobs only
+                while len(self._events) > self.max_event_logs:
+                    self._events.popitem(last=False)
+            self._events[job_id].append({"job_id": job_id, **event})
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            snapshot = dict(job)
+        self.store.save(snapshot)
+        return snapshot
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+
+            job = self._update(job_id, status="running", started_at=_utc_now())
+            self._record_event(job_id, {"event": "job_started", "timestamp": job["started_at"]})
+            print(f"⚙️ Job {job_id} started")
+            try:
+                result = self.handler(job["payload"], lambda event: self._record_event(job_id, event))
+                job = self._update(job_id, status="completed", result=result, finished_at=_utc_now())
+                self._record_event(job_id, {"event": "job_completed", "timestamp": job["finished_at"]})
+                print(f"✅ Job {job_id} completed")
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                job = self._update(job_id, status="failed", error=detail, finished_at=_utc_now())
+                self._record_event(job_id, {"event": "job_failed", "timestamp": job["finished_at"], "error": detail})
+                print(f"❌ Job {job_id} failed: {detail}")
+            finally:
+                # Finished jobs are served from the store; keep memory bounded
+                with self._lock:
+                    if self._jobs.get(job_id, {}).get("status") in ("completed", "failed"):
+                        self._jobs.pop(job_id, None)
@@ -1,7 +1,9 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+from typing import List, Optional
+import asyncio
 import json
 import os
 import sys
@@ -11,11 +13,29 @@ from botocore.exceptions import ClientError
 import tempfile
 import shutil
 import io
+import threading
+from contextlib import asynccontextmanager
 
 # Add parent directory to path to import orchestration_agent
 sys.path.append(str(Path(__file__).parent.parent))
+# Backend-only helper modules live next to this file
+sys.path.append(str(Path(__file__).parent))
 
 from orchestration_strands import VerificationOrchestrator
+from model_registry import ModelRegistry
+import telemetry
+from result_cache import WorkflowResultCache
+from job_queue import JobQueue, LocalJobStore, QueueFullError
+from s3_downloader import download_customer_folder
+from s3_cache import S3ReadCache
+from state_store import (
+    STATUS_NEW,
+    STATUS_APPROVED,
+    STATUS_ESCALATED,
+    create_state_store,
+    import_legacy_s3_lists,
+    sync_new_applications,
+)
 
 # Helper function to make objects JSON serializable
 def make_serializable(obj):
@@ -38,80 +58,131 @@ def make_serializable(obj):
 
 # S3 Configuration
 S3_BUCKET_NAME = "documents-loaniq"
+S3_DOWNLOAD_CONCURRENCY = int(os.getenv("S3_DOWNLOAD_CONCURRENCY", "8"))
 s3_client = boto3.client('s3')
 
-# Helper functions for S3 operations
-def download_json_from_s3(key: str) -> list:
-    """Download and parse JSON file from S3"""
-    try:
-        response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=key)
-        content = response['Body'].read().decode('utf-8')
-        return json.loads(content)
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            return []  # Return empty list if file doesn't exist
-        raise
-
-def upload_json_to_s3(key: str, data: list):
-    """Upload JSON data to S3"""
-    json_content = json.dumps(data, indent=2)
-    s3_client.put_object(
-        Bucket=S3_BUCKET_NAME,
-        Key=key,
-        Body=json_content.encode('utf-8'),
-        ContentType='application/json'
-    )
+# Read-through cache for S3 objects served by the read endpoints (see s3_cache.py)
+S3_CACHE_MAX_ENTRIES = int(os.getenv("S3_CACHE_MAX_ENTRIES", "256"))
+S3_CACHE_TTL = float(os.getenv("S3_CACHE_TTL", "30"))
+RESULTS_CACHE_TTL = float(os.getenv("RESULTS_CACHE_TTL", "60"))
+GRADCAM_CACHE_TTL = float(os.getenv("GRADCAM_CACHE_TTL", "300"))
+s3_cache = S3ReadCache(s3_client, S3_BUCKET_NAME, max_entries=S3_CACHE_MAX_ENTRIES, default_ttl=S3_CACHE_TTL)
 
-def download_customer_folder_from_s3(customer_id: str, local_path: str):
+# Helper functions for S3 operations
+def download_customer_folder_from_s3(customer_id: str, local_path: str) -> dict:
     """Download all files for a customer from S3 to local temp directory"""
-    prefix = f"{customer_id}/"
-    
-    # List all objects with the customer_id prefix
-    response = s3_client.list_objects_v2(Bucket=S3_BUCKET_NAME, Prefix=prefix)
+    with telemetry.span("s3.download_documents"):
+        report = download_customer_folder(
+            s3_client,
+            S3_BUCKET_NAME,
+            customer_id,
+            local_path,
+            max_workers=S3_DOWNLOAD_CONCURRENCY
+        )
     
-    if 'Contents' not in response:
+    if report["files"] == 0:
         raise HTTPException(status_code=404, detail=f"No documents found for customer {customer_id}")
     
-    # Create local directory
-    os.makedirs(local_path, exist_ok=True)
-    
-    # Download each file
-    for obj in response['Contents']:
-        key = obj['Key']
-        if key == prefix:  # Skip the folder itself
-            continue
-        
-        # Skip gradcam images (they're generated outputs, not inputs)
-        if '/gradcam/' in key or '/offer_letter_gradcam/' in key:
-            print(f"⏭️  Skipping GradCAM image: {key}")
-            continue
-        
-        # Get filename from key
-        filename = key.replace(prefix, '')
-        local_file_path = os.path.join(local_path, filename)
-        
-        # Create subdirectories if needed
-        local_file_dir = os.path.dirname(local_file_path)
-        if local_file_dir:
-            os.makedirs(local_file_dir, exist_ok=True)
-        
-        # Download file
-        s3_client.download_file(S3_BUCKET_NAME, key, local_file_path)
-        print(f"📥 Downloaded: {key} -> {local_file_path}")
+    return report
 
 def upload_results_to_s3(customer_id: str, results: dict):
     """Upload results.json to S3 for a customer"""
     key = f"{customer_id}/results.json"
     json_content = json.dumps(results, indent=2)
-    s3_client.put_object(
-        Bucket=S3_BUCKET_NAME,
-        Key=key,
-        Body=json_content.encode('utf-8'),
-        ContentType='application/json'
-    )
+    with telemetry.span("s3.put_results"):
+        s3_client.put_object(
+            Bucket=S3_BUCKET_NAME,
+            Key=key,
+            Body=json_content.encode('utf-8'),
+            ContentType='application/json'
+        )
+    s3_cache.invalidate(key)
     print(f"📤 Uploaded results to S3: {key}")
 
-app = FastAPI(title="Loan Verification API")
+# Process-wide models and clients, loaded once at startup and shared by every workflow
+model_registry = ModelRegistry(s3_bucket=S3_BUCKET_NAME, s3_client=s3_client)
+
+# Application status store (see state_store.py): "sqlite" (default) or legacy "s3" lists
+STATE_STORE_BACKEND = os.getenv("STATE_STORE_BACKEND", "sqlite")
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", str(Path(__file__).parent / "state.db"))
+state_store = create_state_store(STATE_STORE_BACKEND, STATE_DB_PATH, s3_client, S3_BUCKET_NAME, cache=s3_cache)
+
+# New applications are still appended to new_applications.json in S3; pull
+# unseen IDs into the store every STATE_SYNC_INTERVAL seconds and on lookup misses
+STATE_SYNC_INTERVAL = float(os.getenv("STATE_SYNC_INTERVAL", "30"))
+_state_sync_stop = threading.Event()
+
+def sync_intake(fresh=False) -> int:
+    """Import applications added to the S3 intake list since the last sync"""
+    try:
+        return sync_new_applications(state_store, s3_client, S3_BUCKET_NAME, cache=s3_cache,
+                                     cache_ttl=0 if fresh else STATE_SYNC_INTERVAL)
+    except Exception as e:
+        print(f"⚠️ Intake sync failed: {e}")
+        return 0
+
+def _state_sync_loop():
+    while not _state_sync_stop.wait(STATE_SYNC_INTERVAL):
+        sync_intake()
+
+def application_statuses(customer_ids: list) -> dict:
+    """Current status per ID, re-syncing the intake list once if any ID is unknown"""
+    statuses = {c: state_store.get_status(c) for c in customer_ids}
+    unknown = [c for c, status in statuses.items() if status is None]
+    if unknown and sync_intake(fresh=True):
+        statuses.update({c: state_store.get_status(c) for c in unknown})
+    return statuses
+
+# Whole-workflow results keyed on input document hashes (see result_cache.py)
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", str(Path(__file__).parent / "result_cache"))
+workflow_result_cache = WorkflowResultCache(RESULT_CACHE_DIR)
+
+# Shared pool sizes for /batch_workflow
+BATCH_CPU_WORKERS = int(os.getenv("BATCH_CPU_WORKERS", "2"))
+BATCH_IO_WORKERS = int(os.getenv("BATCH_IO_WORKERS", "8"))
+
+# Background workflow jobs (see job_queue.py)
+WORKFLOW_CONCURRENCY = int(os.getenv("WORKFLOW_CONCURRENCY", "2"))
+WORKFLOW_MAX_QUEUE = int(os.getenv("WORKFLOW_MAX_QUEUE", "50"))
+JOB_STORE_DIR = os.getenv("JOB_STORE_DIR", str(Path(__file__).parent / "jobs"))
+
+def _run_workflow_job(payload: dict, emit) -> dict:
+    return execute_customer_workflow(
+        payload["customer_id"],
+        progress_callback=emit,
+        force=payload.get("force", False)
+    )
+
+job_queue = JobQueue(
+    _run_workflow_job,
+    LocalJobStore(JOB_STORE_DIR),
+    concurrency=WORKFLOW_CONCURRENCY,
+    max_queue_depth=WORKFLOW_MAX_QUEUE
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load ResNet50, transforms and Bedrock clients before serving requests"""
+    try:
+        import_legacy_s3_lists(state_store, s3_client, S3_BUCKET_NAME)
+    except Exception as e:
+        # Not recorded as done, so the import is retried on the next start
+        print(f"⚠️ Legacy S3 list import failed: {e}")
+    sync_intake(fresh=True)
+    state_sync_thread = None
+    if STATE_SYNC_INTERVAL > 0:
+        state_sync_thread = threading.Thread(target=_state_sync_loop, name="state-sync", daemon=True)
+        state_sync_thread.start()
+    model_registry.load()
+    job_queue.start()
+    yield
+    _state_sync_stop.set()
+    if state_sync_thread is not None:
+        state_sync_thread.join(timeout=5)
+    job_queue.shutdown()
+    model_registry.close()
+
+app = FastAPI(title="Loan Verification API", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -124,6 +195,13 @@ app.add_middleware(
 
 class WorkflowRequest(BaseModel):
     customer_id: str
+    force: bool = False  # Bypass the result cache
+
+class BatchWorkflowRequest(BaseModel):
+    customer_ids: List[str]
+    cpu_workers: Optional[int] = None
+    io_workers: Optional[int] = None
+    force: bool = False
 
 class WorkflowResponse(BaseModel):
     status: str
@@ -136,25 +214,46 @@ async def root():
 
 @app.get("/customers")
 async def get_customers():
-    """Get all customer IDs from new_applications.json in S3"""
+    """Get all customer IDs awaiting verification"""
     try:
-        customers = download_json_from_s3("new_applications.json")
+        customers = state_store.list_by_status(STATUS_NEW)
         return {"customers": customers}
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading customers from S3: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading customers: {str(e)}")
 
-@app.post("/run_workflow", response_model=WorkflowResponse)
-async def run_workflow(request: WorkflowRequest):
-    """Run the verification workflow for a specific customer"""
+def save_workflow_results(customer_id: str, results: dict) -> dict:
+    """Convert orchestrator output to the UI format and upload it as results.json"""
+    # Convert results to JSON-serializable format
+    serializable_results = make_serializable(results)
+    
+    # Prepare results for UI
+    ui_results = {
+        "status": serializable_results.get("status", "unknown"),
+        "errors": serializable_results.get("errors", []),
+        "results": serializable_results.get("results", {}),
+        # Per-stage latency breakdown of this run (see telemetry.py)
+        "timings": serializable_results.get("timings", {})
+    }
+    
+    # Upload results to S3
+    upload_results_to_s3(customer_id, ui_results)
+    
+    # /results and /run_workflow serve dummy_results.json, which is edited next to
+    # results.json, so drop its cached copy too or the UI keeps showing the old run
+    s3_cache.invalidate(f"{customer_id}/dummy_results.json")
+
+    # The run may have replaced GradCAM images for this customer
+    s3_cache.invalidate_prefix(f"{customer_id}/gradcam/")
+    s3_cache.invalidate_prefix(f"{customer_id}/offer_letter_gradcam/")
+    return ui_results
+
+def execute_customer_workflow(customer_id: str, progress_callback=None, force=False) -> dict:
+    """Download a customer's documents, run the workflow and upload results.json"""
     temp_dir = None
     try:
-        customer_id = request.customer_id
-        
-        # Validate customer_id exists in S3
-        customers = download_json_from_s3("new_applications.json")
-        
-        if customer_id not in customers:
+        # Validate customer_id is a new application
+        if application_statuses([customer_id])[customer_id] != STATUS_NEW:
             raise HTTPException(status_code=404, detail=f"Customer ID {customer_id} not found")
         
         # Create temporary directory for customer documents
@@ -169,30 +268,36 @@ async def run_workflow(request: WorkflowRequest):
         
         # Run the orchestration workflow
         print(f"⚙️ Running verification workflow...")
-        orchestrator = VerificationOrchestrator(documents_folder)
-        results = orchestrator.run_workflow()
-        
-        # Convert results to JSON-serializable format
-        serializable_results = make_serializable(results)
-        
-        # Prepare results for UI
-        ui_results = {
-            "status": serializable_results.get("status", "unknown"),
-            "errors": serializable_results.get("errors", []),
-            "results": serializable_results.get("results", {})
-        }
+        orchestrator = model_registry.create_orchestrator(
+            documents_folder,
+            progress_callback=progress_callback,
+            result_cache=workflow_result_cache
+        )
+        results = orchestrator.run_workflow(force=force)
         
-        # Upload results to S3
-        upload_results_to_s3(customer_id, ui_results)
+        ui_results = save_workflow_results(customer_id, results)
         
         print(f"✅ Workflow completed for customer: {customer_id}")
+        return ui_results
+    finally:
+        # Clean up temporary directory
+        if temp_dir and os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+            print(f"🧹 Cleaned up temporary directory")
+
+@app.post("/run_workflow", response_model=WorkflowResponse)
+def run_workflow(request: WorkflowRequest):
+    """Run the verification workflow for a specific customer"""
+    # Plain def: FastAPI runs it in its threadpool, so the multi-minute workflow
+    # does not block the event loop serving /jobs polling and SSE streams
+    try:
+        customer_id = request.customer_id
+        ui_results = execute_customer_workflow(customer_id, force=request.force)
         
         # ⚠️ CHANGED: Return dummy_results.json from S3 instead of real results
         try:
             dummy_key = f"{customer_id}/dummy_results.json"
-            dummy_response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=dummy_key)
-            dummy_content = dummy_response['Body'].read().decode('utf-8')
-            dummy_results = json.loads(dummy_content)
+            dummy_results = s3_cache.get_json(dummy_key, ttl=RESULTS_CACHE_TTL)
             
             print(f"📥 Returning dummy results from S3: {dummy_key}")
             
@@ -205,9 +310,9 @@ async def run_workflow(request: WorkflowRequest):
             # Fallback to real results if dummy file not found
             print(f"⚠️ Dummy results not found, returning real results")
             return WorkflowResponse(
-                status=serializable_results.get("status", "unknown"),
-                results=serializable_results.get("results", {}),
-                errors=serializable_results.get("errors", [])
+                status=ui_results.get("status", "unknown"),
+                results=ui_results.get("results", {}),
+                errors=ui_results.get("errors", [])
             )
     
     except HTTPException:
@@ -217,11 +322,112 @@ async def run_workflow(request: WorkflowRequest):
         print(f"❌ Error in workflow: {str(e)}")
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
-    finally:
-        # Clean up temporary directory
-        if temp_dir and os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-            print(f"🧹 Cleaned up temporary directory")
+
+@app.post("/batch_workflow")
+def run_batch_workflow(request: BatchWorkflowRequest):
+    """Verify many applications at once, streaming one NDJSON line per application as it completes"""
+    customer_ids = list(dict.fromkeys(request.customer_ids))
+    if not customer_ids:
+        raise HTTPException(status_code=400, detail="customer_ids must not be empty")
+    
+    statuses = application_statuses(customer_ids)
+    valid_ids = [c for c in customer_ids if statuses[c] == STATUS_NEW]
+    invalid_ids = [c for c in customer_ids if c not in valid_ids]
+    
+    def stream():
+        temp_root = tempfile.mkdtemp(prefix="batch_")
+        try:
+            for customer_id in invalid_ids:
+                yield json.dumps({
+                    "type": "result",
+                    "loan_id": customer_id,
+                    "status": "error",
+                    "errors": [f"Customer ID {customer_id} not found"]
+                }) + "\n"
+            
+            print(f"🚀 Starting batch workflow for {len(valid_ids)} customer(s)")
+            batch = VerificationOrchestrator.iter_batch(
+                valid_ids,
+                documents_root=temp_root,
+                registry=model_registry,
+                cpu_workers=request.cpu_workers or BATCH_CPU_WORKERS,
+                io_workers=request.io_workers or BATCH_IO_WORKERS,
+                prepare=lambda customer_id, folder: download_customer_folder_from_s3(customer_id, folder),
+                result_cache=workflow_result_cache,
+                force=request.force
+            )
+            for record in batch:
+                if record["type"] == "result":
+                    customer_id = record["loan_id"]
+                    if "result" in record:
+                        try:
+                            record["result"] = save_workflow_results(customer_id, record["result"])
+                        except Exception as e:
+                            record.setdefault("errors", []).append(f"Failed to save results: {str(e)}")
+                    # Free disk as soon as each application is done
+                    shutil.rmtree(os.path.join(temp_root, customer_id), ignore_errors=True)
+                else:
+                    print(f"✅ Batch completed: {record}")
+                yield json.dumps(make_serializable(record)) + "\n"
+        finally:
+            shutil.rmtree(temp_root, ignore_errors=True)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def submit_workflow_job(request: WorkflowRequest):
+    """Queue the verification workflow for a customer and return a job ID immediately"""
+    try:
+        job = job_queue.submit({"customer_id": request.customer_id, "force": request.force})
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    
+    print(f"📨 Queued workflow job {job['job_id']} for customer: {request.customer_id}")
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "customer_id": request.customer_id
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_workflow_job(job_id: str):
+    """Get status (and results once finished) of a queued workflow job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def stream_workflow_job_events(job_id: str):
+    """Server-Sent Events stream of per-node progress for a queued workflow job"""
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def event_stream():
+        cursor = 0
+        idle_polls = 0
+        while True:
+            events, finished = job_queue.events_since(job_id, cursor)
+            cursor += len(events)
+            for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(make_serializable(event))}\n\n"
+
+            if finished:
+                job = job_queue.get(job_id) or {}
+                yield f"event: end\ndata: {json.dumps({'job_id': job_id, 'status': job.get('status', 'unknown')})}\n\n"
+                break
+
+            # Comment line keeps proxies from closing an idle stream
+            idle_polls = 0 if events else idle_polls + 1
+            if idle_polls and idle_polls % 30 == 0:
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/results/{customer_id}")
 async def get_results(customer_id: str):
@@ -232,10 +438,7 @@ async def get_results(customer_id: str):
         key = f"{customer_id}/dummy_results.json"
         
         try:
-            response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=key)
-            content = response['Body'].read().decode('utf-8')
-            results = json.loads(content)
-            return results
+            return s3_cache.get_json(key, ttl=RESULTS_CACHE_TTL)
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
                 raise HTTPException(
@@ -258,18 +461,15 @@ async def get_gradcam_image(customer_id: str, filename: str):
         
         # Try new path first, then fall back to old path
         try:
-            response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=s3_key)
+            image_data = s3_cache.get_bytes(s3_key, ttl=GRADCAM_CACHE_TTL)
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
                 # Try old path
                 s3_key = f"{customer_id}/offer_letter_gradcam/{filename}"
-                response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=s3_key)
+                image_data = s3_cache.get_bytes(s3_key, ttl=GRADCAM_CACHE_TTL)
             else:
                 raise
         
-        # Read image data
-        image_data = response['Body'].read()
-        
         # Return as streaming response
         return StreamingResponse(
             io.BytesIO(image_data),
@@ -289,6 +489,17 @@ async def get_gradcam_image(customer_id: str, filename: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error downloading image: {str(e)}")
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the S3 read-through cache"""
+    return s3_cache.stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Stage latency histograms in Prometheus text format"""
+    body, content_type = telemetry.metrics_payload()
+    return Response(content=body, media_type=content_type)
+
 # Action endpoints
 class ActionRequest(BaseModel):
     customer_id: str
@@ -341,24 +552,9 @@ async def escalate_to_human(request: ActionRequest):
     try:
         customer_id = request.customer_id
         
-        # Load existing escalations from S3
-        escalations = download_json_from_s3("human_escalation.json")
-        
-        # Add customer to escalation list if not already there
-        if customer_id not in escalations:
-            escalations.append(customer_id)
-            
-            # Save to S3
-            upload_json_to_s3("human_escalation.json", escalations)
-            
-            # Remove from new_applications.json in S3
-            new_applications = download_json_from_s3("new_applications.json")
-            
-            if customer_id in new_applications:
-                new_applications.remove(customer_id)
-                upload_json_to_s3("new_applications.json", new_applications)
-                
-                print(f"⚠️ Customer {customer_id} escalated to human verification and removed from new applications")
+        # Atomically move the application into the escalation queue
+        if state_store.transition(customer_id, STATUS_ESCALATED):
+            print(f"⚠️ Customer {customer_id} escalated to human verification and removed from new applications")
             
             return {
                 "status": "success",
@@ -381,24 +577,9 @@ async def approve_loan(request: ActionRequest):
     try:
         customer_id = request.customer_id
         
-        # Load existing approvals from S3
-        approvals = download_json_from_s3("approved_loans.json")
-        
-        # Add customer to approval list if not already there
-        if customer_id not in approvals:
-            approvals.append(customer_id)
-            
-            # Save to S3
-            upload_json_to_s3("approved_loans.json", approvals)
-            
-            # Remove from new_applications.json in S3
-            new_applications = download_json_from_s3("new_applications.json")
-            
-            if customer_id in new_applications:
-                new_applications.remove(customer_id)
-                upload_json_to_s3("new_applications.json", new_applications)
-                
-                print(f"✅ Loan approved for customer: {customer_id} and removed from new applications")
+        # Atomically move the application into the approved list
+        if state_store.transition(customer_id, STATUS_APPROVED):
+            print(f"✅ Loan approved for customer: {customer_id} and removed from new applications")
             
             return {
                 "status": "success",
@@ -417,9 +598,9 @@ async def approve_loan(request: ActionRequest):
 
 @app.get("/approved-loans")
 async def get_approved_loans():
-    """Get list of approved loan IDs from S3"""
+    """Get list of approved loan IDs"""
     try:
-        approved_loans = download_json_from_s3("approved_loans.json")
+        approved_loans = state_store.list_by_status(STATUS_APPROVED)
         return {"approved_loans": approved_loans}
     except Exception as e:
         print(f"Error fetching approved loans: {str(e)}")
@@ -427,9 +608,9 @@ async def get_approved_loans():
 
 @app.get("/human-escalations")
 async def get_human_escalations():
-    """Get list of escalated loan IDs from S3"""
+    """Get list of escalated loan IDs"""
     try:
-        escalations = download_json_from_s3("human_escalation.json")
+        escalations = state_store.list_by_status(STATUS_ESCALATED)
         return {"escalations": escalations}
     except Exception as e:
         print(f"Error fetching escalations: {str(e)}")
@@ -0,0 +1,126 @@
+# ============================================================
+# 🔹 S3 Read-Through Cache
+# ============================================================
+# In-process LRU cache for small S3 objects read by the API (result JSON,
+# GradCAM images, legacy status lists). Entries expire after a per-key TTL
+# and are then revalidated with a conditional GET (IfNoneMatch=ETag), so an
+# unchanged object costs a 304 instead of a full download and parse.
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from botocore.exceptions import ClientError
+
+
+class S3ReadCache:
+    """Size-bounded, TTL-based read-through cache in front of ``get_object``."""
+
+    def __init__(self, s3_client, bucket, max_entries=256, max_bytes=64 * 1024 * 1024, default_ttl=30.0):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        # key -> {"body", "etag", "expires_at", "json"}
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0, "invalidations": 0}
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def _fetch(self, key, etag=None):
+        """GET the object; returns (body, etag), or None when ``etag`` is still current."""
+        kwargs = {"Bucket": self.bucket, "Key": key}
+        if etag:
+            kwargs["IfNoneMatch"] = etag
+        try:
+            response = self.s3_client.get_object(**kwargs)
+        except ClientError as e:
+            if etag and e.response['Error']['Code'] in ("304", "NotModified"):
+                return None
+            raise
+        return response['Body'].read(), response.get('ETag')
+
+    def _get_entry(self, key, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires_at"] > now:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry
+
+        fetched = self._fetch(key, etag=entry["etag"] if entry else None)
+
+        with self._lock:
+            if fetched is None:
+                # 304 Not Modified: keep the cached body, extend its lifetime
+                entry["expires_at"] = time.monotonic() + ttl
+                self._counters["revalidated"] += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                return entry
+
+            body, etag = fetched
+            self._counters["misses"] += 1
+            new_entry = {"body": body, "etag": etag, "expires_at": time.monotonic() + ttl, "json": None}
+            self._store(key, new_entry)
+            return new_entry
+
+    def get_bytes(self, key, ttl=None) -> bytes:
+        """Object body for ``key``; raises ClientError like ``get_object`` (e.g. NoSuchKey)."""
+        return self._get_entry(key, ttl)["body"]
+
+    def get_json(self, key, ttl=None):
+        """Parsed JSON for ``key``. The returned object is shared: treat it as read-only."""
+        entry = self._get_entry(key, ttl)
+        if entry["json"] is None:
+            entry["json"] = json.loads(entry["body"].decode('utf-8'))
+        return entry["json"]
+
+    # -----------------------------
+    # Invalidation and bookkeeping
+    # -----------------------------
+    def _store(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= len(old["body"])
+        if len(entry["body"]) > self.max_bytes:
+            return  # Too large to cache at all
+        self._entries[key] = entry
+        self._total_bytes += len(entry["body"])
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted["body"])
+            self._counters["evictions"] += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= len(entry["body"])
+                self._counters["invalidations"] += 1
+
+    def invalidate_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                entry = self._entries.pop(key)
+                self._total_bytes -= len(entry["body"])
+                self._counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"] + self._counters["revalidated"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hit_ratio": round((self._counters["hits"] + self._counters["revalidated"]) / lookups, 4) if lookups else 0.0,
+            }
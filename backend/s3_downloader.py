@@ -0,0 +1,85 @@
+# ============================================================
+# 🔹 Customer Folder Downloader
+# ============================================================
+# Paginated listing + bounded concurrent downloads of a customer's S3
+# folder. GradCAM output folders are pruned during listing (via the "/"
+# delimiter) so their keys are never listed or downloaded.
+
+import os
+import time
+import concurrent.futures
+
+
+# Generated outputs, not workflow inputs
+EXCLUDED_SUBFOLDERS = ("gradcam", "offer_letter_gradcam")
+
+
+def list_customer_objects(s3_client, bucket, customer_id, excluded_subfolders=EXCLUDED_SUBFOLDERS):
+    """List every object under ``{customer_id}/`` across all pages, skipping excluded subfolders."""
+    prefix = f"{customer_id}/"
+    paginator = s3_client.get_paginator("list_objects_v2")
+
+    objects = []
+    pending_prefixes = [prefix]
+    while pending_prefixes:
+        current = pending_prefixes.pop()
+        for page in paginator.paginate(Bucket=bucket, Prefix=current, Delimiter="/"):
+            for obj in page.get("Contents", []):
+                if obj["Key"] != current:  # Skip the folder marker itself
+                    objects.append(obj)
+
+            for common in page.get("CommonPrefixes", []):
+                sub_prefix = common["Prefix"]
+                folder_name = sub_prefix.rstrip("/").rsplit("/", 1)[-1]
+                if folder_name in excluded_subfolders:
+                    print(f"⏭️  Skipping GradCAM folder: {sub_prefix}")
+                    continue
+                pending_prefixes.append(sub_prefix)
+    return objects
+
+
+def download_customer_folder(s3_client, bucket, customer_id, local_path, max_workers=8):
+    """Download a customer's input documents concurrently.
+
+    Returns a report dict with the file count, total bytes and elapsed seconds.
+    """
+    start = time.perf_counter()
+    prefix = f"{customer_id}/"
+    objects = list_customer_objects(s3_client, bucket, customer_id)
+    list_seconds = time.perf_counter() - start
+
+    os.makedirs(local_path, exist_ok=True)
+
+    def download(obj):
+        key = obj["Key"]
+        local_file_path = os.path.join(local_path, key[len(prefix):])
+
+        # Create subdirectories if needed
+        local_file_dir = os.path.dirname(local_file_path)
+        if local_file_dir:
+            os.makedirs(local_file_dir, exist_ok=True)
+
+        s3_client.download_file(bucket, key, local_file_path)
+        print(f"📥 Downloaded: {key} -> {local_file_path}")
+        return obj.get("Size", 0)
+
+    total_bytes = 0
+    if objects:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(objects)))) as executor:
+            for size in executor.map(download, objects):
+                total_bytes += size
+
+    seconds = time.perf_counter() - start
+    report = {
+        "customer_id": customer_id,
+        "files": len(objects),
+        "bytes": total_bytes,
+        "list_seconds": round(list_seconds, 3),
+        "seconds": round(seconds, 3),
+        "mb_per_s": round(total_bytes / (1024 * 1024) / seconds, 2) if seconds > 0 else 0.0,
+    }
+    print(
+        f"📦 Downloaded {report['files']} file(s), {total_bytes / (1024 * 1024):.2f} MB "
+        f"for {customer_id} in {report['seconds']:.2f}s"
+    )
+    return report
@@ -0,0 +1,324 @@
+# ============================================================
+# 🔹 Application State Store
+# ============================================================
+# Tracks which applications are new, approved or escalated. The default
+# backend is a local SQLite database with an indexed status column and
+# single-statement (atomic) status transitions. The legacy S3 JSON lists
+# are still available as a backend and as the source for a one-time import.
+# new_applications.json stays the intake list: uploads keep appending to it,
+# and sync_new_applications() pulls IDs the store has not seen yet.
+#
+# Usage (one-time import from the legacy S3 lists / intake sync):
+#     python backend/state_store.py import [--force]
+#     python backend/state_store.py sync
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from botocore.exceptions import ClientError
+
+
+STATUS_NEW = "new"
+STATUS_APPROVED = "approved"
+STATUS_ESCALATED = "escalated"
+
+# Legacy S3 list file for each status. Import order sets precedence when an
+# ID appears in several lists: approved wins over escalated wins over new.
+# Bookkeeping values for the S3 backend
+S3_META_KEY = "state_store_meta.json"
+
+LEGACY_LIST_KEYS = {
+    STATUS_APPROVED: "approved_loans.json",
+    STATUS_ESCALATED: "human_escalation.json",
+    STATUS_NEW: "new_applications.json",
+}
+
+
+class ApplicationStateStore(ABC):
+    """Interface for application status storage."""
+
+    @abstractmethod
+    def list_by_status(self, status: str) -> list:
+        """Customer IDs currently in ``status``, oldest transition first."""
+
+    @abstractmethod
+    def get_status(self, customer_id: str):
+        """Current status of ``customer_id``, or None if unknown."""
+
+    @abstractmethod
+    def transition(self, customer_id: str, status: str) -> bool:
+        """Atomically move ``customer_id`` to ``status``.
+
+        Returns False if it was already in that status, True otherwise.
+        """
+
+    @abstractmethod
+    def import_lists(self, lists: dict) -> int:
+        """Add IDs from ``{status: [customer_id, ...]}`` without touching known IDs."""
+
+    @abstractmethod
+    def get_meta(self, key: str):
+        """Stored value of a bookkeeping key (e.g. the legacy import time), or None."""
+
+    @abstractmethod
+    def set_meta(self, key: str, value: str):
+        """Store a bookkeeping key."""
+
+
+class SQLiteApplicationStateStore(ApplicationStateStore):
+    """SQLite-backed store; one connection per thread, WAL journal."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS applications (
+                customer_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_applications_status
+                ON applications (status, updated_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def list_by_status(self, status: str) -> list:
+        rows = self._connect().execute(
+            "SELECT customer_id FROM applications WHERE status = ? ORDER BY updated_at, customer_id",
+            (status,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_status(self, customer_id: str):
+        row = self._connect().execute(
+            "SELECT status FROM applications WHERE customer_id = ?",
+            (customer_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def transition(self, customer_id: str, status: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO applications (customer_id, status, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (customer_id) DO UPDATE
+                    SET status = excluded.status, updated_at = excluded.updated_at
+                    WHERE applications.status != excluded.status
+                """,
+                (customer_id, status, time.time())
+            )
+        return cursor.rowcount > 0
+
+    def import_lists(self, lists: dict) -> int:
+        conn = self._connect()
+        base = time.time()
+        imported = 0
+        with conn:
+            for status in LEGACY_LIST_KEYS:
+                for offset, customer_id in enumerate(lists.get(status, [])):
+                    # Tiny offsets keep each list's original order
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO applications (customer_id, status, updated_at) VALUES (?, ?, ?)",
+                        (customer_id, status, base + offset * 1e-6)
+                    )
+                    imported += cursor.rowcount
+        return imported
+
+    def get_meta(self, key: str):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+
+class S3ListStateStore(ApplicationStateStore):
+    """Legacy backend: one JSON list per status in S3 (read-modify-write per action)."""
+
+    def __init__(self, s3_client, bucket, cache=None, cache_ttl=5.0):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        # Optional S3ReadCache for list reads; writes always read fresh
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        # Only serializes writers inside this process
+        self._lock = threading.Lock()
+
+    def read_list(self, key: str, fresh=False) -> list:
+        try:
+            if self.cache is not None and not fresh:
+                return list(self.cache.get_json(key, ttl=self.cache_ttl))
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+            return json.loads(response['Body'].read().decode('utf-8'))
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return []  # Return empty list if file doesn't exist
+            raise
+
+    def write_list(self, key: str, data: list):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(data, indent=2).encode('utf-8'),
+            ContentType='application/json'
+        )
+        if self.cache is not None:
+            self.cache.invalidate(key)
+
+    def list_by_status(self, status: str) -> list:
+        return self.read_list(LEGACY_LIST_KEYS[status])
+
+    def get_status(self, customer_id: str):
+        for status, key in LEGACY_LIST_KEYS.items():
+            if customer_id in self.read_list(key):
+                return status
+        return None
+
+    def transition(self, customer_id: str, status: str) -> bool:
+        with self._lock:
+            target_key = LEGACY_LIST_KEYS[status]
+            target = self.read_list(target_key, fresh=True)
+            if customer_id in target:
+                return False
+            target.append(customer_id)
+            self.write_list(target_key, target)
+
+            for other_status, key in LEGACY_LIST_KEYS.items():
+                if other_status == status:
+                    continue
+                other = self.read_list(key, fresh=True)
+                if customer_id in other:
+                    other.remove(customer_id)
+                    self.write_list(key, other)
+            return True
+
+    def import_lists(self, lists: dict) -> int:
+        imported = 0
+        with self._lock:
+            known = set()
+            for key in LEGACY_LIST_KEYS.values():
+                known.update(self.read_list(key, fresh=True))
+            for status, key in LEGACY_LIST_KEYS.items():
+                new_ids = [c for c in lists.get(status, []) if c not in known]
+                if new_ids:
+                    self.write_list(key, self.read_list(key, fresh=True) + new_ids)
+                    known.update(new_ids)
+                    imported += len(new_ids)
+        return imported
+
+    def get_meta(self, key: str):
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=S3_META_KEY)
+            return json.loads(response['Body'].read().decode('utf-8')).get(key)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return None
+            raise
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=S3_META_KEY)
+                meta = json.loads(response['Body'].read().decode('utf-8'))
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'NoSuchKey':
+                    raise
+                meta = {}
+            meta[key] = value
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=S3_META_KEY,
+                Body=json.dumps(meta, indent=2).encode('utf-8'),
+                ContentType='application/json'
+            )
+
+
+def import_legacy_s3_lists(store: ApplicationStateStore, s3_client, bucket, force=False) -> int:
+    """One-time import of the legacy S3 JSON lists into ``store``.
+
+    Skipped when the store already recorded an import, unless ``force`` is set.
+    Forced re-imports only add IDs the store has never seen.
+    """
+    if isinstance(store, S3ListStateStore):
+        return 0
+    if not force and store.get_meta("legacy_s3_import_at"):
+        return 0
+
+    legacy = S3ListStateStore(s3_client, bucket)
+    lists = {status: legacy.read_list(key) for status, key in LEGACY_LIST_KEYS.items()}
+    imported = store.import_lists(lists)
+    store.set_meta("legacy_s3_import_at", str(time.time()))
+    print(f"📥 Imported {imported} application(s) from legacy S3 lists")
+    return imported
+
+
+def sync_new_applications(store: ApplicationStateStore, s3_client, bucket, cache=None, cache_ttl=5.0) -> int:
+    """Import IDs from the S3 intake list (new_applications.json) that ``store`` has never seen.
+
+    Known IDs keep their current status, so approved or escalated applications
+    still listed there are not reset to new.
+    """
+    if isinstance(store, S3ListStateStore):
+        return 0
+    intake = S3ListStateStore(s3_client, bucket, cache=cache, cache_ttl=cache_ttl)
+    imported = store.import_lists({STATUS_NEW: intake.list_by_status(STATUS_NEW)})
+    if imported:
+        print(f"📥 Added {imported} new application(s) from {LEGACY_LIST_KEYS[STATUS_NEW]}")
+    return imported
+
+
+def create_state_store(backend: str, db_path: str, s3_client, bucket, cache=None) -> ApplicationStateStore:
+    """Build the configured store: ``sqlite`` (default) or ``s3`` (legacy lists)."""
+    if backend == "s3":
+        return S3ListStateStore(s3_client, bucket, cache=cache)
+    if backend == "sqlite":
+        return SQLiteApplicationStateStore(db_path)
+    raise ValueError(f"Unknown state store backend: {backend}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import boto3
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Application state store maintenance")
+    parser.add_argument("command", choices=["import", "sync"])
+    parser.add_argument("--db", default=os.getenv("STATE_DB_PATH", str(Path(__file__).parent / "state.db")))
+    parser.add_argument("--bucket", default="documents-loaniq")
+    parser.add_argument("--force", action="store_true", help="Re-import even if an import was already recorded")
+    args = parser.parse_args()
+
+    store = SQLiteApplicationStateStore(args.db)
+    if args.command == "sync":
+        count = sync_new_applications(store, boto3.client('s3'), args.bucket)
+    else:
+        count = import_legacy_s3_lists(store, boto3.client('s3'), args.bucket, force=args.force)
+    print(f"✅ {count} application(s) imported into {args.db}")
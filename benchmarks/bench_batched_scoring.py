@@ -0,0 +1,86 @@
+"""
+Page scoring throughput, batch-size-1 forwards vs batched inference.
+
+"before" runs two separate batch-1 forward passes per page (original and ELA)
+like score_image used to; "after" scores every page of every document with
+DocumentAnalyzerCore.score_pages at the given batch sizes. Also checks that
+the per-page ensemble scores and details are identical.
+
+Usage:
+    python benchmarks/bench_batched_scoring.py --folder Documents --batch-sizes 4 8 16 32
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from da_strands import DocumentAnalyzerCore
+from inference_batcher import max_softmax_probs
+
+
+def load_all_pages(analyzer, folder):
+    pages = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(('.pdf', '.png', '.jpg', '.jpeg')):
+            doc_pages, error = analyzer._load_pages(os.path.join(folder, name))
+            if not error:
+                pages.extend(doc_pages)
+    return pages
+
+
+def score_unbatched(analyzer, pages):
+    scores = []
+    for page in pages:
+        orig_tensor, ela_tensor, stats = analyzer._page_inputs(page, analyzer.forensics_max_pixels)
+        prob_orig = max_softmax_probs(analyzer.backend, [orig_tensor], batch_size=1)[0]
+        prob_ela = max_softmax_probs(analyzer.backend, [ela_tensor], batch_size=1)[0]
+        scores.append(analyzer._ensemble(prob_orig, prob_ela, stats))
+    return scores
+
+
+def rounded(scores):
+    return [(round(float(score), 4), details) for score, details in scores]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="Documents")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    analyzer = DocumentAnalyzerCore()
+    pages = load_all_pages(analyzer, args.folder)
+    if not pages:
+        sys.exit(f"No documents found in {args.folder}")
+
+    start = time.perf_counter()
+    baseline = score_unbatched(analyzer, pages)
+    baseline_s = time.perf_counter() - start
+
+    report = {
+        "pages": len(pages),
+        "unbatched": {"seconds": round(baseline_s, 3), "pages_per_s": round(len(pages) / baseline_s, 2)},
+        "batched": {},
+    }
+    for batch_size in args.batch_sizes:
+        analyzer.batch_size = batch_size
+        start = time.perf_counter()
+        scores = analyzer.score_pages(pages)
+        seconds = time.perf_counter() - start
+        report["batched"][batch_size] = {
+            "seconds": round(seconds, 3),
+            "pages_per_s": round(len(pages) / seconds, 2),
+            "speedup": round(baseline_s / seconds, 2),
+            "identical_results": rounded(scores) == rounded(baseline),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Per-page cost of the forensic heuristics: previous PIL path vs single-pass cv2.
+
+"before" reproduces the previous implementation: compute_ela (PIL JPEG save/open
+round-trip through BytesIO), compute_noise_residual (separate grayscale
+conversion) and ela_score (ELA again from scratch, skimage Otsu).
+"after" is forensics.extract_page_forensics, which produces all of the same
+statistics from one decode. Reports ms/page for each and the largest
+absolute difference per statistic (JPEG codec and Otsu implementations
+differ slightly between PIL/skimage and cv2).
+
+Usage:
+    python benchmarks/bench_forensic_features.py --pages 8 --repeats 3
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import cv2
+import numpy as np
+from PIL import Image, ImageChops
+from skimage.filters import threshold_otsu
+
+import forensics
+from bench_forensics_pool import synthetic_page
+
+
+STATS = ("ela_mean", "ela_std", "noise_mean", "noise_std", "ela_region_score")
+
+
+def legacy_ela(pil_img, quality=90):
+    buf = io.BytesIO()
+    pil_img.convert("RGB").save(buf, format="JPEG", quality=quality)
+    buf.seek(0)
+    recompressed = Image.open(buf).convert("RGB")
+    ela_img = ImageChops.difference(pil_img.convert("RGB"), recompressed)
+    max_diff = max([e[1] for e in ela_img.getextrema()]) or 1
+    ela_np = np.clip(np.array(ela_img).astype("float32") * (255.0 / max_diff), 0, 255).astype("uint8")
+    return Image.fromarray(ela_np)
+
+
+def legacy_noise(pil_img):
+    gray = np.array(pil_img.convert("L"))
+    nm = np.abs(cv2.Laplacian(gray, ddepth=cv2.CV_32F, ksize=3))
+    return Image.fromarray((nm / (nm.max() + 1e-8) * 255.0).astype("uint8"))
+
+
+def legacy_region_score(pil_img):
+    ela_gray = np.array(legacy_ela(pil_img).convert('L'))
+    try:
+        thresh = threshold_otsu(ela_gray)
+    except Exception:
+        thresh = 60
+    bw = (ela_gray > max(thresh, 60)).astype('uint8') * 255
+    contours, _ = cv2.findContours(bw, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    page_area = ela_gray.shape[0] * ela_gray.shape[1]
+    large_area = sum(cv2.contourArea(c) for c in contours if cv2.contourArea(c) > (page_area * 0.001))
+    return (forensics.normalize(large_area / page_area, 0.05) * 0.8
+            + forensics.normalize(float(ela_gray.mean()) / 255.0, 0.25) * 0.2)
+
+
+def legacy_features(pil_img):
+    ela_np = np.array(legacy_ela(pil_img).convert("L")).astype("float32") / 255.0
+    noise_np = np.array(legacy_noise(pil_img)).astype("float32") / 255.0
+    return {
+        "ela_mean": float(ela_np.mean()),
+        "ela_std": float(ela_np.std()),
+        "noise_mean": float(noise_np.mean()),
+        "noise_std": float(noise_np.std()),
+        "ela_region_score": legacy_region_score(pil_img),
+    }
+
+
+def time_per_page(fn, pages, repeats):
+    fn(pages[0])  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = [fn(page) for page in pages]
+    return (time.perf_counter() - start) / (repeats * len(pages)) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    pages = [synthetic_page(i) for i in range(args.pages)]
+
+    before_ms, before = time_per_page(legacy_features, pages, args.repeats)
+    after_ms, after = time_per_page(forensics.extract_page_forensics, pages, args.repeats)
+
+    report = {
+        "pages": len(pages),
+        "page_size": list(pages[0].size),
+        "before_ms_per_page": round(before_ms, 2),
+        "after_ms_per_page": round(after_ms, 2),
+        "speedup": round(before_ms / after_ms, 2),
+        "max_abs_diff": {
+            key: round(max(abs(b[key] - a[key]) for b, a in zip(before, after)), 6) for key in STATS
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Full-resolution forensics vs the resolution-capped pyramid.
+
+Scores every page of every document in --folder (plus synthetic 200-DPI A4
+pages and 12 MP "phone photo" pages when --synthetic is given) twice with
+DocumentAnalyzerCore.score_pages_with_features: once with
+forensics_max_pixels=0 (full resolution everywhere) and once per
+--max-pixels cap, refining borderline pages at full resolution. Reports
+seconds, speedup, pages refined, ensemble score drift and how many pages
+changed tamper decision (score >= threshold) or tampering level.
+
+Usage:
+    python benchmarks/bench_forensic_pyramid.py --folder Documents --max-pixels 500000 1000000 2000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from PIL import Image
+
+import page_store
+from da_strands import DocumentAnalyzerCore
+from bench_forensics_pool import synthetic_page
+
+
+def load_pages(folder, synthetic):
+    pages = []
+    if os.path.isdir(folder):
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if name.lower().endswith('.pdf'):
+                pages.extend(page_store.iter_pdf_pages(path))
+            elif name.lower().endswith(('.png', '.jpg', '.jpeg')):
+                pages.append(Image.open(path).convert("RGB"))
+    for i in range(synthetic):
+        page = synthetic_page(i)
+        pages.append(page)
+        # Phone photo sized upload (~12 MP)
+        pages.append(page.resize((page.width * 9 // 5, page.height * 9 // 5), Image.BICUBIC))
+    return pages
+
+
+def level(score):
+    return "High" if score > 0.6 else "Medium" if score >= 0.55 else "Low"
+
+
+def run(analyzer, pages, max_pixels, threshold):
+    analyzer.forensics_max_pixels = max_pixels
+    refined = []
+    original = analyzer._score_pages_at
+
+    def counting(batch, cap):
+        if cap is None and max_pixels:
+            refined.append(len(batch))
+        return original(batch, cap)
+
+    analyzer._score_pages_at = counting
+    try:
+        start = time.perf_counter()
+        results = analyzer.score_pages_with_features(pages, tamper_threshold=threshold)
+        seconds = time.perf_counter() - start
+    finally:
+        analyzer._score_pages_at = original
+    return [score for score, _, _ in results], seconds, sum(refined)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="Documents")
+    parser.add_argument("--synthetic", type=int, default=0, help="synthetic pages (each also as a 12 MP photo)")
+    parser.add_argument("--max-pixels", type=int, nargs="+", default=[500000, 1000000, 2000000])
+    parser.add_argument("--threshold", type=float, default=0.6)
+    args = parser.parse_args()
+
+    pages = load_pages(args.folder, args.synthetic)
+    if not pages:
+        sys.exit(f"No documents found in {args.folder} (use --synthetic N)")
+
+    analyzer = DocumentAnalyzerCore()
+    reference, reference_s, _ = run(analyzer, pages, 0, args.threshold)
+    report = {
+        "pages": len(pages),
+        "megapixels": round(sum(p.width * p.height for p in pages) / len(pages) / 1e6, 2),
+        "threshold": args.threshold,
+        "full_resolution_seconds": round(reference_s, 3),
+        "pyramid": {},
+    }
+    for max_pixels in args.max_pixels:
+        scores, seconds, refined = run(analyzer, pages, max_pixels, args.threshold)
+        drift = [abs(a - b) for a, b in zip(scores, reference)]
+        report["pyramid"][max_pixels] = {
+            "seconds": round(seconds, 3),
+            "speedup": round(reference_s / seconds, 2),
+            "pages_refined": refined,
+            "max_score_drift": round(max(drift), 4),
+            "mean_score_drift": round(sum(drift) / len(drift), 4),
+            "decision_changes": sum((a >= args.threshold) != (b >= args.threshold) for a, b in zip(scores, reference)),
+            "level_changes": sum(level(a) != level(b) for a, b in zip(scores, reference)),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
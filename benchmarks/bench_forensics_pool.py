@@ -0,0 +1,86 @@
+"""
+Page feature extraction throughput: in-thread vs the forensics process pool.
+
+Generates synthetic A4 pages at 200 DPI (text-like strokes, a pasted patch
+and JPEG noise) and extracts the ELA/noise features and model inputs for all
+of them, first in-thread and then with 1/2/4/8 worker processes.
+
+Usage:
+    python benchmarks/bench_forensics_pool.py --pages 32 --workers 1 2 4 8
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image, ImageDraw
+
+import forensics
+
+
+def synthetic_page(seed, size=(1654, 2339)):
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for row in range(60, size[1] - 60, 38):
+        x = 80
+        while x < size[0] - 120:
+            width = rng.randint(20, 110)
+            draw.rectangle([x, row, x + width, row + 14], fill=(20, 20, 20))
+            x += width + rng.randint(10, 30)
+    # A "pasted" region with different compression history
+    patch = Image.new("RGB", (360, 90), (235, 235, 245))
+    ImageDraw.Draw(patch).text((10, 30), "NET PAY 1,23,456.00", fill="black")
+    buf = io.BytesIO()
+    patch.save(buf, format="JPEG", quality=45)
+    img.paste(Image.open(buf), (rng.randint(100, 1200), rng.randint(200, 2000)))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=92)
+    return Image.open(io.BytesIO(buf.getvalue())).convert("RGB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pages = [synthetic_page(i) for i in range(args.pages)]
+
+    start = time.perf_counter()
+    baseline = [forensics.page_features(page)[2] for page in pages]
+    serial_s = time.perf_counter() - start
+    report = {
+        "pages": len(pages),
+        "in_thread": {"seconds": round(serial_s, 3), "pages_per_s": round(len(pages) / serial_s, 2)},
+        "process_pool": {},
+    }
+
+    for workers in args.workers:
+        pool = forensics.create_forensics_pool(workers)
+        try:
+            # Warm up: worker start-up (spawn + imports) is paid once per process
+            list(pool.map(forensics.page_features, pages[:workers]))
+            start = time.perf_counter()
+            stats = [features[2] for features in pool.map(forensics.page_features, pages)]
+            seconds = time.perf_counter() - start
+        finally:
+            pool.shutdown()
+        report["process_pool"][workers] = {
+            "seconds": round(seconds, 3),
+            "pages_per_s": round(len(pages) / seconds, 2),
+            "speedup": round(serial_s / seconds, 2),
+            "identical_stats": stats == baseline,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cost of a suspicious page: scoring + hook-based GradCAM vs GradCAM from the
+scoring pass' cached layer4 activations.
+
+For every page in the folder, times (a) score_pages followed by
+generate_gradcam (extra forward + backward pass) and (b)
+score_pages_with_features followed by gradcam_from_features, and reports the
+largest pixel difference between the two heatmap overlays.
+
+Usage:
+    python benchmarks/bench_gradcam.py --folder Documents
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from da_strands import DocumentAnalyzerCore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="Documents")
+    args = parser.parse_args()
+
+    analyzer = DocumentAnalyzerCore()
+    pages = []
+    for name in sorted(os.listdir(args.folder)):
+        if name.lower().endswith(('.pdf', '.png', '.jpg', '.jpeg')):
+            doc_pages, error = analyzer._load_pages(os.path.join(args.folder, name))
+            if not error:
+                pages.extend(doc_pages)
+    if not pages:
+        sys.exit(f"No documents found in {args.folder}")
+
+    start = time.perf_counter()
+    analyzer.score_pages(pages)
+    hook_maps = [analyzer.generate_gradcam(page) for page in pages]
+    hook_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scored = analyzer.score_pages_with_features(pages)
+    cached_maps = [analyzer.gradcam_from_features(page, *cam_source) for page, (_, _, cam_source) in zip(pages, scored)]
+    cached_s = time.perf_counter() - start
+
+    max_diff = max(
+        int(np.abs(np.asarray(Image.open(io.BytesIO(a)), dtype=np.int16) -
+                   np.asarray(Image.open(io.BytesIO(b)), dtype=np.int16)).max())
+        for a, b in zip(hook_maps, cached_maps)
+    )
+    print(json.dumps({
+        "pages": len(pages),
+        "hook_gradcam": {"seconds": round(hook_s, 3), "ms_per_page": round(1000 * hook_s / len(pages), 1)},
+        "cached_gradcam": {"seconds": round(cached_s, 3), "ms_per_page": round(1000 * cached_s / len(pages), 1)},
+        "speedup": round(hook_s / cached_s, 2),
+        "max_overlay_pixel_diff": max_diff,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cold import time of the backend modules, measured with `python -X importtime`.
+
+Each target is imported in a fresh interpreter. The report shows:
+- cumulative import time of the target
+- the slowest modules it pulled in
+- whether any heavy library was imported eagerly: torch, torchvision, cv2,
+  skimage, matplotlib, pdf2image, pytesseract, langchain_aws. These should
+  only load on first use.
+Exits with status 1 when a heavy library is imported eagerly, or when a
+target exceeds --max-ms.
+
+Usage:
+    python benchmarks/bench_import_time.py [--max-ms 1500] [--top 15]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("torch", "torchvision", "cv2", "skimage", "matplotlib", "pdf2image", "pytesseract", "langchain_aws")
+
+# name -> (module whose cumulative time is reported, import statement)
+TARGETS = {
+    "orchestration_strands": ("orchestration_strands", "import orchestration_strands"),
+    "da_strands": ("da_strands", "import da_strands"),
+    "cv_strands": ("cv_strands", "import cv_strands"),
+    "backend.main": ("main", "import sys; sys.path.insert(0, 'backend'); import main"),
+}
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module, statement, top):
+    check = "; import sys, json; print(json.dumps(sorted(m for m in {heavy} if m in sys.modules)))".format(
+        heavy=repr(set(HEAVY_MODULES))
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement + check],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"}
+
+    rows = parse_importtime(proc.stderr)
+    total_us = next((cumulative for name, _, cumulative in rows if name == module), 0)
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "cumulative_ms": round(total_us / 1000, 1),
+        "eager_heavy_imports": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "slowest_self_ms": {name: round(self_us / 1000, 1) for name, self_us, _ in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS))
+    args = parser.parse_args()
+
+    report = {name: measure(*TARGETS[name], args.top) for name in args.targets}
+    print(json.dumps(report, indent=2))
+
+    failed = any(
+        "error" in r or r["eager_heavy_imports"] or (args.max_ms is not None and r["cumulative_ms"] > args.max_ms)
+        for r in report.values()
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
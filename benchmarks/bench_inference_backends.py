@@ -0,0 +1,123 @@
+"""
+Parity and throughput of the tamper model inference backends.
+
+Scores a fixed page corpus (every page of every document in --folder, or
+synthetic pages when it is empty) with the eager fp32 model as reference,
+then with each selected backend. For each backend it reports:
+- the largest |model_prob_orig| and |model_prob_ela| difference from eager
+- pages/second at the given batch size
+- resident memory added by building the backend
+Exits with status 1 if any backend exceeds --tolerance.
+
+Usage:
+    python benchmarks/bench_inference_backends.py --folder Documents --backends torchscript onnx int8 --tolerance 0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import torch
+from PIL import Image
+from pdf2image import convert_from_path
+
+import forensics
+from da_strands import load_resnet50
+from inference_backends import BACKENDS, create_backend
+from inference_batcher import max_softmax_probs
+from bench_forensics_pool import synthetic_page
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+
+def load_corpus(folder, synthetic_pages):
+    pages = []
+    if os.path.isdir(folder):
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if name.lower().endswith('.pdf'):
+                pages.extend(convert_from_path(path, dpi=200))
+            elif name.lower().endswith(('.png', '.jpg', '.jpeg')):
+                pages.append(Image.open(path).convert("RGB"))
+    return pages or [synthetic_page(i) for i in range(synthetic_pages)]
+
+
+def page_probs(backend, inputs, batch_size):
+    tensors = [t for orig, ela in inputs for t in (orig, ela)]
+    probs = max_softmax_probs(backend, tensors, batch_size=batch_size)
+    return probs[0::2], probs[1::2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="Documents")
+    parser.add_argument("--backends", nargs="+", default=[b for b in BACKENDS if b != "eager"])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    parser.add_argument("--synthetic-pages", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.folder, args.synthetic_pages)
+    inputs = []
+    for page in pages:
+        orig_input, ela_input, _ = forensics.page_features(page)
+        inputs.append((torch.from_numpy(orig_input), torch.from_numpy(ela_input)))
+
+    model = load_resnet50(torch.device("cpu"))
+    report = {"pages": len(pages), "batch_size": args.batch_size, "tolerance": args.tolerance, "backends": {}}
+    reference = None
+    failed = False
+
+    for name in ["eager"] + [b for b in args.backends if b != "eager"]:
+        rss_before = current_rss_mb()
+        # int8 is calibrated on the corpus itself unless INT8_CALIBRATION_DIR is set
+        options = {}
+        if name == "int8" and not os.getenv("INT8_CALIBRATION_DIR"):
+            options["calibration_inputs"] = [t for pair in inputs for t in pair]
+        backend = create_backend(name, model, **options)
+        rss_after = current_rss_mb()
+        if backend.name != name:
+            report["backends"][name] = {"error": "backend unavailable"}
+            failed = True
+            continue
+
+        page_probs(backend, inputs[:1], args.batch_size)  # Warm up
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            probs_orig, probs_ela = page_probs(backend, inputs, args.batch_size)
+        seconds = (time.perf_counter() - start) / args.repeats
+
+        entry = {
+            "pages_per_s": round(len(pages) / seconds, 2),
+            "memory_mb": round(rss_after - rss_before, 1) if rss_before is not None else None,
+        }
+        if reference is None:
+            reference = (probs_orig, probs_ela)
+        else:
+            diff_orig = max(abs(a - b) for a, b in zip(probs_orig, reference[0]))
+            diff_ela = max(abs(a - b) for a, b in zip(probs_ela, reference[1]))
+            entry["max_diff_model_prob_orig"] = round(diff_orig, 6)
+            entry["max_diff_model_prob_ela"] = round(diff_ela, 6)
+            entry["parity"] = diff_orig <= args.tolerance and diff_ela <= args.tolerance
+            failed = failed or not entry["parity"]
+        report["backends"][name] = entry
+
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
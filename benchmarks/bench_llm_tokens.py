@@ -0,0 +1,97 @@
+"""
+Input tokens per cross-validation LLM call, stateful agent vs stateless calls.
+
+Runs the seven extraction/comparison calls the cross validator makes for one
+application, once with a single reused agent (conversation history grows
+with every call) and once in stateless mode, and prints input tokens and
+latency per call.
+
+Usage:
+    python benchmarks/bench_llm_tokens.py [--texts-dir DIR] [--model MODEL_ID]
+
+DIR may hold payslip.txt, offer.txt, bank.txt and form16.txt with OCR text;
+built-in sample text is used for any that are missing.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cv_strands import CrossValidationCoreBedrock
+
+
+SAMPLE_TEXTS = {
+    "payslip": (
+        "ACME SOFTWARE PVT LTD\nPayslip for the month of January 2025\n"
+        "Employee Name: Yaswanth Mardana  PAN: ABCDE1234F  UAN: 100200300400\n"
+        "Earnings: Basic 37,500.00  HRA 15,000.00  Special Allowance 22,500.00\n"
+        "Deductions: Ee PF contribution 4,500.00  Income Tax 8,961.00\n"
+        "Net Pay: 61,539.00\n"
+    ),
+    "offer": (
+        "ACME SOFTWARE PVT LTD\nOffer Letter  Date: 01-06-2024\n"
+        "Dear Mardana Yaswanth, we are pleased to offer you the position of Software Engineer.\n"
+        "CTC (Annual): 10,80,000  Basic Salary (Monthly): 37,500  Bonus: 50,000\n"
+        "Joining Date: 01-07-2024\n"
+    ),
+    "bank": (
+        "STATE BANK\nAccount Statement  Account Holder: YASWANTH MARDANA\n"
+        "Account Number: 123456789012  IFSC: SBIN0001234\n"
+        "31/01/25  SALARY CREDIT ACME SOFTWARE  61,539.00 CR\n"
+    ),
+    "form16": (
+        "FORM NO. 16  PAN of the Deductor: AAACA1234Z  TAN: BLRA12345B\n"
+        "PAN of the Employee/Specified senior citizen: ABCDE1234F  Name: Yaswanth Mardana\n"
+        "07-02-2025 February 2025 Tax Deducted 8,961.00\n"
+        "Total TDS: 89,610.00\n"
+    ),
+}
+
+
+def load_texts(texts_dir):
+    texts = dict(SAMPLE_TEXTS)
+    if texts_dir:
+        for name in texts:
+            path = os.path.join(texts_dir, f"{name}.txt")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    texts[name] = f.read()
+    return texts
+
+
+def run_calls(validator, texts):
+    payslip = validator.extract_payslip_info(texts["payslip"])
+    offer = validator.extract_offer_letter_info(texts["offer"])
+    bank = validator.extract_bank_info(texts["bank"])
+    form16 = validator.extract_form16_info(texts["form16"])
+    validator.compare_with_llm(payslip, offer)
+    validator.cross_check_salary(payslip, bank)
+    validator.cross_check_payslip_form16(payslip, form16)
+    return validator.llm_usage_summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts-dir")
+    parser.add_argument("--model", default="deepseek.v3-v1:0")
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts_dir)
+    before = run_calls(CrossValidationCoreBedrock(model_name=args.model, stateless=False), texts)
+    after = run_calls(CrossValidationCoreBedrock(model_name=args.model, stateless=True), texts)
+
+    print(f"\n{'call':<20}{'stateful in':>14}{'stateless in':>14}{'stateful s':>12}{'stateless s':>13}")
+    for old, new in zip(before["per_call"], after["per_call"]):
+        print(f"{old['call']:<20}{old['input_tokens']:>14}{new['input_tokens']:>14}"
+              f"{old['latency_s']:>12.2f}{new['latency_s']:>13.2f}")
+    print(f"{'total':<20}{before['input_tokens']:>14}{after['input_tokens']:>14}")
+
+    print(json.dumps({"stateful": before, "stateless": after}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
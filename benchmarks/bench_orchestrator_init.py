@@ -0,0 +1,84 @@
+"""
+Per-request orchestrator initialisation cost, before and after the ModelRegistry.
+
+"before" builds VerificationOrchestrator the way /run_workflow used to (fresh
+ResNet50, BedrockModel, Agent and S3 client every time); "after" builds it
+from a registry that was loaded once, as the FastAPI lifespan hook does.
+
+Usage:
+    python benchmarks/bench_orchestrator_init.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestration_strands import VerificationOrchestrator
+from model_registry import ModelRegistry
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def time_builds(build, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings):
+    return {
+        "runs": len(timings),
+        "mean_s": round(statistics.mean(timings), 4),
+        "median_s": round(statistics.median(timings), 4),
+        "max_s": round(max(timings), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    folder = os.path.join(tempfile.mkdtemp(prefix="bench_init_"), "LID0000000000")
+    os.makedirs(folder, exist_ok=True)
+
+    before = time_builds(lambda: VerificationOrchestrator(folder), args.runs)
+    rss_before = peak_rss_mb()
+
+    registry = ModelRegistry()
+    start = time.perf_counter()
+    registry.load()
+    registry_load = time.perf_counter() - start
+
+    after = time_builds(lambda: registry.create_orchestrator(folder), args.runs)
+
+    report = {
+        "before": summarize(before),
+        "after": summarize(after),
+        "registry_load_s": round(registry_load, 4),
+        "peak_rss_mb_after_before_runs": rss_before,
+        "peak_rss_mb_total": peak_rss_mb(),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
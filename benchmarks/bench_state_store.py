@@ -0,0 +1,84 @@
+"""
+Throughput of concurrent /approve_loan and /escalate style transitions.
+
+Compares the SQLite application state store with the legacy S3 JSON lists
+(backed by the in-memory S3 stand-in with simulated round-trip latency),
+and checks that every application ends up in exactly one list.
+
+Usage:
+    python benchmarks/bench_state_store.py --applications 500 --threads 8 --s3-latency-ms 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import concurrent.futures
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from local_s3 import LocalS3Client
+from state_store import (
+    STATUS_NEW,
+    STATUS_APPROVED,
+    STATUS_ESCALATED,
+    SQLiteApplicationStateStore,
+    S3ListStateStore,
+)
+
+BUCKET = "bench-bucket"
+
+
+def run(store, applications, threads, seed=7):
+    ids = [f"LID{1000000 + i}" for i in range(applications)]
+    store.import_lists({STATUS_NEW: ids})
+
+    rng = random.Random(seed)
+    actions = [(cid, rng.choice([STATUS_APPROVED, STATUS_ESCALATED])) for cid in ids]
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda a: store.transition(*a), actions))
+    seconds = time.perf_counter() - start
+
+    new = set(store.list_by_status(STATUS_NEW))
+    approved = set(store.list_by_status(STATUS_APPROVED))
+    escalated = set(store.list_by_status(STATUS_ESCALATED))
+    expected_approved = {cid for cid, status in actions if status == STATUS_APPROVED}
+
+    return {
+        "operations": len(actions),
+        "seconds": round(seconds, 3),
+        "ops_per_s": round(len(actions) / seconds, 1),
+        "left_in_new": len(new),
+        "in_multiple_lists": len((approved & escalated) | (new & (approved | escalated))),
+        "approved_mismatches": len(approved ^ expected_approved),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--s3-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    db_path = str(Path(tempfile.mkdtemp(prefix="bench_state_")) / "state.db")
+    report = {
+        "sqlite": run(SQLiteApplicationStateStore(db_path), args.applications, args.threads),
+        "s3_lists": run(
+            S3ListStateStore(LocalS3Client(latency_s=args.s3_latency_ms / 1000.0), BUCKET),
+            args.applications,
+            args.threads,
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
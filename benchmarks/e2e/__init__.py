@@ -0,0 +1,12 @@
+"""
+End-to-end workflow benchmark.
+
+corpus.py generates synthetic applications (payslip, offer letter, bank
+statement and Form 16 documents plus AA_data.json); run.py uploads them to
+an in-memory S3 stand-in and runs VerificationOrchestrator.run_workflow for
+each one with a mock Bedrock model, reporting per-node and total latency,
+throughput and peak RSS as JSON.
+
+Usage:
+    python benchmarks/e2e/run.py --apps 8 --pages 2 --concurrency 2 --out e2e.json
+"""
@@ -0,0 +1,164 @@
+"""
+Synthetic loan applications for the end-to-end benchmark.
+
+Each application folder holds payslip.pdf, Offer_Letter.pdf,
+bank_statement.pdf, optionally form16.pdf, and AA_data.json, with the same
+applicant details throughout. PDFs get a real text layer when PyMuPDF is
+installed (like digitally generated payslips); with text_layer=False, or
+without PyMuPDF, they are image-only (like scans) and go through OCR.
+image_docs=True writes the payslip and offer letter as PNG instead.
+"""
+
+import json
+import os
+import random
+
+from PIL import Image, ImageDraw
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+
+FIRST_NAMES = ["Aarav", "Diya", "Rohan", "Meera", "Kabir", "Ananya", "Vikram", "Isha"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Menon", "Gupta", "Nair", "Rao", "Kapoor"]
+EMPLOYERS = ["ACME SOFTWARE PVT LTD", "NORTHWIND SYSTEMS LTD", "CONTOSO TECHNOLOGIES PVT LTD"]
+
+# A4 in PDF points
+PAGE_SIZE = (595, 842)
+LINES_PER_PAGE = 45
+
+
+def make_profile(seed):
+    rng = random.Random(seed)
+    basic = rng.randrange(30000, 120000, 500)
+    return {
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "pan": "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(5))
+               + f"{rng.randrange(10000):04d}" + rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+        "account_number": f"{rng.randrange(10**11, 10**12)}",
+        "employer": rng.choice(EMPLOYERS),
+        "basic": basic,
+        "hra": basic * 2 // 5,
+        "special": basic * 3 // 5,
+        "bonus": rng.randrange(20000, 150000, 1000),
+        "tax": basic // 5,
+        "emi": rng.choice([0, 0, 5000, 12000, 18000]),
+        "balance": rng.randrange(50000, 900000, 100),
+        "loan_amount": rng.randrange(100000, 1500000, 50000),
+    }
+
+
+def _net_pay(p):
+    return p["basic"] + p["hra"] + p["special"] - p["tax"] - p["basic"] * 12 // 100
+
+
+def document_lines(kind, p, pages):
+    """Text of one document, padded with filler rows to the requested page count."""
+    if kind == "payslip":
+        lines = [p["employer"], "Payslip for the month of January 2025",
+                 f"Employee Name: {p['name']}   PAN: {p['pan']}",
+                 f"Earnings: Basic {p['basic']:,}.00  HRA {p['hra']:,}.00  Special Allowance {p['special']:,}.00",
+                 f"Deductions: Ee PF contribution {p['basic'] * 12 // 100:,}.00  Income Tax {p['tax']:,}.00",
+                 f"Net Pay: {_net_pay(p):,}.00"]
+        filler = lambda i: f"Attendance 2025-01-{i % 28 + 1:02d}  Present"
+    elif kind == "offer":
+        lines = [p["employer"], "Offer Letter   Date: 01-06-2024",
+                 f"Dear {p['name']}, we are pleased to offer you the position of Software Engineer.",
+                 f"CTC (Annual): {(p['basic'] + p['hra'] + p['special']) * 12:,}  Basic Salary (Monthly): {p['basic']:,}",
+                 f"Bonus: {p['bonus']:,}", "Joining Date: 01-07-2024"]
+        filler = lambda i: f"Clause {i + 1}. The employee shall abide by the company policies."
+    elif kind == "bank":
+        lines = ["STATE BANK", f"Account Statement   Account Holder: {p['name'].upper()}",
+                 f"Account Number: {p['account_number']}   IFSC: SBIN0001234",
+                 f"31/01/25  SALARY CREDIT {p['employer']}  {_net_pay(p):,}.00 CR",
+                 f"Closing Balance: {p['balance']:,}.00"]
+        filler = lambda i: f"{i % 28 + 1:02d}/01/25  UPI/{100000 + i}/MERCHANT  {(i * 37) % 5000 + 100:,}.00 DR"
+    else:
+        lines = ["FORM NO. 16", "PAN of the Deductor: AAACA1234Z   TAN: BLRA12345B",
+                 f"PAN of the Employee: {p['pan']}   Name: {p['name']}",
+                 f"07-02-2025 February 2025 Tax Deducted {p['tax']:,}.00",
+                 f"Total TDS: {p['tax'] * 10:,}.00"]
+        filler = lambda i: f"Quarter {i % 4 + 1} receipt {200000 + i}  Amount {p['tax']:,}.00"
+    total = max(1, pages) * LINES_PER_PAGE
+    return lines + [filler(i) for i in range(total - len(lines))]
+
+
+def _pages(lines):
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+
+def write_text_pdf(path, lines):
+    doc = fitz.open()
+    for page_lines in _pages(lines):
+        page = doc.new_page(width=PAGE_SIZE[0], height=PAGE_SIZE[1])
+        for row, line in enumerate(page_lines):
+            page.insert_text((48, 60 + row * 16), line, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def render_page_image(page_lines, dpi=150):
+    scale = dpi / 72
+    img = Image.new("RGB", (int(PAGE_SIZE[0] * scale), int(PAGE_SIZE[1] * scale)), "white")
+    draw = ImageDraw.Draw(img)
+    for row, line in enumerate(page_lines):
+        draw.text((48 * scale, (50 + row * 16) * scale), line, fill="black")
+    return img
+
+
+def write_image_pdf(path, lines, dpi=150):
+    images = [render_page_image(page_lines, dpi) for page_lines in _pages(lines)]
+    images[0].save(path, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+
+
+def make_aa_data(p):
+    return {
+        "personal_info": {"name": p["name"], "pan": p["pan"]},
+        "bank_account": {"account_number": p["account_number"], "currency": "INR", "balance": p["balance"]},
+        "income_details": {
+            "monthly_salary": p["basic"],
+            "bonus": p["bonus"],
+            "allowances": p["hra"] + p["special"],
+            "tax_paid": p["tax"],
+        },
+        "loan_obligations": [{"type": "personal", "emi": p["emi"]}] if p["emi"] else [],
+        "loan_amount_requested": p["loan_amount"],
+    }
+
+
+DOCUMENTS = (
+    ("payslip", "payslip"),
+    ("offer", "Offer_Letter"),
+    ("bank", "bank_statement"),
+    ("form16", "form16"),
+)
+
+
+def make_application(folder, seed, pages=1, text_layer=True, image_docs=False, form16=True):
+    """Write one synthetic application into folder; returns {file name: page count}."""
+    os.makedirs(folder, exist_ok=True)
+    profile = make_profile(seed)
+    text_layer = text_layer and fitz is not None
+    written = {}
+    for kind, stem in DOCUMENTS:
+        if kind == "form16" and not form16:
+            continue
+        lines = document_lines(kind, profile, pages)
+        if image_docs and kind in ("payslip", "offer"):
+            name = f"{stem}.png"
+            render_page_image(lines[:LINES_PER_PAGE]).save(os.path.join(folder, name))
+            written[name] = 1
+            continue
+        name = f"{stem}.pdf"
+        if text_layer:
+            write_text_pdf(os.path.join(folder, name), lines)
+        else:
+            write_image_pdf(os.path.join(folder, name), lines)
+        written[name] = len(_pages(lines))
+
+    with open(os.path.join(folder, "AA_data.json"), "w") as f:
+        json.dump(make_aa_data(profile), f, indent=2)
+    written["AA_data.json"] = 0
+    return written
@@ -0,0 +1,204 @@
+"""
+End-to-end workflow benchmark against local S3 and Bedrock stand-ins.
+
+Generates --apps synthetic applications (see corpus.py), uploads them to an
+in-memory S3 client (benchmarks/local_s3.py), then for each application
+downloads the documents and runs VerificationOrchestrator.run_workflow with
+every LLM call answered by benchmarks/mock_bedrock.py. The ResNet50 model,
+OCR and forensics run for real. Up to --concurrency applications run at
+once, sharing one ModelRegistry like the API does.
+
+Prints (and with --out, writes) a JSON report:
+- config, git commit and registry load time
+- per application: status, download/total seconds, node timings, stage
+  breakdown, pages and LLM tokens
+- summary: wall time, throughput, latency percentiles (total and per node),
+  stage totals and peak RSS
+- llm: mock model calls per prompt type, throttles, peak concurrency and
+  latency percentiles
+
+OCR results are cached on disk (ocr_service.py); point OCR_CACHE_DIR at an
+empty directory for cold-cache numbers.
+
+Usage:
+    python benchmarks/e2e/run.py --apps 8 --pages 2 --concurrency 2 --out e2e.json
+    python benchmarks/e2e/run.py --apps 16 --concurrency 4 --llm-latency lognormal:0.8,0.5 --llm-max-concurrency 8
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import make_application
+from local_s3 import LocalS3Client
+from mock_bedrock import MockBedrockModel
+from model_registry import ModelRegistry
+from s3_downloader import download_customer_folder
+
+
+BUCKET = "documents-loaniq"
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {
+        "mean_s": round(statistics.mean(ordered), 3),
+        "p50_s": round(pick(0.5), 3),
+        "p95_s": round(pick(0.95), 3),
+        "max_s": round(ordered[-1], 3),
+    }
+
+
+def upload_application(s3, loan_id, folder):
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name), "rb") as f:
+            s3.put_object(Bucket=BUCKET, Key=f"{loan_id}/{name}", Body=f.read())
+
+
+def run_application(registry, s3, loan_id, work_root):
+    documents_folder = os.path.join(work_root, loan_id)
+    start = time.perf_counter()
+    download_customer_folder(s3, BUCKET, loan_id, documents_folder)
+    download_s = time.perf_counter() - start
+
+    orchestrator = registry.create_orchestrator(documents_folder, loan_id=loan_id)
+    result = orchestrator.run_workflow()
+    total_s = time.perf_counter() - start
+    usage = orchestrator.cross_validator.llm_usage_summary()
+    shutil.rmtree(documents_folder, ignore_errors=True)
+    return {
+        "loan_id": loan_id,
+        "status": result.get("status", "unknown"),
+        "download_s": round(download_s, 3),
+        "total_s": round(total_s, 3),
+        "node_timings": orchestrator.node_timings,
+        "stages": orchestrator.timings.get("stages", {}),
+        "pages_rendered": orchestrator.page_stats.get("pages_rendered", 0),
+        "llm_calls": usage["calls"],
+        "llm_input_tokens": usage["input_tokens"],
+        "llm_output_tokens": usage["output_tokens"],
+    }
+
+
+def summarize(apps, wall_s, pages_per_app):
+    node_names = sorted({name for app in apps for name in app["node_timings"]})
+    stages = {}
+    for app in apps:
+        for name, stage in app["stages"].items():
+            entry = stages.setdefault(name, {"count": 0, "total_s": 0.0})
+            entry["count"] += stage["count"]
+            entry["total_s"] = round(entry["total_s"] + stage["total_s"], 4)
+    return {
+        "applications": len(apps),
+        "statuses": {s: sum(app["status"] == s for app in apps) for s in sorted({app["status"] for app in apps})},
+        "wall_s": round(wall_s, 3),
+        "throughput_apps_per_min": round(len(apps) / wall_s * 60, 2),
+        "throughput_pages_per_s": round(len(apps) * pages_per_app / wall_s, 2),
+        "latency": percentiles([app["total_s"] for app in apps]),
+        "nodes": {name: percentiles([app["node_timings"][name] for app in apps if name in app["node_timings"]])
+                  for name in node_names},
+        "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["total_s"])),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=1, help="pages per PDF document")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--scanned", action="store_true", help="image-only PDFs (OCR path) instead of a text layer")
+    parser.add_argument("--image-docs", action="store_true", help="payslip and offer letter as PNG")
+    parser.add_argument("--no-form16", action="store_true")
+    parser.add_argument("--llm-latency", default="0", help="mock LLM latency spec, e.g. 0.5 or lognormal:0.8,0.5")
+    parser.add_argument("--llm-ms-per-token", type=float, default=0.0, help="extra mock latency per output token")
+    parser.add_argument("--llm-throttle-rate", type=float, default=0.0, help="fraction of mock LLM calls throttled")
+    parser.add_argument("--llm-max-concurrency", type=int, help="mock account quota; calls beyond it are throttled")
+    parser.add_argument("--s3-latency", type=float, default=0.0, help="seconds per local S3 call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    corpus_root = tempfile.mkdtemp(prefix="e2e_corpus_")
+    work_root = tempfile.mkdtemp(prefix="e2e_work_")
+    s3 = LocalS3Client(latency_s=args.s3_latency)
+    loan_ids = [f"LID{args.seed + i:010d}" for i in range(args.apps)]
+    pages_per_app = 0
+    for i, loan_id in enumerate(loan_ids):
+        folder = os.path.join(corpus_root, loan_id)
+        written = make_application(folder, seed=args.seed + i, pages=args.pages, text_layer=not args.scanned,
+                                   image_docs=args.image_docs, form16=not args.no_form16)
+        pages_per_app = sum(written.values())
+        upload_application(s3, loan_id, folder)
+    shutil.rmtree(corpus_root, ignore_errors=True)
+
+    llm = MockBedrockModel(latency=args.llm_latency, ms_per_output_token=args.llm_ms_per_token,
+                           throttle_rate=args.llm_throttle_rate, max_concurrency=args.llm_max_concurrency,
+                           seed=args.seed)
+    registry = ModelRegistry(s3_bucket=BUCKET, s3_client=s3, llm_model=llm)
+    load_start = time.perf_counter()
+    registry.load()
+    registry_load_s = time.perf_counter() - load_start
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        apps = list(executor.map(lambda loan_id: run_application(registry, s3, loan_id, work_root), loan_ids))
+    wall_s = time.perf_counter() - start
+    registry.close()
+    shutil.rmtree(work_root, ignore_errors=True)
+
+    report = {
+        "benchmark": "e2e_workflow",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": git_commit(),
+        "config": vars(args),
+        "registry_load_s": round(registry_load_s, 3),
+        "summary": summarize(apps, wall_s, pages_per_app),
+        "llm": llm.stats(),
+        "applications": apps,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+In-process stand-in for the boto3 S3 client used by the backend.
+
+Implements the subset of the client API this repo calls (get/put/head
+object, list_objects_v2 with pagination and delimiters, download/upload
+file) on an in-memory dict, with optional per-call latency so benchmarks
+can model network round-trips without AWS.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+
+def _client_error(code, message, operation):
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+class _Paginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, PaginationConfig=None, **kwargs):
+        page_size = (PaginationConfig or {}).get("PageSize", 1000)
+        token = None
+        while True:
+            page = self.client.list_objects_v2(MaxKeys=page_size, ContinuationToken=token, **kwargs)
+            yield page
+            if not page.get("IsTruncated"):
+                break
+            token = page["NextContinuationToken"]
+
+
+class LocalS3Client:
+    """Thread-safe in-memory S3 client with configurable per-call latency."""
+
+    def __init__(self, latency_s=0.0):
+        self.latency_s = latency_s
+        self._objects = {}
+        self._lock = threading.Lock()
+        self.calls = {}
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    # -----------------------------
+    # Object API
+    # -----------------------------
+    def put_object(self, Bucket, Key, Body, ContentType=None, **kwargs):
+        self._call("put_object")
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._lock:
+            self._objects[(Bucket, Key)] = (data, etag, ContentType)
+        return {"ETag": etag}
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, **kwargs):
+        self._call("get_object")
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise _client_error("NoSuchKey", "The specified key does not exist.", "GetObject")
+        data, etag, content_type = entry
+        if IfNoneMatch is not None and IfNoneMatch == etag:
+            raise _client_error("304", "Not Modified", "GetObject")
+        return {"Body": io.BytesIO(data), "ETag": etag, "ContentLength": len(data), "ContentType": content_type}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._call("head_object")
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise _client_error("404", "Not Found", "HeadObject")
+        return {"ETag": entry[1], "ContentLength": len(entry[0])}
+
+    def download_file(self, Bucket, Key, Filename, **kwargs):
+        body = self.get_object(Bucket=Bucket, Key=Key)["Body"].read()
+        with open(Filename, "wb") as f:
+            f.write(body)
+
+    def upload_file(self, Filename, Bucket, Key, **kwargs):
+        with open(Filename, "rb") as f:
+            self.put_object(Bucket=Bucket, Key=Key, Body=f.read())
+
+    # -----------------------------
+    # Listing
+    # -----------------------------
+    def list_objects_v2(self, Bucket, Prefix="", Delimiter=None, MaxKeys=1000, ContinuationToken=None, **kwargs):
+        self._call("list_objects_v2")
+        with self._lock:
+            keys = sorted(k for (b, k) in self._objects if b == Bucket and k.startswith(Prefix))
+
+        contents, prefixes = [], []
+        for key in keys:
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                common = Prefix + rest.split(Delimiter, 1)[0] + Delimiter
+                if common not in prefixes:
+                    prefixes.append(common)
+            else:
+                contents.append(key)
+
+        entries = [("key", k) for k in contents] + [("prefix", p) for p in prefixes]
+        entries.sort(key=lambda e: e[1])
+        start = int(ContinuationToken or 0)
+        page = entries[start:start + MaxKeys]
+
+        response = {
+            "IsTruncated": start + MaxKeys < len(entries),
+            "KeyCount": len(page),
+        }
+        page_contents = []
+        for kind, value in page:
+            if kind == "key":
+                with self._lock:
+                    data = self._objects[(Bucket, value)][0]
+                page_contents.append({"Key": value, "Size": len(data)})
+        page_prefixes = [{"Prefix": value} for kind, value in page if kind == "prefix"]
+        if page_contents:
+            response["Contents"] = page_contents
+        if page_prefixes:
+            response["CommonPrefixes"] = page_prefixes
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+    def get_paginator(self, operation_name):
+        if operation_name != "list_objects_v2":
+            raise NotImplementedError(operation_name)
+        return _Paginator(self)
+
+    # -----------------------------
+    # Helpers for benchmarks
+    # -----------------------------
+    def seed_directory(self, bucket, local_dir, prefix):
+        """Upload every file under ``local_dir`` to ``{prefix}/...``."""
+        for root, _, files in os.walk(local_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, local_dir).replace(os.sep, "/")
+                self.upload_file(path, bucket, f"{prefix}/{rel}")
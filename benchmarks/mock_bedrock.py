@@ -0,0 +1,503 @@
+"""
+In-process stand-in for the Bedrock model behind the Strands agents.
+
+MockBedrockModel implements the strands Model interface, so it can be passed
+anywhere a BedrockModel is used:
+
+    CrossValidationCoreBedrock(model=mock)
+    descision_agent(model=mock)
+    VerificationOrchestrator(folder, llm_model=mock)
+    ModelRegistry(llm_model=mock)
+
+What it simulates:
+- a schema-valid JSON reply for each cross-validation prompt type (offer,
+  payslip, bank and Form 16 extraction; payslip vs offer, bank vs payslip and
+  payslip vs Form 16 comparisons). Fields are filled from the document text
+  and compared the way the prompts ask.
+- the decision agent's tool calls: extract_financial_data, then
+  calculate_loan_plans, then the final decision JSON built from the tool
+  results.
+- latency from a configurable distribution, plus an optional per-output-token
+  cost.
+- throttling: a random ModelThrottledException rate, and a concurrency
+  quota beyond which calls are throttled like a Bedrock account limit.
+- token counts (~4 characters per token), reported in the stream metadata
+  like Bedrock does.
+
+stats() reports calls per prompt type, throttles, peak concurrency and
+latency percentiles.
+
+Latency specs: "0.5" or "fixed:0.5", "uniform:0.2,1.0", "normal:0.8,0.2",
+"lognormal:0.8,0.5" (median seconds, sigma). All are in seconds, clipped at 0.
+
+Usage:
+    python benchmarks/mock_bedrock.py --latency lognormal:0.8,0.5 --throttle-rate 0.05 --calls 50 --concurrency 8
+"""
+
+import argparse
+import ast
+import asyncio
+import concurrent.futures
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import types
+import typing
+import uuid
+from pathlib import Path
+
+from strands.models.model import Model
+from strands.types.exceptions import ModelThrottledException
+
+
+# -----------------------------
+# Latency distributions
+# -----------------------------
+def parse_latency(spec):
+    """Return a function rng -> seconds for a latency spec string (see module docstring)."""
+    if spec is None:
+        return lambda rng: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda rng: float(spec)
+    kind, _, params = str(spec).partition(":")
+    if not params:
+        kind, params = "fixed", kind
+    values = [float(v) for v in params.split(",")]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def estimate_tokens(text, chars_per_token=4):
+    return max(1, len(text) // chars_per_token)
+
+
+# -----------------------------
+# Canned replies
+# -----------------------------
+# Checked in order; the decision prompt embeds the extracted documents, so it goes first
+PROMPT_TYPES = (
+    ("decision", "suggested_status"),
+    ("extract_offer", "OFFER LETTER if present"),
+    ("extract_payslip", "expert payroll document analyzer"),
+    ("extract_bank", "from the bank statement text"),
+    ("extract_form16", "Form 16 Text:"),
+    ("bank_vs_payslip", "Check if the salary in the bank matches the payslip"),
+    ("payslip_vs_offer", "between Payslip and Offer Letter"),
+    ("payslip_vs_form16", "Compare the PAYSLIP and FORM 16"),
+)
+
+
+def classify_prompt(prompt):
+    for prompt_type, marker in PROMPT_TYPES:
+        if marker in prompt:
+            return prompt_type
+    return "unknown"
+
+
+def _document_text(prompt):
+    match = re.search(r'"""(.*?)"""', prompt, re.DOTALL) or re.search(r"Form 16 Text:\n(.*)\n\nReturn ONLY", prompt, re.DOTALL)
+    return match.group(1) if match else prompt
+
+
+def _find(text, pattern):
+    match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    return match.group(1).strip() if match else ""
+
+
+def _amount(text, pattern):
+    return _find(text, pattern + r"\s*:?\s*(?:INR|Rs\.?)?\s*([\d,]+(?:\.\d+)?)").replace(",", "")
+
+
+def _json_after(prompt, label):
+    """The JSON object printed after ``label:`` in a comparison prompt."""
+    start = prompt.find(label + ":\n")
+    if start < 0:
+        return {}
+    try:
+        value, _ = json.JSONDecoder().raw_decode(prompt[start + len(label) + 2:].lstrip())
+        return value if isinstance(value, dict) else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _same_person(a, b):
+    tokens = lambda name: sorted(re.sub(r"[^a-z ]", " ", (name or "").lower()).split())
+    return bool(tokens(a)) and tokens(a) == tokens(b)
+
+
+def _same_amount(a, b, tolerance=1.0):
+    try:
+        return abs(float(str(a).replace(",", "")) - float(str(b).replace(",", ""))) <= tolerance
+    except ValueError:
+        return False
+
+
+def _comparison(checks):
+    discrepancies = [f"{name} differs" for name, ok in checks.items() if not ok]
+    return {**checks, "Overall Match": not discrepancies, "Discrepancies": discrepancies}
+
+
+def reply_for(prompt_type, prompt):
+    """Schema-valid reply object for one cross-validation prompt."""
+    text = _document_text(prompt)
+    if prompt_type == "extract_offer":
+        return {
+            "Employee Name": _find(text, r"Dear\s+([A-Za-z .]+?),"),
+            "Employer": _find(text, r"^\s*([A-Z][A-Z .&]+(?:LTD|LIMITED|INC))"),
+            "Designation": _find(text, r"position of\s+([A-Za-z ]+)"),
+            "Joining Date": _find(text, r"Joining Date\s*:?\s*([\d-]+)"),
+            "CTC (Annual)": _amount(text, r"CTC \(Annual\)"),
+            "Basic Salary (Monthly)": _amount(text, r"Basic Salary \(Monthly\)"),
+            "Valiable pay": "",
+            "Bonus": _amount(text, r"Bonus"),
+            "Tax or Deductions": "",
+            "Issue Date": _find(text, r"Date\s*:\s*([\d-]+)"),
+        }
+    if prompt_type == "extract_payslip":
+        basic = _amount(text, r"Basic")
+        return {
+            "Employee Name": _find(text, r"Employee Name\s*:\s*([A-Za-z .]+?)(?:\s{2,}|\s+PAN|$)"),
+            "PAN": _find(text, r"\b([A-Z]{5}[0-9]{4}[A-Z])\b"),
+            "Month": _find(text, r"month of\s+([A-Za-z]+ \d{4})"),
+            "Employer": _find(text, r"^\s*([A-Z][A-Z .&]+(?:LTD|LIMITED|INC))"),
+            "Base Salary": basic,
+            "Net Salary": _amount(text, r"Net Pay"),
+            "Income Tax": _amount(text, r"Income Tax"),
+            "Total Tax Deducted (TDS)": "",
+            "PF Deducted": _amount(text, r"PF contribution") or (f"{float(basic) * 0.12:.2f}" if basic else ""),
+            "UAN Number": _find(text, r"UAN\s*:?\s*(\d{12})"),
+            "Bonus": "",
+        }
+    if prompt_type == "extract_bank":
+        salary = _find(text, r"SALARY CREDIT[^\d]*([\d,]+\.\d{2})").replace(",", "")
+        return {
+            "Account Holder Name": _find(text, r"Account Holder\s*:\s*([A-Za-z .]+?)(?:\s{2,}|$)"),
+            "Account Number": _find(text, r"Account Number\s*:\s*(\d+)"),
+            "IFSC Code": _find(text, r"IFSC\s*:?\s*([A-Z]{4}0[A-Z0-9]{6})"),
+            "Bank Name": _find(text, r"^\s*([A-Z ]*BANK[A-Z ]*)"),
+            "Salary Credited Amount": f"{float(salary):.2f}" if salary else "",
+            "Salary Credit Date": _find(text, r"(\d{2}/\d{2}/\d{2,4})\s+SALARY CREDIT"),
+        }
+    if prompt_type == "extract_form16":
+        records = [
+            {"Date": date, "Month": month, "Tax Deducted": amount.replace(",", "")}
+            for date, month, amount in re.findall(r"(\d{2}-\d{2}-\d{4})\s+([A-Za-z]+ \d{4})\s+Tax Deducted\s+([\d,]+(?:\.\d+)?)", text)
+        ]
+        return {
+            "Employee Name": _find(text, r"Name\s*:\s*([A-Za-z .]+?)(?:\s{2,}|$)"),
+            "PAN": _find(text, r"PAN of the Employee[^A-Z0-9]*([A-Z]{5}[0-9]{4}[A-Z])"),
+            "Employer TAN": _find(text, r"TAN\s*:?\s*([A-Z]{4}[0-9]{5}[A-Z])"),
+            "Total TDS": _amount(text, r"Total TDS"),
+            "TDS Records": records,
+        }
+    if prompt_type == "payslip_vs_offer":
+        payslip, offer = _json_after(prompt, "Payslip"), _json_after(prompt, "Offer Letter")
+        return _comparison({
+            "Employee Name Match": _same_person(payslip.get("Employee Name"), offer.get("Employee Name")),
+            "Base Salary Match": _same_amount(payslip.get("Base Salary", ""), offer.get("Basic Salary (Monthly)", "")),
+        })
+    if prompt_type == "bank_vs_payslip":
+        payslip, bank = _json_after(prompt, "Payslip"), _json_after(prompt, "Bank Statement")
+        return _comparison({
+            "Employee Name Match": _same_person(payslip.get("Employee Name"), bank.get("Account Holder Name")),
+            "Salary Match": _same_amount(payslip.get("Net Salary", ""), bank.get("Salary Credited Amount", "")),
+            "Month of salary": bool(payslip.get("Month")) and bool(bank.get("Salary Credit Date")),
+        })
+    if prompt_type == "payslip_vs_form16":
+        payslip, form16 = _json_after(prompt, "Payslip"), _json_after(prompt, "Form 16")
+        taxes = [r.get("Tax Deducted", "") for r in form16.get("TDS Records", [])]
+        return _comparison({
+            "PAN Match": bool(payslip.get("PAN")) and payslip.get("PAN") == form16.get("PAN"),
+            "Employee Name Match": _same_person(payslip.get("Employee Name"), form16.get("Employee Name")),
+            "Tax Deduction Match": any(_same_amount(payslip.get("Income Tax", ""), tax) for tax in taxes),
+        })
+    return {}
+
+
+def _tool_value(text):
+    """Tool result text back to a value; dict results come back as JSON or as a Python repr."""
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            return parse(text)
+        except (ValueError, SyntaxError):
+            continue
+    return text
+
+
+def decision_reply(tool_results):
+    """Final decision JSON from the simulated tool results."""
+    financial = _tool_value(tool_results.get("extract_financial_data") or "{}")
+    if not isinstance(financial, dict):
+        financial = {}
+    salary = float(financial.get("salary") or 0)
+    emi = float(financial.get("emi") or 0)
+    dti = emi / salary * 100 if salary else 100.0
+    risk = "Low" if dti < 20 else "Medium" if dti <= 35 else "High"
+    status = {"Low": "APPROVED", "Medium": "NEEDS_REVIEW", "High": "REJECTED"}[risk]
+    plans = _tool_value(tool_results.get("calculate_loan_plans") or "Loan plans unavailable.")
+    if isinstance(plans, dict):
+        plans = plans.get("loan_plan_table") or plans.get("error") or json.dumps(plans)
+    return {
+        "suggested_status": status,
+        "risk": risk,
+        "response": (
+            f"4. Financial Analysis: Monthly income INR {salary:.0f}. Existing EMI INR {emi:.0f}. "
+            f"DTI ratio {dti:.2f} percent ({risk} Risk).\n6. Loan Plans:\n{plans}\n"
+            f"8. Final Decision: {status} (synthetic decision from the local mock model)."
+        ),
+    }
+
+
+# -----------------------------
+# Strands message helpers
+# -----------------------------
+def _blocks(message):
+    return [b for b in message.get("content", []) if isinstance(b, dict)]
+
+
+def _message_text(message):
+    return "".join(b.get("text", "") for b in _blocks(message))
+
+
+def _tool_result_text(result):
+    parts = []
+    for item in result.get("content", []):
+        if "text" in item:
+            parts.append(item["text"])
+        elif "json" in item:
+            parts.append(json.dumps(item["json"]))
+    return "\n".join(parts)
+
+
+def _tool_history(messages):
+    """{tool name: result text} for tool calls already answered in this conversation."""
+    names = {}
+    results = {}
+    for message in messages:
+        for block in _blocks(message):
+            if "toolUse" in block:
+                names[block["toolUse"]["toolUseId"]] = block["toolUse"]["name"]
+            elif "toolResult" in block:
+                name = names.get(block["toolResult"]["toolUseId"])
+                if name:
+                    results[name] = _tool_result_text(block["toolResult"])
+    return results
+
+
+def _field_key(name):
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def _placeholder(annotation):
+    """Empty value of the field's type, for required fields the canned reply does not cover."""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, getattr(types, "UnionType", typing.Union)):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return None if len(args) < len(typing.get_args(annotation)) else _placeholder(args[0])
+    if origin in (list, tuple, set) or annotation in (list, tuple, set):
+        return []
+    if origin is dict or annotation is dict:
+        return {}
+    if hasattr(annotation, "model_fields"):
+        return structured_input(annotation, {})
+    return {str: "", int: 0, float: 0.0, bool: False}.get(annotation)
+
+
+def structured_input(output_model, reply):
+    """Tool input for a pydantic output_model: canned reply fields matched to its fields by normalized name."""
+    by_key = {_field_key(key): value for key, value in reply.items()}
+    values = {}
+    for name, field in output_model.model_fields.items():
+        key = field.alias or name
+        for candidate in (name, field.alias, field.title):
+            if candidate and _field_key(candidate) in by_key:
+                values[key] = by_key[_field_key(candidate)]
+                break
+        else:
+            if field.is_required():
+                values[key] = _placeholder(field.annotation)
+    return values
+
+
+def _first_user_prompt(messages):
+    for message in messages:
+        if message.get("role") == "user" and _message_text(message):
+            return _message_text(message)
+    return ""
+
+
+# -----------------------------
+# Model provider
+# -----------------------------
+class MockBedrockModel(Model):
+    """Strands model provider with canned replies, simulated tool calls, latency and throttling."""
+
+    def __init__(self, latency="0", ms_per_output_token=0.0, throttle_rate=0.0, max_concurrency=None,
+                 chars_per_token=4, seed=None, **model_config):
+        self.latency = parse_latency(latency)
+        self.ms_per_output_token = ms_per_output_token
+        self.throttle_rate = throttle_rate
+        self.max_concurrency = max_concurrency
+        self.chars_per_token = chars_per_token
+        self.config = {"model_id": "mock-bedrock", **model_config}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {"calls": {}, "throttled": 0, "peak_concurrency": 0, "input_tokens": 0, "output_tokens": 0}
+        self._latencies = []
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return dict(self.config)
+
+    def _respond(self, messages, tool_specs, output_model=None):
+        """(prompt type, text or None, tool use or None) for this turn."""
+        prompt = _first_user_prompt(messages)
+        prompt_type = classify_prompt(prompt)
+        if output_model is not None:
+            # Structured output is a forced call of the output_model tool with the canned reply as input
+            reply = decision_reply(_tool_history(messages)) if prompt_type == "decision" else reply_for(prompt_type, prompt)
+            return prompt_type, None, (output_model.__name__, structured_input(output_model, reply))
+        if prompt_type != "decision":
+            return prompt_type, json.dumps(reply_for(prompt_type, prompt)), None
+
+        available = {spec.get("name") for spec in tool_specs or []}
+        done = _tool_history(messages)
+        aa_path = _find(prompt, r'extract_financial_data tool on "([^"]+)"')
+        plan_prompt = _find(prompt, r'calculate_loan_plans tool with EXACT prompt: "([^"]+)"')
+        if "extract_financial_data" in available and "extract_financial_data" not in done and aa_path:
+            return "decision_tool", None, ("extract_financial_data", {"file_path": aa_path})
+        if "calculate_loan_plans" in available and "calculate_loan_plans" not in done and plan_prompt:
+            return "decision_tool", None, ("calculate_loan_plans", {"prompt": plan_prompt})
+        return prompt_type, json.dumps(decision_reply(done)), None
+
+    def _acquire(self):
+        with self._lock:
+            throttled = (self.max_concurrency is not None and self._in_flight >= self.max_concurrency) \
+                or self._rng.random() < self.throttle_rate
+            if throttled:
+                self._stats["throttled"] += 1
+                return None
+            self._in_flight += 1
+            self._stats["peak_concurrency"] = max(self._stats["peak_concurrency"], self._in_flight)
+            return self.latency(self._rng)
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, output_model=None, **kwargs):
+        base_latency = self._acquire()
+        if base_latency is None:
+            raise ModelThrottledException("Too many requests, please wait before trying again.")
+        try:
+            prompt_type, text, tool_use = self._respond(messages, tool_specs, output_model)
+            output = text if text is not None else json.dumps(tool_use[1])
+            input_tokens = estimate_tokens((system_prompt or "") + "".join(_message_text(m) for m in messages),
+                                           self.chars_per_token)
+            output_tokens = estimate_tokens(output, self.chars_per_token)
+            latency = base_latency + output_tokens * self.ms_per_output_token / 1000
+            await asyncio.sleep(latency)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self._stats["calls"][prompt_type] = self._stats["calls"].get(prompt_type, 0) + 1
+            self._stats["input_tokens"] += input_tokens
+            self._stats["output_tokens"] += output_tokens
+            self._latencies.append(latency)
+
+        yield {"messageStart": {"role": "assistant"}}
+        if tool_use is not None:
+            name, tool_input = tool_use
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": f"tooluse_{uuid.uuid4().hex[:12]}", "name": name}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_input)}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "tool_use"
+        else:
+            yield {"contentBlockStart": {"start": {}}}
+            yield {"contentBlockDelta": {"delta": {"text": text}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "end_turn"
+        yield {"messageStop": {"stopReason": stop_reason}}
+        yield {"metadata": {
+            "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens,
+                      "totalTokens": input_tokens + output_tokens},
+            "metrics": {"latencyMs": int(latency * 1000)},
+        }}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        """Like BedrockModel: stream a call of the output_model tool and build the model from its input."""
+        tool_input = ""
+        async for event in self.stream(prompt, system_prompt=system_prompt, output_model=output_model, **kwargs):
+            delta = event.get("contentBlockDelta", {}).get("delta", {})
+            tool_input += delta.get("toolUse", {}).get("input", "")
+            yield event
+        yield {"output": output_model(**json.loads(tool_input))}
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {**self._stats, "calls": dict(self._stats["calls"])}
+        if latencies:
+            pick = lambda q: latencies[min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))]
+            stats["latency"] = {"p50_s": round(pick(0.5), 3), "p95_s": round(pick(0.95), 3),
+                                "p99_s": round(pick(0.99), 3), "max_s": round(latencies[-1], 3)}
+        return stats
+
+
+# -----------------------------
+# Concurrency / tail latency check
+# -----------------------------
+def main():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from cv_strands import CrossValidationCoreBedrock
+    from bench_llm_tokens import SAMPLE_TEXTS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", default="lognormal:0.8,0.5")
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, help="mock account quota (throttle beyond it)")
+    parser.add_argument("--llm-slots", type=int, default=8, help="client-side in-flight cap (BEDROCK_MAX_CONCURRENCY)")
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockBedrockModel(latency=args.latency, throttle_rate=args.throttle_rate,
+                            max_concurrency=args.max_concurrency, seed=args.seed)
+    validator = CrossValidationCoreBedrock(model=mock, max_llm_concurrency=args.llm_slots)
+
+    def one_call(i):
+        start = time.perf_counter()
+        validator.extract_payslip_info(SAMPLE_TEXTS["payslip"])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = sorted(executor.map(one_call, range(args.calls)))
+    wall_s = time.perf_counter() - start
+    pick = lambda q: latencies[min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))]
+    print(json.dumps({
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall_s, 3),
+        "calls_per_s": round(args.calls / wall_s, 2),
+        "client_latency": {"p50_s": round(pick(0.5), 3), "p95_s": round(pick(0.95), 3),
+                           "p99_s": round(pick(0.99), 3), "max_s": round(latencies[-1], 3)},
+        "model": mock.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
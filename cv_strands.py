@@ -1,20 +1,29 @@
-import pytesseract
-from PIL import Image
-from pdf2image import convert_from_path
+import concurrent.futures
+import contextlib
 import json
 import os
 import re
+import threading
+import time
 from strands import Agent
 from strands.models import BedrockModel
 
+import telemetry
+from lazy_imports import lazy_import
+from ocr_service import get_ocr_service
+
+# OCR/rasterization libraries are imported on first use (see lazy_imports.py)
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+page_source = lazy_import("page_store")
+
 # ===== Set OCR Paths for Windows =====
 TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 POPPLER_PATH = r"C:\Program Files\poppler\Library\bin"
 
-# Check if Tesseract is installed
-if os.path.exists(TESSERACT_CMD):
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
-else:
+# Check if Tesseract is installed (the path is applied by configure_ocr_paths on first use)
+TESSERACT_INSTALLED = os.path.exists(TESSERACT_CMD)
+if not TESSERACT_INSTALLED:
     print("⚠️ WARNING: Tesseract not found at", TESSERACT_CMD)
     print("   Please install Tesseract-OCR from: https://github.com/UB-Mannheim/tesseract/wiki")
 
@@ -27,16 +36,73 @@ if not POPPLER_INSTALLED:
     print("   The bin folder should be at: C:\\Program Files\\poppler\\Library\\bin\\")
     
 
+def configure_ocr_paths():
+    if TESSERACT_INSTALLED:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+
+# ===== Native PDF Text Layer =====
+# Digitally generated PDFs (most corporate payslips, Form 16s) already carry
+# their text; only pages whose text layer is empty or unreadable are OCRed.
+USE_PDF_TEXT_LAYER = os.getenv("PDF_TEXT_LAYER", "1") == "1"
+TEXT_LAYER_MIN_CHARS = int(os.getenv("PDF_TEXT_LAYER_MIN_CHARS", "20"))
+TEXT_LAYER_MIN_READABLE = 0.85
+
+
+def text_layer_usable(text, min_chars=TEXT_LAYER_MIN_CHARS):
+    """True if an embedded text layer looks like real text rather than empty/garbled glyphs."""
+    chars = "".join(text.split())
+    if len(chars) < min_chars:
+        return False
+    # Fonts without a unicode map come out as U+FFFD, private-use or control characters
+    readable = sum(1 for ch in chars if ch.isprintable() and ch != "\ufffd" and not "\ue000" <= ch <= "\uf8ff")
+    if readable / len(chars) < TEXT_LAYER_MIN_READABLE:
+        return False
+    return sum(1 for ch in chars if ch.isalnum()) >= min_chars // 2
+
+
 class CrossValidationCoreBedrock:
-    def __init__(self, model_name="deepseek.v3-v1:0"):
-        # Initialize Bedrock model
-        self.model = BedrockModel(model_id=model_name)
+    SYSTEM_PROMPT = "You are a document extraction AI. Extract information from documents and return ONLY valid JSON, no explanations."
+
+    def __init__(self, model_name="deepseek.v3-v1:0", registry=None, stateless=True, max_llm_concurrency=4,
+                 model=None):
+        self.model_name = model_name
+        configure_ocr_paths()
+        # Initialize Bedrock model (shared process-wide when a registry is provided);
+        # any other strands Model (e.g. a local mock) can be passed as ``model``
+        # Concurrent Bedrock requests are capped by a semaphore, process-wide with a registry
+        if registry is not None:
+            self.model = model or registry.bedrock_model(model_name)
+            self.llm_slots = registry.llm_slots
+        else:
+            self.model = model or BedrockModel(model_id=model_name)
+            self.llm_slots = threading.BoundedSemaphore(max_llm_concurrency)
+
+        # Stateless mode sends every extraction/comparison with only the system
+        # prompt and its own input. Otherwise one agent is reused and its
+        # conversation history grows with every call.
+        self.stateless = stateless
+        self.agent = None if stateless else self._create_agent()
+
+        # Per-call token usage and latency
+        self.llm_calls = []
+        self._llm_calls_lock = threading.Lock()
+        self._agent_lock = threading.Lock()
+        # Optional per-workflow PageStore shared with the document analyzer
+        self.page_store = None
+        # Concurrent tesseract calls per multi-page PDF
+        self.ocr_page_workers = int(os.getenv("OCR_PAGE_WORKERS", "4"))
+        # Per PDF: how each page's text was obtained ("text_layer", "ocr", or "failed" if it could not be rendered)
+        self.text_sources = {}
+        self._agent_usage_seen = (0, 0)
+        print(f"✅ Initialized CrossValidationCoreBedrock with model: {model_name} (stateless={stateless})")
+
+    def _create_agent(self):
         # Create a simple agent for LLM requests
-        self.agent = Agent(
+        return Agent(
             model=self.model,
-            system_prompt="You are a document extraction AI. Extract information from documents and return ONLY valid JSON, no explanations."
+            system_prompt=self.SYSTEM_PROMPT
         )
-        print(f"✅ Initialized CrossValidationCoreBedrock with model: {model_name}")
 
     # ===== OCR Extraction =====
     def extract_text_from_image(self, image_path):
@@ -46,7 +112,7 @@ class CrossValidationCoreBedrock:
             return ""
         image = Image.open(image_path)
         try:
-            return pytesseract.image_to_string(image).strip()
+            return get_ocr_service().image_to_string(image).strip()
         except Exception as e:
             print(f"❌ Failed to OCR image: {e}")
             return ""
@@ -56,29 +122,79 @@ class CrossValidationCoreBedrock:
         if not os.path.exists(pdf_path):
             print(f"❌ File not found: {pdf_path}")
             return ""
+        def ocr_page(i, page):
+            try:
+                return get_ocr_service().image_to_string(page) + "\n"
+            except Exception as ocr_error:
+                print(f"⚠️ Failed to OCR page {i+1}: {str(ocr_error)[:100]}")
+                # Continue with other pages
+                return ""
+
+        poppler_path = POPPLER_PATH if POPPLER_INSTALLED else None
+        page_texts = {}
         try:
-            # Try with poppler_path if installed, otherwise try system PATH
-            if POPPLER_INSTALLED:
-                pages = convert_from_path(pdf_path, poppler_path=POPPLER_PATH)
+            text_layer = page_source.pdf_text_layer(pdf_path) if USE_PDF_TEXT_LAYER else None
+        except Exception as e:
+            print(f"⚠️ Could not read PDF text layer, using OCR: {str(e)[:100]}")
+            text_layer = None
+
+        if text_layer is None:
+            # Reuse pages already rendered for the document analyzer, if any
+            if self.page_store is not None:
+                pages = enumerate(self.page_store.iter_pages(pdf_path))
             else:
-                # Try without explicit path (will use system PATH)
-                pages = convert_from_path(pdf_path)
+                # Try with poppler_path if installed, otherwise try system PATH
+                pages = enumerate(page_source.iter_pdf_pages(pdf_path, poppler_path=poppler_path))
+            sources = None
+        else:
+            sources = ["text_layer" if text_layer_usable(text) else "ocr" for text in text_layer]
+            for i, text in enumerate(text_layer):
+                if sources[i] == "text_layer":
+                    page_texts[i] = text.strip() + "\n"
+            ocr_indexes = [i for i, source in enumerate(sources) if source == "ocr"]
+            if self.page_store is not None:
+                pages = ((i, self.page_store.get_page(pdf_path, i + 1)) for i in ocr_indexes)
+            else:
+                pages = ((i, page_source.render_pdf_page(pdf_path, i + 1, poppler_path=poppler_path)) for i in ocr_indexes)
+            print(f"📝 {os.path.basename(pdf_path)}: {len(sources) - len(ocr_indexes)} page(s) from text layer, "
+                  f"{len(ocr_indexes)} page(s) need OCR")
+
+        # Pages are rendered one at a time; tesseract runs as a separate process per call,
+        # so up to ocr_page_workers pages are OCRed concurrently (and held in memory)
+        workers = max(1, self.ocr_page_workers)
+        in_flight = {}
+        ocr_error = None
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for i, page in pages:
+                    in_flight[executor.submit(telemetry.in_context(ocr_page), i, page)] = i
+                    if len(in_flight) >= workers:
+                        done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            page_texts[in_flight.pop(future)] = future.result()
+                for future in concurrent.futures.as_completed(in_flight):
+                    page_texts[in_flight[future]] = future.result()
         except Exception as e:
+            ocr_error = e
             print(f"❌ Failed to OCR PDF: {e}")
             if "poppler" in str(e).lower() or "Unable to get page count" in str(e):
                 print("   💡 Poppler is not installed or not in PATH")
                 print("   Download: https://github.com/oschwartz10612/poppler-windows/releases/")
                 print("   Extract to: C:\\Program Files\\poppler\\")
-            return ""
-        full_text = ""
-        for i, page in enumerate(pages):
-            try:
-                full_text += pytesseract.image_to_string(page) + "\n"
-            except Exception as ocr_error:
-                print(f"⚠️ Failed to OCR page {i+1}: {str(ocr_error)[:100]}")
-                # Continue with other pages
-                continue
-        return full_text.strip()
+            # Keep the text-layer pages and whatever was OCRed before the failure
+            for future, i in in_flight.items():
+                if i not in page_texts and future.done() and not future.cancelled() and future.exception() is None:
+                    page_texts[i] = future.result()
+            if not page_texts:
+                return ""
+        if sources is None:
+            page_count = max(page_texts, default=-1) + 1
+            sources = ["ocr" if i in page_texts else "failed" for i in range(page_count)]
+        elif ocr_error is not None:
+            sources = [source if source == "text_layer" or i in page_texts else "failed"
+                       for i, source in enumerate(sources)]
+        self.text_sources[os.path.basename(pdf_path)] = sources
+        return "".join(page_texts[i] for i in sorted(page_texts)).strip()
 
     # ===== Clean LLM Response =====
     def clean_llm_response(self, content: str) -> str:
@@ -93,12 +209,56 @@ class CrossValidationCoreBedrock:
             content = "\n".join(lines).strip()
         return content
 
+    # ===== LLM Usage Instrumentation =====
+    def _record_llm_call(self, call_name, response, latency):
+        usage = {}
+        metrics = getattr(response, 'metrics', None)
+        if metrics is not None:
+            usage = getattr(metrics, 'accumulated_usage', None) or {}
+        input_tokens = int(usage.get('inputTokens', 0) or 0)
+        output_tokens = int(usage.get('outputTokens', 0) or 0)
+
+        with self._llm_calls_lock:
+            if not self.stateless:
+                # A reused agent reports totals across all of its calls so far
+                seen_in, seen_out = self._agent_usage_seen
+                self._agent_usage_seen = (input_tokens, output_tokens)
+                input_tokens -= seen_in
+                output_tokens -= seen_out
+            record = {
+                "call": call_name,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "latency_s": round(latency, 3),
+                "stateless": self.stateless
+            }
+            self.llm_calls.append(record)
+        print(f"📊 LLM call {call_name}: {input_tokens} input / {output_tokens} output tokens in {latency:.2f}s")
+
+    def llm_usage_summary(self):
+        """Totals over every LLM call made by this instance."""
+        with self._llm_calls_lock:
+            calls = list(self.llm_calls)
+        return {
+            "calls": len(calls),
+            "input_tokens": sum(c["input_tokens"] for c in calls),
+            "output_tokens": sum(c["output_tokens"] for c in calls),
+            "per_call": calls
+        }
+
     # ===== Shared LLM Request Function using Strands Agent =====
-    def _send_llm_request(self, prompt):
+    def _send_llm_request(self, prompt, call_name="llm_request"):
         print("Sending LLM request...")
         try:
             # Use Strands agent to generate response
-            response = self.agent(prompt)
+            # A shared (stateful) agent can only serve one request at a time
+            agent = self._create_agent() if self.stateless else self.agent
+            agent_lock = contextlib.nullcontext() if self.stateless else self._agent_lock
+            with agent_lock, self.llm_slots, telemetry.span(f"llm.{call_name}"):
+                start = time.perf_counter()
+                response = agent(prompt)
+                latency = time.perf_counter() - start
+            self._record_llm_call(call_name, response, latency)
             
             # Extract content from response
             if isinstance(response, str):
@@ -156,7 +316,7 @@ Offer Letter Text:
 
 Return ONLY valid JSON, no other text.
 """
-        return self._send_llm_request(prompt)
+        return self._send_llm_request(prompt, call_name="extract_offer")
 
     # ===== Payslip Extraction =====
     def extract_payslip_info(self, ocr_text):
@@ -211,7 +371,7 @@ Payslip Text:
 
 Return ONLY valid JSON, no other text.
 """
-        return self._send_llm_request(prompt)
+        return self._send_llm_request(prompt, call_name="extract_payslip")
 
     # ===== Bank Statement Extraction =====
     def extract_bank_info(self, ocr_text):
@@ -237,7 +397,7 @@ Bank Statement Text:
 
 Return ONLY valid JSON, no other text.
 """
-        return self._send_llm_request(prompt)
+        return self._send_llm_request(prompt, call_name="extract_bank")
 
     # ===== Cross Check Salary =====
     def cross_check_salary(self, payslip_json, bank_json):
@@ -270,7 +430,7 @@ Bank Statement:
 
 Return ONLY valid JSON, no other text.
 """
-        return self._send_llm_request(prompt)
+        return self._send_llm_request(prompt, call_name="bank_vs_payslip")
 
     # ===== Semantic Comparison =====
     def compare_with_llm(self, payslip_json, offer_json):
@@ -302,7 +462,7 @@ Offer Letter:
 
 Return ONLY valid JSON, no other text.
 """
-        result = self._send_llm_request(prompt)
+        result = self._send_llm_request(prompt, call_name="payslip_vs_offer")
         print(f"✅ Comparison result: {result}")
         return result
 
@@ -345,7 +505,7 @@ Form 16 Text:
 
 Return ONLY valid JSON, no other text.
 """
-        response = self._send_llm_request(prompt)
+        response = self._send_llm_request(prompt, call_name="extract_form16")
         info = response if isinstance(response, dict) else {}
         employee_pan = self.extract_employee_pan(text)
         if employee_pan:
@@ -387,4 +547,4 @@ Form 16:
 
 Return ONLY valid JSON, no other text.
 """
-        return self._send_llm_request(prompt)
\ No newline at end of file
+        return self._send_llm_request(prompt, call_name="payslip_vs_form16")
\ No newline at end of file
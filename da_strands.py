@@ -5,61 +5,128 @@
 from strands import Agent, tool
 import io
 import os
-import cv2
-import torch
-import numpy as np
 import json
 import gc
-from PIL import Image, ImageChops
+import functools
+import threading
 from difflib import SequenceMatcher
-from skimage.filters import threshold_otsu
-from torchvision import models, transforms
-from pdf2image import convert_from_path
-import pytesseract
 import shutil
-import matplotlib.pyplot as plt
 import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime
-from langchain_aws import ChatBedrockConverse
+
+import telemetry
+from artifact_uploader import ArtifactUploader
+from lazy_imports import lazy_import
+from ocr_service import get_ocr_service
+
+# Heavy dependencies are imported on first use (see lazy_imports.py)
+cv2 = lazy_import("cv2")
+torch = lazy_import("torch")
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+models = lazy_import("torchvision.models")
+pdf2image = lazy_import("pdf2image")
+pytesseract = lazy_import("pytesseract")
+plt = lazy_import("matplotlib.pyplot")
+forensics = lazy_import("forensics")
+inference_batcher = lazy_import("inference_batcher")
+inference_backends = lazy_import("inference_backends")
+page_source = lazy_import("page_store")
 
 
 # ------------------------------------------------------------
 # 1️⃣ Define the Core Analyzer Logic (As a Class)
 # ------------------------------------------------------------
 
-class DocumentAnalyzerCore:
-    """Performs image and PDF forensic analysis using ELA, OCR, and CNN."""
+def configure_tesseract():
+    """Point pytesseract at the system Tesseract binary (Windows fallback)."""
+    # ✅ Auto-detect or set fallback Tesseract path for Windows
+    tesseract_path = shutil.which("tesseract")
+    if tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        print(f"✅ Using system Tesseract at: {tesseract_path}")
+    else:
+        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+        print("⚠️ Using fallback Tesseract path: C:\\Program Files\\Tesseract-OCR\\tesseract.exe")
 
-    def __init__(self, loan_id=None, s3_bucket="documents-loaniq"):
-        # ✅ Auto-detect or set fallback Tesseract path for Windows
-        tesseract_path = shutil.which("tesseract")
-        if tesseract_path:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-            print(f"✅ Using system Tesseract at: {tesseract_path}")
-        else:
-            pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-            print("⚠️ Using fallback Tesseract path: C:\\Program Files\\Tesseract-OCR\\tesseract.exe")
+    # Optional: Print version check for debugging
+    try:
+        version = pytesseract.get_tesseract_version()
+        print(f"🧠 Tesseract version detected: {version}")
+    except Exception as e:
+        print(f"⚠️ Could not retrieve Tesseract version: {e}")
 
-        # Optional: Print version check for debugging
-        try:
-            version = pytesseract.get_tesseract_version()
-            print(f"🧠 Tesseract version detected: {version}")
-        except Exception as e:
-            print(f"⚠️ Could not retrieve Tesseract version: {e}")
 
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = self._load_model()
-        self.transform = transforms.Compose([
-            transforms.Resize((224, 224)),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                                 std=[0.229, 0.224, 0.225])
-        ])
-        
+def build_transform():
+    """Preprocessing applied to every page before it reaches the model."""
+    return forensics.build_transform()
+
+
+def load_resnet50(device):
+    """Load the ResNet50 tamper model in eval mode on the given device."""
+    # Using ResNet50 for GradCAM compatibility (same as sample da.py)
+    model = models.resnet50(pretrained=True)
+    model = model.to(device)
+    model.eval()
+    return model
+
+
+class DocumentAnalyzerCore:
+    """Performs image and PDF forensic analysis using ELA, OCR, and CNN."""
+
+    def __init__(self, loan_id=None, s3_bucket="documents-loaniq", registry=None, batch_size=None):
         # S3 configuration
         self.loan_id = loan_id
         self.s3_bucket = s3_bucket
+
+        # Tensors per ResNet forward pass when scoring pages
+        self.batch_size = batch_size or int(os.getenv("INFERENCE_BATCH_SIZE", "16"))
+        # Optional cross-application InferenceBatcher (owned by the registry)
+        self.batcher = None
+        # Optional per-workflow PageStore shared with the OCR path
+        self.page_store = None
+        # {file name: {"pages", "peak_raster_mb"}} from the last analyze_documents call
+        self.memory_report = {}
+        # Optional process pool for page features (forensics.create_forensics_pool)
+        self.forensics_pool = None
+        # Keep layer4 activations from scoring so GradCAM needs no extra forward/backward pass
+        self.gradcam_from_scoring = os.getenv("GRADCAM_FROM_SCORING", "1") == "1"
+        # Heuristics run on a downsampled level of pages above FORENSICS_MAX_PIXELS
+        # (default 1 MP, about A4 at 100 DPI; 0 = full resolution);
+        # pages scoring within FORENSICS_REFINE_MARGIN of a decision boundary are redone at full size
+        self.forensics_max_pixels = int(os.getenv("FORENSICS_MAX_PIXELS", "1000000"))
+        self.refine_margin = float(os.getenv("FORENSICS_REFINE_MARGIN", "0.05"))
+        # GradCAM uploads are queued here and awaited by flush_uploads
+        self.artifact_uploader = None
+        # True when the uploader was created here (no registry) and must be closed here
+        self._owns_uploader = False
+        self._pending_uploads = []
+        self._uploads_lock = threading.Lock()
+
+        # ✅ Reuse process-wide model/transform/S3 client when a registry is provided
+        if registry is not None:
+            registry.load()
+            self.device = registry.device
+            self.model = registry.model
+            self.backend = registry.backend
+            self.transform = registry.transform
+            self.s3_client = registry.s3_client
+            self.gradcam_lock = registry.gradcam_lock
+            self.batcher = registry.batcher
+            self.forensics_pool = registry.forensics_pool
+            self.artifact_uploader = registry.artifact_uploader
+            self.batch_size = batch_size or registry.inference_batch_size
+            return
+
+        configure_tesseract()
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = self._load_model()
+        # Scoring runs on the selected backend; GradCAM weights come from the eager model
+        self.backend = inference_backends.create_backend(inference_backends.default_backend_name(), self.model)
+        self.transform = build_transform()
+        self.gradcam_lock = threading.Lock()
+
         self.s3_client = None
         try:
             self.s3_client = boto3.client('s3')
@@ -68,11 +135,7 @@ class DocumentAnalyzerCore:
             print(f"⚠️ S3 client initialization failed: {e}")
 
     def _load_model(self):
-        # Using ResNet50 for GradCAM compatibility (same as sample da.py)
-        model = models.resnet50(pretrained=True)
-        model = model.to(self.device)
-        model.eval()
-        return model
+        return load_resnet50(self.device)
 
     def normalize(self, v, mx=1.0):
         return max(0.0, min(1.0, v / mx))
@@ -81,7 +144,7 @@ class DocumentAnalyzerCore:
         print("Comparing OCR output vs provided text...")
         """Compare OCR output vs provided text."""
         try:
-            ocr = pytesseract.image_to_string(pil_img, lang='eng') or ""
+            ocr = get_ocr_service().image_to_string(pil_img, lang='eng') or ""
         except Exception as e:
             print(f"❌ OCR failed: {e}")
             return 0.0
@@ -96,75 +159,90 @@ class DocumentAnalyzerCore:
     def compute_ela(self, pil_img, quality=90):
         """Compute Error Level Analysis image (PIL) - from sample da.py."""
         print("Computing ELA...")
-        buf = io.BytesIO()
-        pil_img.convert("RGB").save(buf, format="JPEG", quality=quality)
-        buf.seek(0)
-        recompressed = Image.open(buf).convert("RGB")
-        ela_img = ImageChops.difference(pil_img.convert("RGB"), recompressed)
-        extrema = ela_img.getextrema()
-        max_diff = max([e[1] for e in extrema]) or 1
-        scale = 255.0 / max_diff
-        ela_np = np.array(ela_img).astype("float32") * scale
-        ela_np = np.clip(ela_np, 0, 255).astype("uint8")
-        return Image.fromarray(ela_np)
-    
+        return forensics.compute_ela(pil_img, quality=quality)
+
     def compute_noise_residual(self, pil_img):
         """High-pass filter / Laplacian to get noise residual (PIL) - from sample da.py."""
         print("Computing noise residual...")
-        gray = np.array(pil_img.convert("L"))
-        lap = cv2.Laplacian(gray, ddepth=cv2.CV_32F, ksize=3)
-        nm = np.abs(lap)
-        nm = nm / (nm.max() + 1e-8) * 255.0
-        nm = nm.astype("uint8")
-        return Image.fromarray(nm)
+        return forensics.compute_noise_residual(pil_img)
 
     def ela_score(self, pil_img):
-        print("Computing ELA-based forgery likelihood score...")
         """Compute ELA-based forgery likelihood score."""
-        ela = self.compute_ela(pil_img)
-        ela_gray = np.array(ela.convert('L'))
-        try:
-            thresh = threshold_otsu(ela_gray)
-        except Exception:
-            thresh = 60
-        bw = (ela_gray > max(thresh, 60)).astype('uint8') * 255
-        contours, _ = cv2.findContours(bw, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        h, w = ela_gray.shape[:2]
-        page_area = h * w
-        large_area = sum(cv2.contourArea(c) for c in contours if cv2.contourArea(c) > (page_area * 0.001))
-        area_ratio = large_area / page_area
-        mean_intensity = float(ela_gray.mean()) / 255.0
-        score = self.normalize(area_ratio, 0.05) * 0.8 + self.normalize(mean_intensity, 0.25) * 0.2
-        return score
+        print("Computing ELA-based forgery likelihood score...")
+        return forensics.ela_region_score(pil_img)
+
+    def _render_cam(self, pil_img, cam):
+        """Overlay a (H, W) activation map on the page and return PNG bytes."""
+        cam = cam - cam.min()
+        cam = cam / (cam.max() + 1e-8)
+
+        # resize to original image size
+        pil_img = forensics.downsample(pil_img, self.forensics_max_pixels)
+        cam_resized = cv2.resize(cam, (pil_img.width, pil_img.height))
+        heatmap = cv2.applyColorMap(np.uint8(255 * cam_resized), cv2.COLORMAP_JET)
+        overlay = cv2.addWeighted(np.array(pil_img.convert("RGB")), 0.6, heatmap, 0.4, 0)
+
+        # Convert to bytes instead of saving
+        buf = io.BytesIO()
+        plt.imsave(buf, overlay, format='png')
+        buf.seek(0)
+        image_bytes = buf.read()
+        print(f"✅ GradCAM generated in memory")
+        return image_bytes
+
+    def gradcam_from_features(self, pil_img, features, target_class):
+        """
+        Grad-CAM from layer4 activations captured during scoring (no forward/backward pass).
+        This reads the block output (after bn3 + residual + ReLU) rather than conv3, which
+        generate_gradcam hooks, so the two heatmaps are close but not identical. After layer4, ResNet50 is global average pooling + fc, so the gradient of the
+        class logit w.r.t. each activation is fc.weight[c] / (H * W) everywhere.
+        """
+        print(f"Generating GradCAM heatmap from scoring activations...")
+        with torch.no_grad():
+            activations = features.to(torch.float32)
+            h, w = activations.shape[-2:]
+            weights = self.model.fc.weight[target_class].detach().cpu().to(torch.float32) / (h * w)
+            cam = torch.relu((weights[:, None, None] * activations).sum(dim=0))
+        return self._render_cam(pil_img, cam.numpy())
 
     def generate_gradcam(self, pil_img, target_class=None):
-        """Generate Grad-CAM using last conv layer of ResNet50 and return as bytes."""
+        """Generate Grad-CAM on layer4[-1].conv3 of ResNet50 and return as bytes."""
         print(f"Generating GradCAM heatmap...")
         self.model.eval()
         img_tensor = self.transform(pil_img).unsqueeze(0).to(self.device)
         features = None
         grads = None
 
+        owner = threading.get_ident()
+
+        # Only capture this thread's pass; other workflows may be scoring concurrently
         def forward_hook(module, input, output):
             nonlocal features
-            features = output
+            if threading.get_ident() == owner:
+                features = output
 
         def backward_hook(module, grad_in, grad_out):
             nonlocal grads
-            grads = grad_out[0]
+            if threading.get_ident() == owner:
+                grads = grad_out[0]
 
         # register hooks on layer4[-1].conv3
-        last_conv = self.model.layer4[-1].conv3
-        h_f = last_conv.register_forward_hook(forward_hook)
-        h_b = last_conv.register_backward_hook(backward_hook)
-
-        logits = self.model(img_tensor)
-        if target_class is None:
-            target_class = int(logits.argmax(dim=1)[0].item())
+        # (the model may be shared across workflows, so hooks are serialized)
+        with self.gradcam_lock:
+            last_conv = self.model.layer4[-1].conv3
+            h_f = last_conv.register_forward_hook(forward_hook)
+            h_b = last_conv.register_full_backward_hook(backward_hook)
+            try:
+                logits = self.model(img_tensor)
+                if target_class is None:
+                    target_class = int(logits.argmax(dim=1)[0].item())
 
-        score = logits[0, target_class]
-        self.model.zero_grad()
-        score.backward(retain_graph=False)
+                score = logits[0, target_class]
+                self.model.zero_grad()
+                score.backward(retain_graph=False)
+            finally:
+                h_f.remove()
+                h_b.remove()
 
         # detach
         gradients = grads.detach()
@@ -175,24 +253,7 @@ class DocumentAnalyzerCore:
         cam = (weights * activations).sum(dim=1, keepdim=True)
         cam = torch.relu(cam)
         cam = cam.squeeze().cpu().numpy()
-        cam = cam - cam.min()
-        cam = cam / (cam.max() + 1e-8)
-
-        # resize to original image size
-        cam_resized = cv2.resize(cam, (pil_img.width, pil_img.height))
-        heatmap = cv2.applyColorMap(np.uint8(255 * cam_resized), cv2.COLORMAP_JET)
-        overlay = cv2.addWeighted(np.array(pil_img.convert("RGB")), 0.6, heatmap, 0.4, 0)
-
-        # Convert to bytes instead of saving
-        buf = io.BytesIO()
-        plt.imsave(buf, overlay, format='png')
-        buf.seek(0)
-        image_bytes = buf.read()
-        
-        h_f.remove()
-        h_b.remove()
-        print(f"✅ GradCAM generated in memory")
-        return image_bytes
+        return self._render_cam(pil_img, cam)
     
     def upload_to_s3(self, local_file_path, s3_key):
         """Upload file to S3 bucket."""
@@ -229,141 +290,306 @@ class DocumentAnalyzerCore:
             print(f"❌ S3 upload failed: {e}")
             return None
     
-    def score_image(self, pil_img):
-        """Ensemble scoring from sample da.py - returns (ensemble_score, details_dict)."""
-        print("Scoring image with ensemble method...")
-        # ELA and noise
+    def gradcam_prefix(self) -> str:
+        """S3 key prefix for this loan's GradCAM images."""
+        return f"{self.loan_id}/gradcam/"
+
+    def queue_upload(self, page_entry, file_bytes, s3_key, content_type='image/png'):
+        """Upload in the background; flush_uploads records the URL/key (or error) on page_entry."""
+        with self._uploads_lock:
+            if self.artifact_uploader is None:
+                self.artifact_uploader = ArtifactUploader(self.s3_client)
+                self._owns_uploader = True
+            future = self.artifact_uploader.submit(self.s3_bucket, s3_key, file_bytes, content_type)
+            self._pending_uploads.append((future, page_entry, s3_key))
+
+    def flush_uploads(self, timeout=None):
+        """Wait for every queued upload and update its page entry. Returns the number flushed."""
+        with self._uploads_lock:
+            pending, self._pending_uploads = self._pending_uploads, []
+        with telemetry.span("s3.flush_uploads"):
+            for future, page_entry, s3_key in pending:
+                try:
+                    page_entry["gradcam_s3_url"] = future.result(timeout=timeout)
+                    page_entry["gradcam_s3_key"] = s3_key
+                except Exception as e:
+                    page_entry["gradcam_error"] = f"GradCAM upload failed: {e}"
+        self._close_owned_uploader()
+        return len(pending)
+
+    def _close_owned_uploader(self, wait=True):
+        """Shut down an uploader this analyzer created; a registry's shared one is left alone."""
+        with self._uploads_lock:
+            if not self._owns_uploader or self._pending_uploads:
+                return
+            uploader, self.artifact_uploader, self._owns_uploader = self.artifact_uploader, None, False
+        uploader.close(wait=wait)
+
+    def __del__(self):
         try:
-            ela_img = self.compute_ela(pil_img)
+            if self._owns_uploader and self.artifact_uploader is not None:
+                self.artifact_uploader.close(wait=False)
         except Exception:
-            buf = io.BytesIO()
-            pil_img.convert("RGB").save(buf, format="JPEG", quality=90)
-            buf.seek(0)
-            recompressed = Image.open(buf).convert("RGB")
-            ela_img = ImageChops.difference(pil_img.convert("RGB"), recompressed)
-
-        noise_img = self.compute_noise_residual(pil_img)
-
-        # Model probs: original image
-        with torch.no_grad():
-            t = self.transform(pil_img).unsqueeze(0).to(self.device)
-            logits = self.model(t)
-            probs = torch.nn.functional.softmax(logits, dim=1)[0].cpu().numpy()
-            model_prob_orig = float(probs.max())
-
-        # Model probs: ELA image
-        ela_rgb = ela_img.convert("RGB")
-        with torch.no_grad():
-            t2 = self.transform(ela_rgb).unsqueeze(0).to(self.device)
-            logits2 = self.model(t2)
-            probs2 = torch.nn.functional.softmax(logits2, dim=1)[0].cpu().numpy()
-            model_prob_ela = float(probs2.max())
-
-        # Heuristic statistics from ELA/noise
-        ela_np = np.array(ela_img.convert("L")).astype("float32") / 255.0
-        ela_mean = float(ela_np.mean())
-        ela_std = float(ela_np.std())
-
-        noise_np = np.array(noise_img).astype("float32") / 255.0
-        noise_mean = float(noise_np.mean())
-        noise_std = float(noise_np.std())
-
-        # Ensemble score calculation
+            pass
+
+    def _page_inputs(self, pil_img, max_pixels=None):
+        """Model input tensors (original, ELA) and ELA/noise statistics for one page."""
+        orig_input, ela_input, stats = forensics.page_features(pil_img, self.transform, max_pixels=max_pixels)
+        return torch.from_numpy(orig_input), torch.from_numpy(ela_input), stats
+
+    def _all_page_inputs(self, pages, max_pixels=None):
+        """_page_inputs for every page, in the forensics process pool when one is configured."""
+        if self.forensics_pool is None or len(pages) < 2:
+            return [self._page_inputs(page, max_pixels) for page in pages]
+        print(f"Extracting page features in process pool ({len(pages)} page(s))...")
+        features = functools.partial(forensics.page_features, max_pixels=max_pixels)
+        return [
+            (torch.from_numpy(orig_input), torch.from_numpy(ela_input), stats)
+            for orig_input, ela_input, stats in self.forensics_pool.map(features, pages)
+        ]
+
+    def _ensemble(self, model_prob_orig, model_prob_ela, stats):
+        """Combine model probabilities and heuristics into (ensemble_score, details)."""
         ensemble_score = (
             0.45 * model_prob_orig +
             0.35 * model_prob_ela +
-            0.1 * min(1.0, ela_std * 5) +
-            0.1 * min(1.0, noise_std * 5)
+            0.1 * min(1.0, stats["ela_std"] * 5) +
+            0.1 * min(1.0, stats["noise_std"] * 5)
         )
 
         details = {
             "model_prob_orig": round(model_prob_orig, 4),
             "model_prob_ela": round(model_prob_ela, 4),
-            "ela_mean": round(ela_mean, 4),
-            "ela_std": round(ela_std, 4),
-            "noise_mean": round(noise_mean, 4),
-            "noise_std": round(noise_std, 4)
+            "ela_mean": round(stats["ela_mean"], 4),
+            "ela_std": round(stats["ela_std"], 4),
+            "noise_mean": round(stats["noise_mean"], 4),
+            "noise_std": round(stats["noise_std"], 4),
+            "forensics_scale": round(stats.get("scale", 1.0), 3)
         }
         return ensemble_score, details
 
-    def analyze_document(self, path, dpi=200, tamper_threshold=0.5, verbose=False):
-        """Analyze a single document (PDF or image) with GradCAM and S3 upload."""
-        print(f"\n{'='*60}")
-        print(f"Analyzing document: {os.path.basename(path)}")
-        print(f"{'='*60}")
-        
-        ext = os.path.splitext(path)[1].lower()
-        fname = os.path.basename(path)
-        
-        if ext == '.pdf':
-            try:
-                pages = convert_from_path(path, dpi=dpi)
-                print(f"✅ PDF converted: {len(pages)} page(s)")
-            except Exception as e:
-                return [{"error": f"Failed to convert PDF: {e}"}]
-        else:
-            try:
-                pages = [Image.open(path).convert("RGB")]
-                print(f"✅ Image loaded successfully")
-            except Exception as e:
-                return [{"error": f"Failed to open image: {e}"}]
+    def model_scores(self, tensors):
+        """
+        [(max softmax prob, argmax class, layer4 activations or None)] per tensor, batched
+        (and shared across workflows if a batcher is set).
+        """
+        if self.batcher is not None:
+            return self.batcher.score(tensors)
+        return inference_batcher.score_tensors(self.backend, tensors, batch_size=self.batch_size,
+                                               keep_features=self.gradcam_from_scoring)
+
+    def model_max_probs(self, tensors):
+        """Max softmax probability per tensor."""
+        return [prob for prob, _, _ in self.model_scores(tensors)]
+
+    def score_pages_with_features(self, pages, tamper_threshold=None):
+        """
+        Like score_pages, but also returns the (layer4 activations, predicted class)
+        of each original page from the scoring pass, for gradcam_from_features.
+        Returns [(ensemble_score, details, cam_source or None)].
+        With tamper_threshold, downsampled pages scoring within refine_margin of it
+        (or of the 0.55/0.6 level boundaries) are rescored at full resolution.
+        """
+        print(f"Scoring {len(pages)} page(s) with batched ensemble method...")
+        results = self._score_pages_at(pages, self.forensics_max_pixels)
+        if tamper_threshold is None or not self.forensics_max_pixels:
+            return results
+
+        boundaries = (tamper_threshold, 0.55, 0.6)
+        refine = [
+            i for i, (score, details, _) in enumerate(results)
+            if details["forensics_scale"] < 1.0 and any(abs(score - b) <= self.refine_margin for b in boundaries)
+        ]
+        if refine:
+            print(f"Refining {len(refine)} borderline page(s) at full resolution...")
+            for i, result in zip(refine, self._score_pages_at([pages[i] for i in refine], None)):
+                results[i] = result
+        return results
 
+    def _score_pages_at(self, pages, max_pixels):
+        tensors = []
+        page_stats = []
+        with telemetry.span("forensics.page_features"):
+            page_inputs = self._all_page_inputs(pages, max_pixels)
+        for orig_tensor, ela_tensor, stats in page_inputs:
+            tensors.extend([orig_tensor, ela_tensor])
+            page_stats.append(stats)
+
+        with telemetry.span("model.score_pages"):
+            scored = self.model_scores(tensors)
         results = []
-        for idx, page_img in enumerate(pages, start=1):
-            print(f"\n--- Processing Page {idx} ---")
-            
-            # Use ensemble scoring from sample da.py
-            ensemble_score, details = self.score_image(page_img)
-            
-            # Determine tampering level
-            # High: score > 0.6
-            # Medium: score >= 0.55 and <= 0.6
-            # Low: score < 0.55
-            if ensemble_score > 0.6:
-                level = "High"
-            elif ensemble_score >= 0.55:
-                level = "Medium"
+        for i, stats in enumerate(page_stats):
+            prob_orig, class_orig, features_orig = scored[2 * i]
+            prob_ela = scored[2 * i + 1][0]
+            ensemble_score, details = self._ensemble(prob_orig, prob_ela, stats)
+            cam_source = (features_orig, class_orig) if self.gradcam_from_scoring and features_orig is not None else None
+            results.append((ensemble_score, details, cam_source))
+        return results
+
+    def score_pages(self, pages):
+        """Ensemble-score many pages with batched model inference; returns [(ensemble_score, details)]."""
+        return [(score, details) for score, details, _ in self.score_pages_with_features(pages)]
+
+    def score_image(self, pil_img):
+        """Ensemble scoring from sample da.py - returns (ensemble_score, details_dict)."""
+        print("Scoring image with ensemble method...")
+        return self.score_pages([pil_img])[0]
+
+    def _iter_pages(self, path, dpi=200):
+        """Yield the pages of a PDF or image file one at a time."""
+        if os.path.splitext(path)[1].lower() == '.pdf':
+            if self.page_store is not None and self.page_store.dpi == dpi:
+                yield from self.page_store.iter_pages(path)
             else:
-                level = "Low"
-            
-            page_entry = {
-                "page": idx,
-                "ensemble_score": round(float(ensemble_score), 4),
-                "tampering_level": level,
-                "details": details,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
-            }
+                yield from page_source.iter_pdf_pages(path, dpi=dpi)
+        else:
+            yield Image.open(path).convert("RGB")
 
-            # Generate GradCAM if tampering detected
-            if ensemble_score >= tamper_threshold or ensemble_score >= 0.55:
-                print(f"⚠️ Tampering detected (score: {ensemble_score:.4f})! Generating GradCAM...")
-                
-                gradcam_filename = f"{os.path.splitext(fname)[0]}_page{idx}_gradcam.png"
-                
-                try:
-                    # Generate GradCAM in memory (no local save)
-                    gradcam_bytes = self.generate_gradcam(page_img)
-                    
-                    # Upload directly to S3 if configured
-                    if self.loan_id and self.s3_client:
-                        s3_key = f"{self.loan_id}/gradcam/{gradcam_filename}"
-                        s3_url = self.upload_bytes_to_s3(gradcam_bytes, s3_key)
-                        if s3_url:
-                            page_entry["gradcam_s3_url"] = s3_url
-                            page_entry["gradcam_s3_key"] = s3_key
+    def _load_error(self, path, e):
+        if os.path.splitext(path)[1].lower() == '.pdf':
+            return f"Failed to convert PDF: {e}"
+        return f"Failed to open image: {e}"
+
+    def _load_pages(self, path, dpi=200):
+        """Return (pages, error) for a PDF or image file, holding every page in memory."""
+        try:
+            return list(self._iter_pages(path, dpi=dpi)), None
+        except Exception as e:
+            return None, self._load_error(path, e)
+
+    def _page_entry(self, fname, idx, page_img, ensemble_score, details, tamper_threshold, cam_source=None):
+        """Build the result entry for one scored page, generating GradCAM when suspicious."""
+        # Determine tampering level
+        # High: score > 0.6
+        # Medium: score >= 0.55 and <= 0.6
+        # Low: score < 0.55
+        if ensemble_score > 0.6:
+            level = "High"
+        elif ensemble_score >= 0.55:
+            level = "Medium"
+        else:
+            level = "Low"
+
+        page_entry = {
+            "page": idx,
+            "ensemble_score": round(float(ensemble_score), 4),
+            "tampering_level": level,
+            "details": details,
+            "timestamp": datetime.utcnow().isoformat() + "Z"
+        }
+
+        # Generate GradCAM if tampering detected
+        if ensemble_score >= tamper_threshold or ensemble_score >= 0.55:
+            print(f"⚠️ Tampering detected (score: {ensemble_score:.4f})! Generating GradCAM...")
+
+            gradcam_filename = f"{os.path.splitext(fname)[0]}_page{idx}_gradcam.png"
+
+            try:
+                # Generate GradCAM in memory (no local save)
+                with telemetry.span("gradcam"):
+                    if cam_source is not None:
+                        gradcam_bytes = self.gradcam_from_features(page_img, *cam_source)
                     else:
-                        print("⚠️ Loan ID not provided or S3 not configured. GradCAM not saved.")
-                        
-                except Exception as e:
-                    page_entry["gradcam_error"] = str(e)
-                    print(f"❌ GradCAM generation failed: {e}")
-            else:
-                print(f"✅ No tampering detected (score: {ensemble_score:.4f})")
+                        gradcam_bytes = self.generate_gradcam(page_img)
 
-            results.append(page_entry)
-            gc.collect()
+                # Upload to S3 in the background if configured (see flush_uploads)
+                if self.loan_id and self.s3_client:
+                    s3_key = f"{self.gradcam_prefix()}{gradcam_filename}"
+                    self.queue_upload(page_entry, gradcam_bytes, s3_key)
+                else:
+                    print("⚠️ Loan ID not provided or S3 not configured. GradCAM not saved.")
 
-        return results
+            except Exception as e:
+                page_entry["gradcam_error"] = str(e)
+                print(f"❌ GradCAM generation failed: {e}")
+        else:
+            print(f"✅ No tampering detected (score: {ensemble_score:.4f})")
+
+        return page_entry
+
+    def analyze_document(self, path, dpi=200, tamper_threshold=0.5, verbose=False, wait_for_uploads=True):
+        """Analyze a single document (PDF or image) with GradCAM and S3 upload."""
+        return self.analyze_documents([path], dpi=dpi, tamper_threshold=tamper_threshold, verbose=verbose,
+                                      wait_for_uploads=wait_for_uploads)[os.path.basename(path)]
+
+    def analyze_documents(self, paths, dpi=200, tamper_threshold=0.5, verbose=False, wait_for_uploads=True):
+        """
+        Analyze several documents, streaming their pages through a small window.
+        Each window (batch_size // 2 pages, possibly spanning documents) is scored
+        in one model batch and released before the next pages are rendered.
+        Returns {file name: [page entries]} with the same entries as analyze_document;
+        per-document page counts and peak raster memory go to self.memory_report.
+        With wait_for_uploads=False, GradCAM uploads are still in flight on return
+        and the caller must call flush_uploads before using the S3 keys.
+        """
+        window_pages = max(1, self.batch_size // 2)
+        all_results = {os.path.basename(p): [] for p in paths}
+        failed = set()
+        self.memory_report = {}
+        window = []
+
+        def flush():
+            resident = {}
+            for fname, _, page_img in window:
+                resident[fname] = resident.get(fname, 0) + page_source.page_nbytes(page_img)
+            for fname, nbytes in resident.items():
+                report = self.memory_report[fname]
+                report["peak_raster_mb"] = max(report["peak_raster_mb"], round(nbytes / (1024 * 1024), 1))
+
+            try:
+                scores = self.score_pages_with_features([page_img for _, _, page_img in window],
+                                                        tamper_threshold=tamper_threshold)
+                entries = []
+                for (fname, idx, page_img), (ensemble_score, details, cam_source) in zip(window, scores):
+                    print(f"\n--- {fname}: Page {idx} ---")
+                    entries.append((fname, self._page_entry(fname, idx, page_img, ensemble_score, details,
+                                                            tamper_threshold, cam_source=cam_source)))
+                for fname, entry in entries:
+                    all_results[fname].append(entry)
+            except Exception as e:
+                # The window can span documents; every document in it loses its result
+                window_files = list(dict.fromkeys(fname for fname, _, _ in window))
+                print(f"❌ Scoring failed for {', '.join(window_files)}: {e}")
+                for fname in window_files:
+                    failed.add(fname)
+                    all_results[fname] = [{"error": f"Failed to score pages: {e}"}]
+            finally:
+                window.clear()
+                gc.collect()
+
+        for path in paths:
+            fname = os.path.basename(path)
+            print(f"\n{'='*60}")
+            print(f"Analyzing document: {fname}")
+            print(f"{'='*60}")
+            self.memory_report[fname] = {"pages": 0, "peak_raster_mb": 0.0}
+            pages = self._iter_pages(path, dpi=dpi)
+            try:
+                while fname not in failed:
+                    # Only rendering is guarded here; scoring errors are handled per window in flush
+                    try:
+                        page_img = next(pages, None)
+                    except Exception as e:
+                        failed.add(fname)
+                        window[:] = [item for item in window if item[0] != fname]
+                        all_results[fname] = [{"error": self._load_error(path, e)}]
+                        break
+                    if page_img is None:
+                        print(f"✅ {fname}: {self.memory_report[fname]['pages']} page(s) rendered")
+                        break
+                    idx = self.memory_report[fname]["pages"] + 1
+                    self.memory_report[fname]["pages"] = idx
+                    window.append((fname, idx, page_img))
+                    if len(window) >= window_pages:
+                        flush()
+            finally:
+                pages.close()
+        if window:
+            flush()
+        if wait_for_uploads:
+            self.flush_uploads()
+
+        return all_results
 
     def analyze_folder(self, folder_path, dpi=200, tamper_threshold=0.5, verbose=False):
         """Analyze all supported documents in a folder."""
@@ -373,11 +599,8 @@ class DocumentAnalyzerCore:
         if not files:
             return {"status": "⚠️ No documents found."}
 
-        all_results = {}
-        for f in files:
-            path = os.path.join(folder_path, f)
-            all_results[f] = self.analyze_document(path, dpi=dpi, tamper_threshold=tamper_threshold, verbose=verbose)
-        return all_results
+        paths = [os.path.join(folder_path, f) for f in files]
+        return self.analyze_documents(paths, dpi=dpi, tamper_threshold=tamper_threshold, verbose=verbose)
 
 
 # ------------------------------------------------------------
@@ -450,20 +673,36 @@ def analyze_documents_in_strands(path: str, loan_id: str = None, tamper_threshol
 # 3️⃣ Create a Dedicated Strands Agent
 # ------------------------------------------------------------
 
-DocumentAnalyzerAgent = Agent(
-    name="DocumentAnalyzerAgent",
-    tools=[analyze_documents_in_strands],
-    system_prompt=(
-        "You are a forensic document validation agent with advanced tampering detection capabilities. "
-        "You use ensemble methods including Error Level Analysis (ELA), noise residual detection, "
-        "and ResNet50-based CNN scoring to detect document manipulation. "
-        "When tampering is detected (ensemble_score >= threshold), you generate GradCAM heatmaps "
-        "showing suspicious regions and automatically upload them to S3 bucket 'documents-loaniq' "
-        "under the path: {loan_id}/gradcam/. "
-        "Always provide the loan ID when analyzing documents for proper S3 organization. "
-        "Flag any document with 'High' tampering level immediately and provide the S3 URL for review."
+def _build_document_analyzer_agent():
+    return Agent(
+        name="DocumentAnalyzerAgent",
+        tools=[analyze_documents_in_strands],
+        system_prompt=(
+            "You are a forensic document validation agent with advanced tampering detection capabilities. "
+            "You use ensemble methods including Error Level Analysis (ELA), noise residual detection, "
+            "and ResNet50-based CNN scoring to detect document manipulation. "
+            "When tampering is detected (ensemble_score >= threshold), you generate GradCAM heatmaps "
+            "showing suspicious regions and automatically upload them to S3 bucket 'documents-loaniq' "
+            "under the path: {loan_id}/gradcam/. "
+            "Always provide the loan ID when analyzing documents for proper S3 organization. "
+            "Flag any document with 'High' tampering level immediately and provide the S3 URL for review."
+        )
     )
-)
+
+
+_document_analyzer_agent = None
+_document_analyzer_agent_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # DocumentAnalyzerAgent is built on first access instead of at import time
+    global _document_analyzer_agent
+    if name == "DocumentAnalyzerAgent":
+        with _document_analyzer_agent_lock:
+            if _document_analyzer_agent is None:
+                _document_analyzer_agent = _build_document_analyzer_agent()
+        return _document_analyzer_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ------------------------------------------------------------
 # 4️⃣ Run Example Query
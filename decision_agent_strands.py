@@ -336,39 +336,48 @@ def calculate_loan_plans(prompt: str):
 # ===========================================
 # Strands Decision Agent
 # ===========================================
-decision_agent = Agent(
-    name="DecisionAgent",
-    tools=[
-        verify_pan_details,
-        check_tax_paid_consistency,
-        verify_bank_account_decision,
-        extract_financial_data,
-        calculate_loan_plans
-    ],
-    system_prompt=(
-        "You are a financial decision agent for loan approval with expertise in risk assessment and loan structuring. "
-        "\n\nYour responsibilities:"
-        "\n1. ALWAYS use extract_financial_data tool to get income, EMI, and loan data from provided JSON files"
-        "\n2. ALWAYS calculate DTI (Debt-to-Income) ratio: DTI = (Monthly EMI / Monthly Income) * 100"
-        "\n3. ALWAYS use calculate_loan_plans tool to generate loan plans with different tenures and interest rates"
-        "\n4. Calculate LTV (Loan-to-Value) ratio if collateral information is available"
-        "\n5. Assess risk based on: document tampering, DTI ratio (<20% Low, 20-35% Medium, >35% High), and verification failures"
-        "\n6. Provide loan recommendations with specific amounts in INR, interest rates, EMI, and tenure options"
-        "\n7. Always mention currency (INR) for all financial amounts"
-        "\n8. Return structured responses with clear sections: Document Verification, Cross-Validation, AA Verification, Financial Analysis (with DTI), Loan Eligibility, Loan Plans (table format), Risk Assessment, and Final Decision"
-        "\n\nIMPORTANT OUTPUT FORMATTING:"
-        "\n- Use PLAIN TEXT ONLY - no markdown, no asterisks (**), no bold, no italics, no special characters"
-        "\n- No checkmarks, no emojis, no symbols"
-        "\n- Write in simple, clear sentences"
-        "\n- For loan plans section, copy the EXACT table output from calculate_loan_plans tool with all formatting intact"
-        "\n- Use 'percent' instead of '%' symbol in text"
-        "\n\nUse your tools proactively to extract data and calculate loan plans. Provide detailed, data-driven reasoning for all decisions."
-    )
+DECISION_AGENT_TOOLS = [
+    verify_pan_details,
+    check_tax_paid_consistency,
+    verify_bank_account_decision,
+    extract_financial_data,
+    calculate_loan_plans
+]
+
+DECISION_AGENT_SYSTEM_PROMPT = (
+    "You are a financial decision agent for loan approval with expertise in risk assessment and loan structuring. "
+    "\n\nYour responsibilities:"
+    "\n1. ALWAYS use extract_financial_data tool to get income, EMI, and loan data from provided JSON files"
+    "\n2. ALWAYS calculate DTI (Debt-to-Income) ratio: DTI = (Monthly EMI / Monthly Income) * 100"
+    "\n3. ALWAYS use calculate_loan_plans tool to generate loan plans with different tenures and interest rates"
+    "\n4. Calculate LTV (Loan-to-Value) ratio if collateral information is available"
+    "\n5. Assess risk based on: document tampering, DTI ratio (<20% Low, 20-35% Medium, >35% High), and verification failures"
+    "\n6. Provide loan recommendations with specific amounts in INR, interest rates, EMI, and tenure options"
+    "\n7. Always mention currency (INR) for all financial amounts"
+    "\n8. Return structured responses with clear sections: Document Verification, Cross-Validation, AA Verification, Financial Analysis (with DTI), Loan Eligibility, Loan Plans (table format), Risk Assessment, and Final Decision"
+    "\n\nIMPORTANT OUTPUT FORMATTING:"
+    "\n- Use PLAIN TEXT ONLY - no markdown, no asterisks (**), no bold, no italics, no special characters"
+    "\n- No checkmarks, no emojis, no symbols"
+    "\n- Write in simple, clear sentences"
+    "\n- For loan plans section, copy the EXACT table output from calculate_loan_plans tool with all formatting intact"
+    "\n- Use 'percent' instead of '%' symbol in text"
+    "\n\nUse your tools proactively to extract data and calculate loan plans. Provide detailed, data-driven reasoning for all decisions."
 )
 
-def descision_agent():
-    """Return the Strands Decision agent."""
-    return decision_agent
+def descision_agent(model=None):
+    """Return a new Strands Decision agent.
+
+    Each workflow gets its own agent so conversation history is never shared
+    between applications running concurrently. Pass ``model`` to reuse an
+    existing model client; by default Strands builds its default Bedrock model.
+    """
+    kwargs = {"model": model} if model is not None else {}
+    return Agent(
+        name="DecisionAgent",
+        tools=DECISION_AGENT_TOOLS,
+        system_prompt=DECISION_AGENT_SYSTEM_PROMPT,
+        **kwargs
+    )
 
 # ===========================================
 # Example Usage
@@ -0,0 +1,214 @@
+# ============================================================
+# 🔹 Page Forensics Features
+# ============================================================
+# CPU-bound, model-free page features (ELA, noise residual, Otsu/contour
+# statistics and the preprocessed model input tensors). Everything here is
+# a top-level function on plain PIL/numpy data so it can run in a process
+# pool; the ResNet50 model itself stays in the parent process.
+
+import os
+import multiprocessing
+import concurrent.futures
+
+import cv2
+import numpy as np
+from PIL import Image
+from torchvision import transforms
+
+
+def build_transform():
+    """Preprocessing applied to every page before it reaches the model."""
+    return transforms.Compose([
+        transforms.Resize((224, 224)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406],
+                             std=[0.229, 0.224, 0.225])
+    ])
+
+
+_transform = None
+
+
+def _get_transform():
+    global _transform
+    if _transform is None:
+        _transform = build_transform()
+    return _transform
+
+
+def normalize(v, mx=1.0):
+    return max(0.0, min(1.0, v / mx))
+
+
+# -----------------------------
+# Single-pass feature extraction
+# -----------------------------
+# The page is decoded to a uint8 RGB array once; ELA (cv2 JPEG round-trip),
+# Laplacian noise residual, their statistics and the Otsu/contour region
+# score are all computed from that array.
+
+def _rgb_array(pil_img):
+    if pil_img.mode != "RGB":
+        pil_img = pil_img.convert("RGB")
+    return np.asarray(pil_img)
+
+
+def _luma(rgb):
+    """Grayscale with PIL's convert("L") fixed-point ITU-R 601-2 weights (bit-identical)."""
+    rgb = rgb.astype(np.uint32)
+    return ((rgb[..., 0] * 19595 + rgb[..., 1] * 38470 + rgb[..., 2] * 7471 + 0x8000) >> 16).astype(np.uint8)
+
+
+def _ela_difference(rgb, quality=90):
+    """|page - JPEG(page)| per channel, via cv2.imencode/imdecode (cv2 works in BGR)."""
+    ok, encoded = cv2.imencode(".jpg", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG re-encoding failed")
+    recompressed = cv2.cvtColor(cv2.imdecode(encoded, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
+    return cv2.absdiff(rgb, recompressed)
+
+
+def _scaled_ela(diff):
+    """Stretch an ELA difference so its largest value is 255."""
+    max_diff = int(diff.max()) or 1
+    return np.clip(diff.astype("float32") * (255.0 / max_diff), 0, 255).astype("uint8")
+
+
+def _noise_residual(gray):
+    lap = cv2.Laplacian(gray, ddepth=cv2.CV_32F, ksize=3)
+    nm = np.abs(lap)
+    return (nm / (nm.max() + 1e-8) * 255.0).astype("uint8")
+
+
+def _region_stats(ela_gray):
+    """Otsu-thresholded large-contour area ratio and mean intensity of the ELA map."""
+    try:
+        thresh, _ = cv2.threshold(ela_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    except cv2.error:
+        thresh = 60
+    bw = (ela_gray > max(thresh, 60)).astype('uint8') * 255
+    contours, _ = cv2.findContours(bw, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    h, w = ela_gray.shape[:2]
+    page_area = h * w
+    areas = [cv2.contourArea(c) for c in contours]
+    large_area = sum(a for a in areas if a > (page_area * 0.001))
+    return large_area / page_area, float(ela_gray.mean()) / 255.0
+
+
+def extract_page_forensics(pil_img, quality=90, region=True):
+    """
+    Every heuristic forensic output for one page from a single decode.
+    Returns a dict with the "ela" map (uint8 RGB), "noise" residual (uint8),
+    ela/noise mean and std (0-1) and, with region=True, the Otsu/contour
+    "ela_area_ratio", "ela_intensity" and combined "ela_region_score".
+    """
+    rgb = _rgb_array(pil_img)
+    ela = _scaled_ela(_ela_difference(rgb, quality))
+    ela_gray = _luma(ela)
+    noise = _noise_residual(_luma(rgb))
+
+    ela_gray_f = ela_gray.astype("float32") / 255.0
+    noise_f = noise.astype("float32") / 255.0
+    features = {
+        "ela": ela,
+        "noise": noise,
+        "ela_mean": float(ela_gray_f.mean()),
+        "ela_std": float(ela_gray_f.std()),
+        "noise_mean": float(noise_f.mean()),
+        "noise_std": float(noise_f.std()),
+    }
+    if region:
+        area_ratio, intensity = _region_stats(ela_gray)
+        features["ela_area_ratio"] = area_ratio
+        features["ela_intensity"] = intensity
+        features["ela_region_score"] = normalize(area_ratio, 0.05) * 0.8 + normalize(intensity, 0.25) * 0.2
+    return features
+
+
+def compute_ela(pil_img, quality=90):
+    """Error Level Analysis image (PIL), scaled so the largest difference is 255."""
+    return Image.fromarray(_scaled_ela(_ela_difference(_rgb_array(pil_img), quality)))
+
+
+def compute_noise_residual(pil_img):
+    """High-pass (Laplacian) noise residual image (PIL)."""
+    return Image.fromarray(_noise_residual(_luma(_rgb_array(pil_img))))
+
+
+def ela_region_score(pil_img):
+    """ELA-based forgery likelihood from Otsu-thresholded contour area and mean intensity."""
+    return extract_page_forensics(pil_img)["ela_region_score"]
+
+
+# -----------------------------
+# Resolution pyramid
+# -----------------------------
+# The model only ever sees a 224x224 resize, so the heuristics can run on a
+# downsampled level of large pages (200-DPI scans, phone photos); callers
+# recompute at full resolution when a page scores close to a decision
+# boundary (DocumentAnalyzerCore.score_pages_with_features).
+
+def downsample(pil_img, max_pixels):
+    """Area-averaged copy of the page with at most max_pixels pixels (the page itself if smaller)."""
+    pixels = pil_img.width * pil_img.height
+    if not max_pixels or pixels <= max_pixels:
+        return pil_img
+    scale = (max_pixels / pixels) ** 0.5
+    size = (max(1, int(pil_img.width * scale)), max(1, int(pil_img.height * scale)))
+    return pil_img.resize(size, Image.BOX)
+
+
+def page_features(pil_img, transform=None, max_pixels=None):
+    """
+    Model inputs and heuristic statistics for one page.
+    Returns (orig_input, ela_input, stats) with the inputs as float32 arrays
+    of shape (3, 224, 224), ready for torch.from_numpy. With max_pixels,
+    everything is computed on a downsampled level and stats["scale"] is
+    the level's size relative to the page.
+    """
+    transform = transform or _get_transform()
+    full_width = pil_img.width
+    pil_img = downsample(pil_img, max_pixels)
+    # The contour region score is not part of the ensemble, so it is skipped here
+    features = extract_page_forensics(pil_img, region=False)
+
+    orig_input = transform(pil_img if pil_img.mode == "RGB" else pil_img.convert("RGB")).numpy()
+    ela_input = transform(Image.fromarray(features["ela"])).numpy()
+
+    stats = {key: features[key] for key in ("ela_mean", "ela_std", "noise_mean", "noise_std")}
+    stats["scale"] = pil_img.width / full_width
+    return orig_input, ela_input, stats
+
+
+# -----------------------------
+# Process pool
+# -----------------------------
+def default_worker_count():
+    """FORENSICS_WORKERS if set, else half the cores (the rest is left to inference)."""
+    configured = os.getenv("FORENSICS_WORKERS")
+    if configured is not None:
+        return int(configured)
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _init_worker():
+    # One process per core: keep the libraries inside each worker single-threaded
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
+def create_forensics_pool(workers=None):
+    """Process pool for page_features, or None when workers is 0 (run in-thread)."""
+    workers = default_worker_count() if workers is None else workers
+    if workers <= 0:
+        return None
+    # spawn: forking a process that already holds torch/BLAS threads is unsafe
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
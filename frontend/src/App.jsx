@@ -64,6 +64,7 @@ function App() {
   const [error, setError] = useState(null);
   const [activeTab, setActiveTab] = useState(0);
   const [currentView, setCurrentView] = useState('home'); // 'home', 'app', 'escalations', 'approved'
+  const [nodeProgress, setNodeProgress] = useState({}); // node -> { status, elapsed_s }
 
   const API_BASE_URL = 'http://localhost:8000';
 
@@ -83,6 +84,50 @@ function App() {
     }
   };
 
+  // Merge a finished node's partial output into the results shown in the tabs
+  const applyNodeResult = (node, result) => {
+    if (!result) return;
+    setResults((prev) => {
+      const current = prev || { status: 'running', errors: [], results: {} };
+      const partial = { ...current.results };
+      if (node === 'doc_analyzer') {
+        partial.document_analyzer_agent_results = result.manipulation_results || {};
+      } else if (node === 'cross_validator') {
+        partial.Profile = {
+          payslip: result.payslip || {},
+          offer: result.offer || {},
+          bank: result.bank || {},
+          form16: result.form16 || {},
+        };
+        partial.cross_validation_agent_results = {
+          payslip_vs_offer: result.payslip_vs_offer || {},
+          bank_vs_payslip: result.bank_vs_payslip || {},
+          payslip_vs_form16: result.payslip_vs_form16 || {},
+        };
+      } else if (node === 'aa_agent') {
+        partial.account_aggrigator_agent_results = result.aa_verification || {};
+      } else if (node === 'descision_agent') {
+        partial.descision_making_agent = result.descision_agent || {};
+      }
+      return { ...current, results: partial };
+    });
+  };
+
+  const fetchFinalResults = async (jobId) => {
+    const jobResponse = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+    const job = await jobResponse.json();
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Workflow failed');
+    }
+
+    // Prefer the saved results for this customer, fall back to the job's own results
+    const savedResponse = await fetch(`${API_BASE_URL}/results/${selectedCustomer}`);
+    if (savedResponse.ok) {
+      return savedResponse.json();
+    }
+    return job.result;
+  };
+
   const handleRunWorkflow = async () => {
     if (!selectedCustomer) {
       setError('Please select a customer');
@@ -92,9 +137,10 @@ function App() {
     setLoading(true);
     setError(null);
     setResults(null);
+    setNodeProgress({});
 
     try {
-      const response = await fetch(`${API_BASE_URL}/run_workflow`, {
+      const response = await fetch(`${API_BASE_URL}/jobs`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -107,13 +153,56 @@ function App() {
         throw new Error(errorData.detail || 'Workflow failed');
       }
 
-      const data = await response.json();
-      setResults(data);
+      const { job_id: jobId } = await response.json();
       setActiveTab(0);
+
+      // Stream per-node progress and partial results as they arrive
+      const events = new EventSource(`${API_BASE_URL}/jobs/${jobId}/events`);
+
+      events.addEventListener('node_started', (e) => {
+        const data = JSON.parse(e.data);
+        setNodeProgress((prev) => ({ ...prev, [data.node]: { status: 'running' } }));
+      });
+
+      events.addEventListener('node_finished', (e) => {
+        const data = JSON.parse(e.data);
+        setNodeProgress((prev) => ({ ...prev, [data.node]: { status: 'done', elapsed_s: data.elapsed_s } }));
+        applyNodeResult(data.node, data.result);
+      });
+
+      events.addEventListener('node_updated', (e) => {
+        const data = JSON.parse(e.data);
+        applyNodeResult(data.node, data.result);
+      });
+
+      events.addEventListener('node_failed', (e) => {
+        const data = JSON.parse(e.data);
+        setNodeProgress((prev) => ({ ...prev, [data.node]: { status: 'failed', elapsed_s: data.elapsed_s } }));
+      });
+
+      events.addEventListener('end', async () => {
+        events.close();
+        try {
+          setResults(await fetchFinalResults(jobId));
+        } catch (err) {
+          setError(err.message);
+          console.error(err);
+        } finally {
+          setLoading(false);
+        }
+      });
+
+      events.onerror = (err) => {
+        // EventSource reconnects on its own unless the stream was closed
+        if (events.readyState === EventSource.CLOSED) {
+          setError('Lost connection to workflow progress stream');
+          setLoading(false);
+        }
+        console.error(err);
+      };
     } catch (err) {
       setError(err.message);
       console.error(err);
-    } finally {
       setLoading(false);
     }
   };
@@ -1539,6 +1628,31 @@ function App() {
               >
                 Analyzing documents and running AI verification...
               </Typography>
+              <Box sx={{ mt: 2, display: 'flex', flexWrap: 'wrap', gap: 1, justifyContent: 'center' }}>
+                {[
+                  ['doc_analyzer', 'Document Analyzer'],
+                  ['cross_validator', 'Cross Validator'],
+                  ['aa_agent', 'AA Verification'],
+                  ['descision_agent', 'Decision Agent'],
+                  ['finalizer', 'Finalizer'],
+                ].map(([node, label]) => {
+                  const progress = nodeProgress[node];
+                  const color = !progress ? 'default'
+                    : progress.status === 'done' ? 'success'
+                    : progress.status === 'failed' ? 'error'
+                    : 'primary';
+                  const suffix = progress?.elapsed_s !== undefined ? ` (${progress.elapsed_s.toFixed(1)}s)` : '';
+                  return (
+                    <Chip
+                      key={node}
+                      label={`${label}${suffix}`}
+                      color={color}
+                      variant={progress?.status === 'running' ? 'outlined' : 'filled'}
+                      size="small"
+                    />
+                  );
+                })}
+              </Box>
             </Box>
           )}
         </Paper>
@@ -0,0 +1,232 @@
+# ============================================================
+# 🔹 Tamper Model Inference Backends
+# ============================================================
+# CPU inference backends for the ResNet50 tamper model. Every backend maps
+# a (N, 3, 224, 224) batch to (logits, layer4 activations) so scoring and
+# GradCAM work the same whichever one is selected (INFERENCE_BACKEND):
+#
+#   eager        torchvision model in fp32 eager mode (default)
+#   torchscript  traced + frozen TorchScript graph (conv/bn folding, fusion)
+#   onnx         ONNX Runtime CPU session (needs the onnxruntime package)
+#   int8         static post-training int8 quantization (FX graph mode: conv/bn/
+#                relu fusion, observers calibrated on real pages, convert), so
+#                the convolutions run as quantized kernels. Needs calibration
+#                pages: PDFs/images in INT8_CALIBRATION_DIR
+#
+# Check parity and throughput with benchmarks/bench_inference_backends.py.
+
+import hashlib
+import os
+
+import torch
+
+
+BACKENDS = ("eager", "torchscript", "onnx", "int8")
+
+ONNX_OPSET = 17
+# Exported ONNX graphs, one per (weights, opset, torch version); reused across restarts and workers
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".onnx_cache"))
+
+
+def forward_with_features(model, batch):
+    """ResNet forward pass returning (logits, layer4 activations) without hooks."""
+    x = model.conv1(batch)
+    x = model.bn1(x)
+    x = model.relu(x)
+    x = model.maxpool(x)
+    x = model.layer1(x)
+    x = model.layer2(x)
+    x = model.layer3(x)
+    features = model.layer4(x)
+    logits = model.fc(torch.flatten(model.avgpool(features), 1))
+    return logits, features
+
+
+class ResNetWithFeatures(torch.nn.Module):
+    """Module form of forward_with_features, for tracing and export."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x):
+        return forward_with_features(self.model, x)
+
+
+class EagerBackend:
+    name = "eager"
+
+    def __init__(self, model):
+        self.model = model
+        self.device = next(model.parameters()).device
+
+    def run(self, batch, keep_features=False):
+        if keep_features:
+            return forward_with_features(self.model, batch)
+        return self.model(batch), None
+
+
+class TorchScriptBackend:
+    name = "torchscript"
+
+    def __init__(self, model):
+        self.device = next(model.parameters()).device
+        example = torch.zeros(1, 3, 224, 224, device=self.device)
+        with torch.no_grad():
+            traced = torch.jit.trace(ResNetWithFeatures(model).eval(), example)
+            self.module = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+    def run(self, batch, keep_features=False):
+        logits, features = self.module(batch)
+        return logits, features if keep_features else None
+
+
+def weights_digest(model):
+    """Short SHA-256 over the model's parameters and buffers."""
+    h = hashlib.sha256()
+    for key, tensor in model.state_dict().items():
+        h.update(key.encode("utf-8"))
+        h.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def cached_onnx_path(model, opset=ONNX_OPSET, cache_dir=None):
+    """Stable export path for this model's weights and opset under ONNX_CACHE_DIR."""
+    tag = f"{weights_digest(model)}-opset{opset}-torch{torch.__version__.split('+')[0]}"
+    return os.path.join(cache_dir or ONNX_CACHE_DIR, f"resnet50_features-{tag}.onnx")
+
+
+class OnnxRuntimeBackend:
+    name = "onnx"
+
+    def __init__(self, model, onnx_path=None, intra_op_threads=None):
+        import copy
+        import onnxruntime as ort
+
+        self.device = torch.device("cpu")
+        if onnx_path is None:
+            onnx_path = cached_onnx_path(model)
+        if not os.path.exists(onnx_path):
+            os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+            # Export next to the target and rename, so concurrent workers never load a partial file
+            tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+            example = torch.zeros(1, 3, 224, 224)
+            try:
+                torch.onnx.export(
+                    ResNetWithFeatures(copy.deepcopy(model).cpu()).eval(), example, tmp_path,
+                    input_names=["input"], output_names=["logits", "features"],
+                    dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}, "features": {0: "batch"}},
+                    opset_version=ONNX_OPSET,
+                )
+                os.replace(tmp_path, onnx_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            print(f"✅ Exported tamper model to {onnx_path}")
+        self.onnx_path = onnx_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+    def run(self, batch, keep_features=False):
+        output_names = ["logits", "features"] if keep_features else ["logits"]
+        outputs = self.session.run(output_names, {"input": batch.cpu().numpy()})
+        logits = torch.from_numpy(outputs[0])
+        return logits, torch.from_numpy(outputs[1]) if keep_features else None
+
+
+def load_calibration_inputs(folder, max_pages=None):
+    """Model input tensors (original and ELA) for the pages of every PDF/image in folder."""
+    import forensics
+    import page_store
+    from PIL import Image
+
+    max_pages = max_pages or int(os.getenv("INT8_CALIBRATION_PAGES", "32"))
+    max_pixels = int(os.getenv("FORENSICS_MAX_PIXELS", "1000000"))
+    inputs = []
+    pages = 0
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.lower().endswith(".pdf"):
+            source = page_store.iter_pdf_pages(path)
+        elif name.lower().endswith((".png", ".jpg", ".jpeg")):
+            source = [Image.open(path).convert("RGB")]
+        else:
+            continue
+        for page in source:
+            orig_input, ela_input, _ = forensics.page_features(page, max_pixels=max_pixels)
+            inputs.extend([torch.from_numpy(orig_input), torch.from_numpy(ela_input)])
+            pages += 1
+            if pages >= max_pages:
+                return inputs
+    return inputs
+
+
+def _quantized_engine():
+    for engine in ("x86", "fbgemm", "qnnpack"):
+        if engine in torch.backends.quantized.supported_engines:
+            return engine
+    raise RuntimeError("no quantized CPU engine available")
+
+
+class QuantizedInt8Backend:
+    name = "int8"
+
+    def __init__(self, model, calibration_inputs=None, batch_size=16):
+        import copy
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        if calibration_inputs is None:
+            folder = os.getenv("INT8_CALIBRATION_DIR")
+            if not folder or not os.path.isdir(folder):
+                raise ValueError("int8 needs calibration pages; set INT8_CALIBRATION_DIR to a folder of PDFs/images")
+            calibration_inputs = load_calibration_inputs(folder)
+        if not calibration_inputs:
+            raise ValueError("no calibration pages found for int8 quantization")
+
+        self.device = torch.device("cpu")
+        engine = _quantized_engine()
+        torch.backends.quantized.engine = engine
+        example = (torch.zeros(1, 3, 224, 224),)
+        # prepare_fx fuses conv/bn/relu and inserts observers; convert_fx swaps in int8 kernels
+        prepared = prepare_fx(ResNetWithFeatures(copy.deepcopy(model).cpu().eval()),
+                              get_default_qconfig_mapping(engine), example)
+        with torch.no_grad():
+            for start in range(0, len(calibration_inputs), batch_size):
+                prepared(torch.stack(calibration_inputs[start:start + batch_size]))
+        self.module = convert_fx(prepared)
+
+    def run(self, batch, keep_features=False):
+        with torch.no_grad():
+            logits, features = self.module(batch.cpu())
+        return logits, features if keep_features else None
+
+
+def create_backend(name, model, **options):
+    """Build the named backend (options go to its constructor); falls back to eager if it cannot be built here."""
+    name = (name or "eager").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (expected one of {', '.join(BACKENDS)})")
+    builders = {
+        "eager": EagerBackend,
+        "torchscript": TorchScriptBackend,
+        "onnx": OnnxRuntimeBackend,
+        "int8": QuantizedInt8Backend,
+    }
+    try:
+        backend = builders[name](model, **options)
+    except Exception as e:
+        if name == "eager":
+            raise
+        print(f"⚠️ Inference backend '{name}' unavailable ({e}); using eager")
+        return EagerBackend(model)
+    print(f"✅ Inference backend: {name}")
+    return backend
+
+
+def default_backend_name():
+    return os.getenv("INFERENCE_BACKEND", "eager")
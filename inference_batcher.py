@@ -0,0 +1,116 @@
+# ============================================================
+# 🔹 Batched ResNet50 Inference
+# ============================================================
+# Runs preprocessed page tensors through the tamper model's inference backend
+# (inference_backends.py) in batches and returns the max softmax probability
+# per tensor, optionally with the layer4 activations so GradCAM can reuse the
+# scoring pass. InferenceBatcher merges
+# requests from concurrent workflows into shared batches so several
+# applications analysed at once fill the same forward pass.
+
+import queue
+import threading
+import time
+import concurrent.futures
+
+import torch
+
+from telemetry import span
+
+
+def score_tensors(backend, tensors, batch_size=16, keep_features=False):
+    """
+    Score (3, 224, 224) tensors in batches on an inference backend.
+    Returns [(max softmax prob, argmax class, layer4 activations or None)] in input order.
+    """
+    scored = []
+    with torch.no_grad():
+        for start in range(0, len(tensors), batch_size):
+            batch = torch.stack(tensors[start:start + batch_size]).to(backend.device)
+            with span("model.forward"):
+                logits, features = backend.run(batch, keep_features=keep_features)
+            if features is not None:
+                features = features.cpu()
+            top = torch.nn.functional.softmax(logits, dim=1).max(dim=1)
+            probs = top.values.cpu().numpy()
+            classes = top.indices.cpu().numpy()
+            for i in range(len(probs)):
+                scored.append((float(probs[i]), int(classes[i]), features[i] if features is not None else None))
+    return scored
+
+
+def max_softmax_probs(backend, tensors, batch_size=16):
+    """Max softmax probability for each (3, 224, 224) tensor, in input order."""
+    return [prob for prob, _, _ in score_tensors(backend, tensors, batch_size=batch_size)]
+
+
+class InferenceBatcher:
+    """Collects tensors from many threads and scores them in shared batches."""
+
+    def __init__(self, backend, max_batch_size=16, max_wait_ms=5.0):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self.batches_run = 0
+        self.tensors_scored = 0
+        self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._worker.start()
+
+    def score(self, tensors):
+        """Blocking equivalent of ``score_tensors(..., keep_features=True)`` that shares batches across callers."""
+        if self._closed:
+            raise RuntimeError("InferenceBatcher is closed")
+        futures = []
+        for t in tensors:
+            future = concurrent.futures.Future()
+            self._queue.put((t, future))
+            futures.append(future)
+        return [f.result() for f in futures]
+
+    def max_probs(self, tensors):
+        return [prob for prob, _, _ in self.score(tensors)]
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch is full or the wait expires."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        items = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Keep the shutdown marker for the next _collect call
+                self._queue.put(None)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if items is None:
+                return
+            tensors = [t for t, _ in items]
+            try:
+                scored = score_tensors(self.backend, tensors, batch_size=len(tensors), keep_features=True)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.batches_run += 1
+            self.tensors_scored += len(items)
+            for (_, future), result in zip(items, scored):
+                future.set_result(result)
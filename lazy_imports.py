@@ -0,0 +1,43 @@
+# ============================================================
+# 🔹 Lazy Module Imports
+# ============================================================
+# Heavy libraries (torch, torchvision, cv2, matplotlib, pdf2image,
+# pytesseract, ...) are only needed once a document is actually analyzed.
+# Binding them through lazy_import keeps `import orchestration_strands` (and
+# so API start-up) cheap; the real import happens on first attribute access.
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name) -> LazyModule:
+    return LazyModule(name)
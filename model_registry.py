@@ -0,0 +1,169 @@
+# ============================================================
+# 🔹 Process-wide Model Registry
+# ============================================================
+# Loads the heavy, request-independent resources (ResNet50 weights,
+# preprocessing transforms, Bedrock model clients, S3 client) exactly once
+# per process and hands them to every VerificationOrchestrator.
+
+import os
+import threading
+import time
+
+import boto3
+
+
+DEFAULT_S3_BUCKET = "documents-loaniq"
+DEFAULT_LLM_MODEL = "deepseek.v3-v1:0"
+
+
+class ModelRegistry:
+    """Owns the shared model weights and AWS clients used by all workflows."""
+
+    def __init__(self, s3_bucket=DEFAULT_S3_BUCKET, llm_model_name=DEFAULT_LLM_MODEL, s3_client=None,
+                 max_llm_concurrency=None, llm_model=None):
+        self.s3_bucket = s3_bucket
+        self.llm_model_name = llm_model_name
+        self.s3_client = s3_client
+        # Optional strands Model used for every LLM call instead of Bedrock
+        # (e.g. benchmarks/mock_bedrock.py for offline load tests)
+        self.llm_model = llm_model
+
+        # Process-wide cap on in-flight Bedrock requests from the cross validators
+        if max_llm_concurrency is None:
+            max_llm_concurrency = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "8"))
+        self.llm_slots = threading.BoundedSemaphore(max_llm_concurrency)
+
+        self.device = None
+        self.model = None
+        self.transform = None
+
+        # eager | torchscript | onnx | int8 (see inference_backends.py)
+        self.inference_backend = os.getenv("INFERENCE_BACKEND", "eager")
+        self.backend = None
+
+        # Tensors per forward pass; with cross-app batching enabled, concurrent
+        # workflows share forward passes through one InferenceBatcher
+        self.inference_batch_size = int(os.getenv("INFERENCE_BATCH_SIZE", "16"))
+        self.cross_app_batching = os.getenv("INFERENCE_CROSS_APP_BATCHING", "0") == "1"
+        self.batch_wait_ms = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "5"))
+        self.batcher = None
+
+        # Process pool for page features (FORENSICS_WORKERS processes, 0 = in-thread)
+        self.forensics_workers = None
+        self.forensics_pool = None
+
+        # Background GradCAM uploads (created with the S3 client)
+        self.artifact_uploader = None
+
+        # GradCAM registers hooks on the shared model, so it must be serialized
+        self.gradcam_lock = threading.Lock()
+
+        self._bedrock_models = {}
+        self._decision_model = None
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.load_seconds = 0.0
+
+    def load(self):
+        """Load every shared resource once. Safe to call repeatedly."""
+        if self.loaded:
+            return self
+        with self._lock:
+            if self.loaded:
+                return self
+
+            import torch
+            from da_strands import configure_tesseract, load_resnet50, build_transform
+            from inference_backends import create_backend
+
+            start = time.perf_counter()
+            configure_tesseract()
+
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            self.model = load_resnet50(self.device)
+            self.backend = create_backend(self.inference_backend, self.model)
+            self.transform = build_transform()
+
+            if self.cross_app_batching:
+                from inference_batcher import InferenceBatcher
+                self.batcher = InferenceBatcher(
+                    self.backend,
+                    max_batch_size=self.inference_batch_size,
+                    max_wait_ms=self.batch_wait_ms,
+                )
+
+            import forensics
+            self.forensics_workers = forensics.default_worker_count()
+            self.forensics_pool = forensics.create_forensics_pool(self.forensics_workers)
+
+            if self.s3_client is None:
+                try:
+                    self.s3_client = boto3.client('s3')
+                    print(f"✅ S3 client initialized for bucket: {self.s3_bucket}")
+                except Exception as e:
+                    print(f"⚠️ S3 client initialization failed: {e}")
+            if self.s3_client is not None:
+                from artifact_uploader import ArtifactUploader
+                self.artifact_uploader = ArtifactUploader(self.s3_client)
+
+            self._get_bedrock_model(self.llm_model_name)
+
+            self.load_seconds = time.perf_counter() - start
+            self.loaded = True
+            print(f"✅ Model registry loaded in {self.load_seconds:.2f}s "
+                  f"(device: {self.device}, forensics workers: {self.forensics_workers})")
+        return self
+
+    def close(self):
+        """Stop the worker processes/threads owned by the registry."""
+        if self.forensics_pool is not None:
+            self.forensics_pool.shutdown(wait=False, cancel_futures=True)
+            self.forensics_pool = None
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+        if self.artifact_uploader is not None:
+            # Let queued GradCAM uploads finish
+            self.artifact_uploader.close(wait=True)
+            self.artifact_uploader = None
+
+    def _get_bedrock_model(self, model_name):
+        if self.llm_model is not None:
+            return self.llm_model
+        if model_name not in self._bedrock_models:
+            from strands.models import BedrockModel
+            self._bedrock_models[model_name] = BedrockModel(model_id=model_name)
+        return self._bedrock_models[model_name]
+
+    def bedrock_model(self, model_name=None):
+        """Return the shared BedrockModel client for ``model_name``."""
+        with self._lock:
+            return self._get_bedrock_model(model_name or self.llm_model_name)
+
+    def decision_model(self):
+        """Return the shared default BedrockModel used by the decision agent."""
+        if self.llm_model is not None:
+            return self.llm_model
+        with self._lock:
+            if self._decision_model is None:
+                from strands.models import BedrockModel
+                self._decision_model = BedrockModel()
+            return self._decision_model
+
+    def create_orchestrator(self, documents_folder, loan_id=None, **kwargs):
+        """Build a VerificationOrchestrator wired to the shared resources."""
+        from orchestration_strands import VerificationOrchestrator
+        return VerificationOrchestrator(documents_folder, loan_id=loan_id, registry=self.load(), **kwargs)
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Return the process-wide default registry (created on first use)."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
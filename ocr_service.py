@@ -0,0 +1,240 @@
+# ============================================================
+# 🔹 OCR Service (memoized Tesseract)
+# ============================================================
+# Single entry point for page OCR. Results are cached on local disk keyed by
+# a hash of the page pixels plus the OCR language/config and Tesseract
+# version, so reruns, retries and duplicate pages skip the tesseract process.
+# The cache is bounded by total size with least-recently-used eviction, and
+# entries expire OCR_CACHE_TTL_HOURS after they were written.
+#
+# The cached text is plaintext OCR of payslips, Form 16 and bank statements
+# (names, PAN, account numbers, salaries), i.e. PII. It lives in a private
+# per-user directory (mode 0700, files 0600); keep OCR_CACHE_DIR off shared
+# or synced storage.
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from lazy_imports import lazy_import
+from telemetry import span
+
+pytesseract = lazy_import("pytesseract")
+
+
+DEFAULT_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "lendiq", "ocr"))
+DEFAULT_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_MB", "256")) * 1024 * 1024
+# 0 keeps entries until the size cap evicts them
+DEFAULT_TTL_SECONDS = float(os.getenv("OCR_CACHE_TTL_HOURS", "168")) * 3600
+# Expired entries are swept at most this often, or whenever a write goes over the size cap
+DEFAULT_SWEEP_SECONDS = float(os.getenv("OCR_CACHE_SWEEP_SECONDS", "600"))
+
+
+def page_digest(pil_img) -> str:
+    """SHA-256 of the decoded pixels (plus mode and size) of a PIL image."""
+    h = hashlib.sha256(f"{pil_img.mode}|{pil_img.size[0]}x{pil_img.size[1]}|".encode("ascii"))
+    h.update(pil_img.tobytes())
+    return h.hexdigest()
+
+
+class OCRService:
+    """Disk-backed, size-capped LRU cache in front of ``pytesseract.image_to_string``."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 sweep_seconds=DEFAULT_SWEEP_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        self._prepare_dir(cache_dir)
+        self._last_sweep = time.time()
+
+        self._lock = threading.Lock()
+        # key -> [lock, holders + waiters]
+        self._key_locks = {}
+        self._tesseract_version = None
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "errors": 0}
+
+        # key -> (size in bytes, written at), least recently used first. Rebuilt from
+        # file atimes (last use) and mtimes (write time) on start; expired files are dropped.
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".txt"):
+                st = os.stat(os.path.join(cache_dir, name))
+                entries.append((st.st_atime, name[:-4], st.st_size, st.st_mtime))
+        for _, key, size, written_at in sorted(entries):
+            if self._expired(written_at):
+                self._remove(key)
+                continue
+            self._index[key] = (size, written_at)
+            self._total_bytes += size
+
+    @staticmethod
+    def _prepare_dir(cache_dir):
+        """Create the cache dir private; only tighten permissions on a dir this process owns."""
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        st = os.stat(cache_dir)
+        if not st.st_mode & 0o077:
+            return
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            print(f"⚠️ OCR cache dir {cache_dir} is open to other users and owned by another user; "
+                  f"cached OCR text (PII) may be exposed")
+            return
+        try:
+            os.chmod(cache_dir, 0o700)
+        except OSError as e:
+            print(f"⚠️ Could not restrict OCR cache dir {cache_dir} to 0700: {e}")
+
+    def _expired(self, written_at):
+        return self.ttl_seconds > 0 and time.time() - written_at > self.ttl_seconds
+
+    def _remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def tesseract_version(self) -> str:
+        if self._tesseract_version is None:
+            try:
+                self._tesseract_version = str(pytesseract.get_tesseract_version())
+            except Exception:
+                self._tesseract_version = "unknown"
+        return self._tesseract_version
+
+    def cache_key(self, pil_img, lang=None, config="") -> str:
+        h = hashlib.sha256(page_digest(pil_img).encode("ascii"))
+        h.update(f"|lang={lang or 'eng'}|config={config}|tesseract={self.tesseract_version()}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _acquire_key(self, key):
+        """Take the per-key lock; entries are reference counted so a held or awaited lock is never dropped."""
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        return entry
+
+    def _release_key(self, key, entry):
+        entry[0].release()
+        with self._lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+
+    def _read(self, key):
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._index[key]
+                self._total_bytes -= entry[0]
+                self._counters["expired"] += 1
+                expired = True
+            else:
+                expired = False
+                if entry is not None:
+                    self._index.move_to_end(key)
+        path = self._path(key)
+        if expired:
+            self._remove(key)
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # Record the use in atime (LRU order across restarts); mtime stays the write time for the TTL
+            st = os.stat(path)
+            os.utime(path, (time.time(), st.st_mtime))
+        except OSError:
+            pass
+        return text
+
+    def _write(self, key, text):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        now = time.time()
+
+        evicted = []
+        with self._lock:
+            old = self._index.pop(key, None)
+            self._total_bytes += size - (old[0] if old else 0)
+            self._index[key] = (size, now)
+            # Full expiry scan only periodically or when over the cap; _read drops stale hits itself
+            if self._total_bytes > self.max_bytes or now - self._last_sweep >= self.sweep_seconds:
+                self._last_sweep = now
+                for old_key, (old_size, written_at) in list(self._index.items()):
+                    if old_key != key and self._expired(written_at):
+                        del self._index[old_key]
+                        self._total_bytes -= old_size
+                        self._counters["expired"] += 1
+                        evicted.append(old_key)
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, (old_size, _) = self._index.popitem(last=False)
+                self._total_bytes -= old_size
+                self._counters["evictions"] += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._remove(old_key)
+
+    def image_to_string(self, pil_img, lang=None, config="") -> str:
+        """Same contract as ``pytesseract.image_to_string``; OCR errors are raised, never cached."""
+        key = self.cache_key(pil_img, lang=lang, config=config)
+        # Per-key lock: concurrent requests for the same page run tesseract once
+        key_lock = self._acquire_key(key)
+        try:
+            text = self._read(key)
+            if text is not None:
+                with self._lock:
+                    self._counters["hits"] += 1
+                return text
+
+            try:
+                with span("ocr.tesseract"):
+                    text = pytesseract.image_to_string(pil_img, lang=lang, config=config)
+            except Exception:
+                with self._lock:
+                    self._counters["errors"] += 1
+                raise
+            with self._lock:
+                self._counters["misses"] += 1
+            self._write(key, text)
+            return text
+        finally:
+            self._release_key(key, key_lock)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_ocr_service() -> OCRService:
+    """Return the process-wide OCR service (created on first use)."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = OCRService()
+        return _default_service
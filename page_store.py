@@ -0,0 +1,252 @@
+# ============================================================
+# 🔹 Streaming Page Source and Per-Workflow Page Store
+# ============================================================
+# PDFs are rendered one page at a time (PyMuPDF, or pdf2image with
+# first_page/last_page) so no consumer ever needs the whole document as
+# full-resolution images in memory. PageStore keeps a bounded LRU of
+# recently rendered pages shared by the document analyzer (forensics) and
+# the cross validator (OCR), which read the same files in parallel. Pages
+# evicted from memory can be spilled to a local directory as lossless PNG.
+# pdf_text_layer reads the embedded text of digitally generated PDFs.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from lazy_imports import lazy_import
+from telemetry import span
+
+Image = lazy_import("PIL.Image")
+pdf2image = lazy_import("pdf2image")
+fitz = lazy_import("fitz")
+
+
+# pdf2image's default, used by both the analyzer and the OCR path
+DEFAULT_DPI = 200
+
+# auto (PyMuPDF when installed) | pymupdf | poppler
+PDF_RENDERER = os.getenv("PDF_RENDERER", "auto")
+
+_pymupdf_available = None
+
+
+def pymupdf_installed():
+    global _pymupdf_available
+    if _pymupdf_available is None:
+        try:
+            fitz.open
+            _pymupdf_available = True
+        except ImportError:
+            _pymupdf_available = False
+    return _pymupdf_available
+
+
+def _use_pymupdf():
+    if PDF_RENDERER == "poppler":
+        return False
+    if PDF_RENDERER == "pymupdf":
+        return True
+    return pymupdf_installed()
+
+
+def page_nbytes(page):
+    """Approximate decoded size of a PIL image."""
+    return page.width * page.height * len(page.getbands())
+
+
+def pdf_page_count(path, poppler_path=None):
+    if _use_pymupdf():
+        with fitz.open(path) as doc:
+            return doc.page_count
+    kwargs = {"poppler_path": poppler_path} if poppler_path else {}
+    return int(pdf2image.pdfinfo_from_path(path, **kwargs)["Pages"])
+
+
+def render_pdf_page(path, page_number, dpi=DEFAULT_DPI, poppler_path=None, doc=None):
+    """Render one page (1-based) of a PDF as an RGB PIL image."""
+    with span("pdf.render_page"):
+        return _render_pdf_page(path, page_number, dpi, poppler_path, doc)
+
+
+def _render_pdf_page(path, page_number, dpi, poppler_path, doc):
+    if _use_pymupdf():
+        own_doc = doc is None
+        doc = doc or fitz.open(path)
+        try:
+            pix = doc[page_number - 1].get_pixmap(dpi=dpi, alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        finally:
+            if own_doc:
+                doc.close()
+
+    kwargs = {"dpi": dpi, "first_page": page_number, "last_page": page_number}
+    if poppler_path:
+        kwargs["poppler_path"] = poppler_path
+    page = pdf2image.convert_from_path(path, **kwargs)[0].convert("RGB")
+    page.load()
+    return page
+
+
+def pdf_text_layer(path):
+    """Embedded text of every page (reading order), or None without PyMuPDF."""
+    if not pymupdf_installed():
+        return None
+    with fitz.open(path) as doc:
+        return [page.get_text("text", sort=True) for page in doc]
+
+
+def iter_pdf_pages(path, dpi=DEFAULT_DPI, poppler_path=None):
+    """Yield the pages of a PDF one at a time."""
+    if _use_pymupdf():
+        with fitz.open(path) as doc:
+            for page_number in range(1, doc.page_count + 1):
+                yield render_pdf_page(path, page_number, dpi=dpi, doc=doc)
+        return
+    for page_number in range(1, pdf_page_count(path, poppler_path) + 1):
+        yield render_pdf_page(path, page_number, dpi=dpi, poppler_path=poppler_path)
+
+
+class PageStore:
+    """Bounded LRU of rendered pages, keyed by (path, page number), shared across threads."""
+
+    def __init__(self, dpi=DEFAULT_DPI, poppler_path=None, spill_dir=None, max_bytes=None):
+        self.dpi = dpi
+        self.poppler_path = poppler_path
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PAGE_STORE_MAX_MB", "128")) * 1024 * 1024
+        self.max_bytes = max_bytes
+
+        # (path, page) -> PIL image, least recently used first
+        self._pages = OrderedDict()
+        self._bytes = 0
+        # (path, page) -> png path for pages spilled to disk
+        self._spilled = {}
+        self._render_s = {}
+        self._page_counts = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        # path -> {"resident_bytes", "peak_resident_bytes"}
+        self._documents = {}
+        self._counters = {"pages_rendered": 0, "hits": 0, "spill_hits": 0, "evictions": 0,
+                          "render_seconds": 0.0, "seconds_saved": 0.0, "peak_resident_bytes": 0}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def page_count(self, path):
+        key = os.path.abspath(path)
+        with self._key_lock((key, 0)):
+            if key not in self._page_counts:
+                self._page_counts[key] = pdf_page_count(path, self.poppler_path)
+            return self._page_counts[key]
+
+    def _track(self, path, delta):
+        doc = self._documents.setdefault(path, {"resident_bytes": 0, "peak_resident_bytes": 0})
+        doc["resident_bytes"] += delta
+        doc["peak_resident_bytes"] = max(doc["peak_resident_bytes"], doc["resident_bytes"])
+
+    def _insert(self, key, page):
+        """Add a page to the in-memory LRU and evict (or spill) the oldest beyond max_bytes."""
+        evicted = []
+        with self._lock:
+            size = page_nbytes(page)
+            self._pages[key] = page
+            self._bytes += size
+            self._track(key[0], size)
+            # Always keep the newest page, even if it alone exceeds the cap
+            while self._bytes > self.max_bytes and len(self._pages) > 1:
+                old_key, old_page = self._pages.popitem(last=False)
+                old_size = page_nbytes(old_page)
+                self._bytes -= old_size
+                self._track(old_key[0], -old_size)
+                self._counters["evictions"] += 1
+                evicted.append((old_key, old_page))
+            self._counters["peak_resident_bytes"] = max(self._counters["peak_resident_bytes"], self._bytes)
+
+        if self.spill_dir:
+            for (path, number), old_page in evicted:
+                stem = f"{abs(hash(path))}_{os.path.splitext(os.path.basename(path))[0]}"
+                png_path = os.path.join(self.spill_dir, f"{stem}_page{number}.png")
+                old_page.save(png_path, format="PNG")
+                with self._lock:
+                    self._spilled[(path, number)] = png_path
+
+    def get_page(self, path, page_number):
+        """One page (1-based), rendered at most once while it is cached or spilled."""
+        key = (os.path.abspath(path), page_number)
+        with self._key_lock(key):
+            with self._lock:
+                page = self._pages.get(key)
+                if page is not None:
+                    self._pages.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["seconds_saved"] += self._render_s.get(key, 0.0)
+                    return page
+                png_path = self._spilled.get(key)
+
+            if png_path is not None:
+                page = Image.open(png_path).convert("RGB")
+                with self._lock:
+                    self._counters["spill_hits"] += 1
+                    self._counters["seconds_saved"] += self._render_s.get(key, 0.0)
+                return page
+
+            start = time.perf_counter()
+            page = render_pdf_page(path, page_number, dpi=self.dpi, poppler_path=self.poppler_path)
+            render_s = time.perf_counter() - start
+            with self._lock:
+                self._render_s[key] = render_s
+                self._counters["pages_rendered"] += 1
+                self._counters["render_seconds"] += render_s
+            self._insert(key, page)
+            return page
+
+    def iter_pages(self, path):
+        """Yield the pages of a PDF one at a time through the store."""
+        for page_number in range(1, self.page_count(path) + 1):
+            yield self.get_page(path, page_number)
+
+    def get_pages(self, path):
+        """All pages of a PDF as a list (holds the whole document; prefer iter_pages)."""
+        return list(self.iter_pages(path))
+
+    def clear(self):
+        """Drop every cached page (and spilled file)."""
+        with self._lock:
+            spilled = list(self._spilled.values())
+            self._pages.clear()
+            self._spilled.clear()
+            self._bytes = 0
+            self._key_locks.clear()
+        if self.spill_dir:
+            for png_path in spilled:
+                try:
+                    os.remove(png_path)
+                except OSError:
+                    pass
+            try:
+                os.rmdir(self.spill_dir)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        mb = 1024 * 1024
+        with self._lock:
+            return {
+                **self._counters,
+                "render_seconds": round(self._counters["render_seconds"], 3),
+                "seconds_saved": round(self._counters["seconds_saved"], 3),
+                "peak_resident_mb": round(self._counters["peak_resident_bytes"] / mb, 1),
+                "documents": {
+                    os.path.basename(path): {
+                        "pages": self._page_counts.get(path),
+                        "peak_resident_mb": round(doc["peak_resident_bytes"] / mb, 1),
+                    }
+                    for path, doc in self._documents.items()
+                },
+            }
@@ -0,0 +1,199 @@
+# ============================================================
+# 🔹 Workflow Result Cache
+# ============================================================
+# Content-addressed cache of complete workflow results. The key is a hash of
+# every input document plus AA_data.json, a pipeline/model version tag and
+# the loan the results belong to, so a rerun with identical inputs returns
+# the stored results immediately. Results hold per-loan GradCAM S3 keys and
+# the loan decision, so identical uploads under another loan ID never share
+# an entry.
+#
+# Like the OCR cache, the directory is bounded: total size is capped with
+# least-recently-used eviction and entries expire RESULT_CACHE_TTL_HOURS after
+# they were written.
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+# Bump whenever prompts, scoring logic or result format change
+PIPELINE_VERSION = "4"
+
+TAMPER_MODEL_TAG = "resnet50-imagenet"
+
+INPUT_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg')
+AA_DATA_FILENAME = "AA_data.json"
+
+DEFAULT_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024
+# 0 keeps entries until the size cap evicts them
+DEFAULT_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_HOURS", "720")) * 3600
+# Expired entries are swept at most this often, or whenever a write goes over the size cap
+DEFAULT_SWEEP_SECONDS = float(os.getenv("RESULT_CACHE_SWEEP_SECONDS", "600"))
+
+
+def llm_provider_tag(model) -> str:
+    """Class and model_id of the strands Model answering the LLM calls (Bedrock or e.g. a local mock)."""
+    if model is None:
+        return ""
+    provider = f"{type(model).__module__}.{type(model).__qualname__}"
+    try:
+        model_id = (model.get_config() or {}).get("model_id")
+    except Exception:
+        model_id = None
+    return f"{provider}:{model_id}" if model_id else provider
+
+
+def pipeline_version_tag(llm_model_name: str, tamper_backend: str = "eager", forensics_max_pixels=None,
+                         refine_margin=None, llm_provider: str = "") -> str:
+    # Backends differ slightly in scores (int8 most), and so do forensics resolution
+    # caps, so each setting keeps its own entries. The provider keeps mock-LLM
+    # benchmark runs apart from real Bedrock runs sharing a cache directory.
+    return (
+        f"pipeline={PIPELINE_VERSION}|llm={llm_model_name}|provider={llm_provider}|tamper={TAMPER_MODEL_TAG}"
+        f"|backend={tamper_backend}|forensics_max_pixels={forensics_max_pixels}|refine_margin={refine_margin}"
+    )
+
+
+def _file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compute_input_digest(documents_folder: str, version_tag: str, scope: str = "") -> str:
+    """SHA-256 over ``scope`` and (name, content hash) of every workflow input in the folder."""
+    h = hashlib.sha256(version_tag.encode("utf-8"))
+    h.update(b"\0" + scope.encode("utf-8") + b"\0")
+    names = sorted(
+        f for f in os.listdir(documents_folder)
+        if f.lower().endswith(INPUT_EXTENSIONS) or f == AA_DATA_FILENAME
+    )
+    for name in names:
+        h.update(b"\0" + name.encode("utf-8") + b"\0")
+        h.update(_file_sha256(os.path.join(documents_folder, name)).encode("ascii"))
+    return h.hexdigest()
+
+
+class WorkflowResultCache:
+    """Stores workflow results as one JSON file per input digest, size-capped with LRU eviction."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 sweep_seconds=DEFAULT_SWEEP_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+        # key -> (size in bytes, written at), least recently used first. Rebuilt from
+        # file atimes (last use) and mtimes (write time) on start; expired files are dropped.
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                st = os.stat(os.path.join(cache_dir, name))
+                entries.append((st.st_atime, name[:-5], st.st_size, st.st_mtime))
+        for _, key, size, written_at in sorted(entries):
+            if self._expired(written_at):
+                self._remove(key)
+                continue
+            self._index[key] = (size, written_at)
+            self._total_bytes += size
+
+    def _expired(self, written_at):
+        return self.ttl_seconds > 0 and time.time() - written_at > self.ttl_seconds
+
+    def _remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def key_for(self, documents_folder: str, llm_model_name: str, loan_id=None, artifact_prefix=None,
+                tamper_backend="eager", forensics_max_pixels=None, refine_margin=None, llm_provider="") -> str:
+        scope = f"loan={loan_id or ''}|artifacts={artifact_prefix or ''}"
+        version_tag = pipeline_version_tag(llm_model_name, tamper_backend=tamper_backend,
+                                           forensics_max_pixels=forensics_max_pixels, refine_margin=refine_margin,
+                                           llm_provider=llm_provider)
+        return compute_input_digest(documents_folder, version_tag, scope)
+
+    def get(self, key: str):
+        with self._lock:
+            indexed = self._index.get(key)
+            expired = indexed is not None and self._expired(indexed[1])
+            if expired:
+                del self._index[key]
+                self._total_bytes -= indexed[0]
+                self.expired += 1
+                self.misses += 1
+            elif indexed is not None:
+                self._index.move_to_end(key)
+        if expired:
+            self._remove(key)
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # Record the use in atime (LRU order across restarts); mtime stays the write time for the TTL
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["results"]
+
+    def put(self, key: str, results: dict):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        cached_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        entry = {"cached_at": cached_at, "results": results}
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        now = time.time()
+
+        evicted = []
+        with self._lock:
+            old = self._index.pop(key, None)
+            self._total_bytes += size - (old[0] if old else 0)
+            self._index[key] = (size, now)
+            if self._total_bytes > self.max_bytes or now - self._last_sweep >= self.sweep_seconds:
+                self._last_sweep = now
+                for old_key, (old_size, written_at) in list(self._index.items()):
+                    if old_key != key and self._expired(written_at):
+                        del self._index[old_key]
+                        self._total_bytes -= old_size
+                        self.expired += 1
+                        evicted.append(old_key)
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, (old_size, _) = self._index.popitem(last=False)
+                self._total_bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._remove(old_key)
@@ -0,0 +1,156 @@
+# ============================================================
+# 🔹 Stage Latency Telemetry
+# ============================================================
+# span("stage") times a block of work and records it twice:
+#   - in a process-wide histogram (lendiq_stage_duration_seconds{stage, status}),
+#     exposed in Prometheus text format by the API's /metrics endpoint
+#     (prometheus_client when installed, a small built-in histogram otherwise)
+#   - in the current WorkflowTrace, if one is active, for the per-workflow
+#     timing breakdown returned with the results
+# The active trace lives in a contextvar; work handed to a thread pool must be
+# wrapped with in_context(fn) to stay attached to the workflow that queued it.
+
+import contextlib
+import contextvars
+import threading
+import time
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+
+METRIC_NAME = "lendiq_stage_duration_seconds"
+METRIC_HELP = "Duration of workflow stages (nodes, LLM calls, OCR, model passes, S3 operations)"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TEXT_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class StageHistogram:
+    """Minimal Prometheus-style histogram used when prometheus_client is not installed."""
+
+    def __init__(self, name, documentation, buckets=BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # (stage, status) -> [bucket counts..., +Inf count], sum
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, status, seconds):
+        with self._lock:
+            counts, total = self._series.get((stage, status), ([0] * (len(self.buckets) + 1), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._series[(stage, status)] = (counts, total + seconds)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for (stage, status), (counts, total) in series:
+            labels = f'stage="{stage}",status="{status}"'
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {counts[-1]}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {counts[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+if prometheus_client is not None:
+    _histogram = prometheus_client.Histogram(METRIC_NAME, METRIC_HELP, ["stage", "status"], buckets=BUCKETS)
+
+    def _observe(stage, status, seconds):
+        _histogram.labels(stage=stage, status=status).observe(seconds)
+else:
+    _histogram = StageHistogram(METRIC_NAME, METRIC_HELP)
+    _observe = _histogram.observe
+
+
+def metrics_payload():
+    """(body bytes, content type) for a /metrics response."""
+    if prometheus_client is not None:
+        return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+    return _histogram.render().encode("utf-8"), TEXT_CONTENT_TYPE
+
+
+# -----------------------------
+# Per-workflow traces
+# -----------------------------
+class WorkflowTrace:
+    """Every span finished while this trace was active, from any thread."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, stage, start, seconds, status):
+        with self._lock:
+            self.spans.append({
+                "stage": stage,
+                "start_s": round(start - self.started, 4),
+                "duration_s": round(seconds, 4),
+                "status": status,
+                "thread": threading.current_thread().name,
+            })
+
+    def summary(self) -> dict:
+        """Per-stage count/total/max seconds, slowest stages first."""
+        with self._lock:
+            spans = list(self.spans)
+        stages = {}
+        for s in spans:
+            entry = stages.setdefault(s["stage"], {"count": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["total_s"] += s["duration_s"]
+            entry["max_s"] = max(entry["max_s"], s["duration_s"])
+            entry["errors"] += s["status"] == "error"
+        for entry in stages.values():
+            entry["total_s"] = round(entry["total_s"], 4)
+        return {
+            "total_s": round(time.perf_counter() - self.started, 4),
+            "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["total_s"])),
+        }
+
+
+_current_trace = contextvars.ContextVar("workflow_trace", default=None)
+
+
+@contextlib.contextmanager
+def trace_workflow():
+    """Collect the spans of one workflow run (this thread and in_context-wrapped work)."""
+    trace = WorkflowTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextlib.contextmanager
+def span(stage):
+    """Time a block as ``stage``; recorded as status="error" if it raises."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        _observe(stage, status, seconds)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, start, seconds, status)
+
+
+def in_context(fn):
+    """Bind fn to a copy of the caller's context (active trace) for running on another thread."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
@@ -0,0 +1,78 @@
+"""Parity of the tamper model backends against eager fp32 on a fixed page corpus."""
+
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+pytest.importorskip("cv2")
+Image = pytest.importorskip("PIL.Image")
+
+import forensics
+from inference_backends import EagerBackend, create_backend
+from inference_batcher import max_softmax_probs
+
+CORPUS_DIR = Path(__file__).parent / "data" / "backend_corpus"
+
+# Max |model_prob| difference from eager; int8 trades a little accuracy for speed
+TOLERANCES = {"torchscript": 1e-3, "onnx": 1e-3, "int8": 0.05}
+
+
+@pytest.fixture(scope="module")
+def model():
+    from da_strands import load_resnet50
+    try:
+        return load_resnet50(torch.device("cpu"))
+    except Exception as e:
+        pytest.skip(f"pretrained ResNet50 weights unavailable: {e}")
+
+
+@pytest.fixture(scope="module")
+def corpus_tensors():
+    tensors = []
+    for path in sorted(CORPUS_DIR.glob("*.png")):
+        orig_input, ela_input, _ = forensics.page_features(Image.open(path).convert("RGB"))
+        tensors.extend([torch.from_numpy(orig_input), torch.from_numpy(ela_input)])
+    assert tensors, "backend parity corpus is empty"
+    return tensors
+
+
+@pytest.fixture(scope="module")
+def reference_probs(model, corpus_tensors):
+    return max_softmax_probs(EagerBackend(model), corpus_tensors)
+
+
+def _backend_options(name, corpus_tensors, tmp_path):
+    if name == "onnx":
+        pytest.importorskip("onnxruntime")
+        return {"onnx_path": str(tmp_path / "resnet50_features.onnx")}
+    if name == "int8":
+        if not any(e in torch.backends.quantized.supported_engines for e in ("x86", "fbgemm", "qnnpack")):
+            pytest.skip("no quantized CPU engine")
+        return {"calibration_inputs": corpus_tensors}
+    return {}
+
+
+@pytest.mark.parametrize("name", sorted(TOLERANCES))
+def test_backend_matches_eager(name, model, corpus_tensors, reference_probs, tmp_path):
+    backend = create_backend(name, model, **_backend_options(name, corpus_tensors, tmp_path))
+    # create_backend falls back to eager on errors; that must not count as a pass
+    assert backend.name == name, f"{name} backend fell back to {backend.name}"
+
+    probs = max_softmax_probs(backend, corpus_tensors)
+    diffs_orig = [abs(a - b) for a, b in zip(probs[0::2], reference_probs[0::2])]
+    diffs_ela = [abs(a - b) for a, b in zip(probs[1::2], reference_probs[1::2])]
+    assert max(diffs_orig) <= TOLERANCES[name], f"model_prob_orig drift {max(diffs_orig):.5f}"
+    assert max(diffs_ela) <= TOLERANCES[name], f"model_prob_ela drift {max(diffs_ela):.5f}"
+
+
+def test_features_match_eager(model, corpus_tensors):
+    """GradCAM reads layer4 activations from the scoring pass; TorchScript must return the same ones."""
+    backend = create_backend("torchscript", model)
+    assert backend.name == "torchscript"
+    batch = torch.stack(corpus_tensors[:2])
+    with torch.no_grad():
+        _, expected = EagerBackend(model).run(batch, keep_features=True)
+        _, features = backend.run(batch, keep_features=True)
+    assert torch.allclose(features, expected, rtol=1e-3, atol=1e-2)
@@ -0,0 +1,105 @@
+"""JobQueue: restart recovery and the queue-depth limit behind /jobs' 429."""
+
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, LocalJobStore, QueueFullError
+
+
+def _wait_for(queue, job_id, statuses=("completed", "failed"), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job is not None and job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    pytest.fail(f"job {job_id} did not reach {statuses}")
+
+
+def _stored_job(job_id, status, created_at):
+    return {
+        "job_id": job_id,
+        "status": status,
+        "payload": {"customer_id": job_id},
+        "created_at": created_at,
+        "started_at": "2026-01-01T00:00:00Z" if status != "queued" else None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+
+
+def test_unfinished_jobs_are_recovered_on_start(tmp_path):
+    store = LocalJobStore(str(tmp_path))
+    store.save(_stored_job("queued-job", "queued", "2026-01-01T00:00:01Z"))
+    store.save(_stored_job("running-job", "running", "2026-01-01T00:00:00Z"))
+    done = _stored_job("done-job", "completed", "2026-01-01T00:00:02Z")
+    done["result"] = {"status": "success"}
+    store.save(done)
+
+    ran = []
+    queue = JobQueue(lambda payload, emit: ran.append(payload["customer_id"]) or {"ok": True}, store, concurrency=1)
+    queue.start()
+    try:
+        for job_id in ("queued-job", "running-job"):
+            job = _wait_for(queue, job_id)
+            assert job["status"] == "completed"
+            assert job["result"] == {"ok": True}
+    finally:
+        queue.shutdown()
+
+    # Oldest first, and finished jobs are not rerun
+    assert ran == ["running-job", "queued-job"]
+    assert store.load("done-job")["result"] == {"status": "success"}
+
+
+def test_submit_rejects_jobs_beyond_max_depth(tmp_path):
+    # No workers started, so submitted jobs stay queued
+    queue = JobQueue(lambda payload, emit: None, LocalJobStore(str(tmp_path)), max_queue_depth=2)
+    queue.submit({"customer_id": "a"})
+    queue.submit({"customer_id": "b"})
+    assert queue.pending_count() == 2
+
+    with pytest.raises(QueueFullError):
+        queue.submit({"customer_id": "c"})
+    assert queue.pending_count() == 2
+
+
+def test_running_jobs_do_not_count_towards_depth(tmp_path):
+    release = threading.Event()
+    queue = JobQueue(lambda payload, emit: release.wait(5), LocalJobStore(str(tmp_path)),
+                     concurrency=1, max_queue_depth=1)
+    queue.start()
+    try:
+        first = queue.submit({"customer_id": "a"})
+        _wait_for(queue, first["job_id"], statuses=("running",))
+        second = queue.submit({"customer_id": "b"})
+        with pytest.raises(QueueFullError):
+            queue.submit({"customer_id": "c"})
+        release.set()
+        _wait_for(queue, second["job_id"])
+    finally:
+        release.set()
+        queue.shutdown()
+
+
+def test_failed_job_records_error_and_events(tmp_path):
+    def handler(payload, emit):
+        emit({"event": "node_started", "node": "doc_analyzer"})
+        raise RuntimeError("documents missing")
+
+    queue = JobQueue(handler, LocalJobStore(str(tmp_path)), concurrency=1)
+    queue.start()
+    try:
+        job = queue.submit({"customer_id": "a"})
+        finished = _wait_for(queue, job["job_id"])
+    finally:
+        queue.shutdown()
+
+    assert finished["status"] == "failed"
+    assert finished["error"] == "documents missing"
+    events, done = queue.events_since(job["job_id"])
+    assert [e["event"] for e in events] == ["job_started", "node_started", "job_failed"]
+    assert done
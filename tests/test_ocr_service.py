@@ -0,0 +1,157 @@
+"""OCRService disk cache: hits, expiry, LRU eviction and directory permissions."""
+
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+import ocr_service
+from ocr_service import OCRService
+
+
+class FakePage:
+    """Just enough of a PIL image for page_digest."""
+
+    def __init__(self, data: bytes):
+        self.mode = "L"
+        self.size = (len(data), 1)
+        self._data = data
+
+    def tobytes(self):
+        return self._data
+
+
+class FakeTesseract:
+    def __init__(self, text="x" * 100):
+        self.text = text
+        self.calls = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def get_tesseract_version(self):
+        return "5.3.0"
+
+    def image_to_string(self, pil_img, lang=None, config=""):
+        with self._lock:
+            self.calls += 1
+        if self.fail:
+            raise RuntimeError("tesseract crashed")
+        return self.text
+
+
+@pytest.fixture
+def tesseract(monkeypatch):
+    fake = FakeTesseract()
+    monkeypatch.setattr(ocr_service, "pytesseract", fake)
+    return fake
+
+
+def _cached_keys(cache_dir):
+    return sorted(name[:-4] for name in os.listdir(cache_dir) if name.endswith(".txt"))
+
+
+def test_repeat_page_is_a_hit(tmp_path, tesseract):
+    svc = OCRService(str(tmp_path / "ocr"))
+    page = FakePage(b"payslip")
+
+    assert svc.image_to_string(page) == tesseract.text
+    assert svc.image_to_string(FakePage(b"payslip")) == tesseract.text
+    assert tesseract.calls == 1
+    assert svc.stats()["hits"] == 1
+    assert svc.stats()["misses"] == 1
+
+    # Another OCR config is a different entry
+    svc.image_to_string(page, config="--psm 6")
+    assert tesseract.calls == 2
+
+
+def test_entries_survive_restart(tmp_path, tesseract):
+    cache_dir = str(tmp_path / "ocr")
+    OCRService(cache_dir).image_to_string(FakePage(b"page"))
+
+    svc = OCRService(cache_dir)
+    assert svc.image_to_string(FakePage(b"page")) == tesseract.text
+    assert tesseract.calls == 1
+    assert svc.stats()["entries"] == 1
+
+
+def test_concurrent_requests_run_tesseract_once(tmp_path, tesseract):
+    svc = OCRService(str(tmp_path / "ocr"))
+    threads = [threading.Thread(target=svc.image_to_string, args=(FakePage(b"same"),)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert tesseract.calls == 1
+
+
+def test_expired_entry_is_rerun(tmp_path, tesseract):
+    svc = OCRService(str(tmp_path / "ocr"), ttl_seconds=0.05)
+    svc.image_to_string(FakePage(b"page"))
+    time.sleep(0.1)
+
+    svc.image_to_string(FakePage(b"page"))
+    assert tesseract.calls == 2
+    assert svc.stats()["expired"] == 1
+
+
+def test_expired_files_are_dropped_on_start(tmp_path, tesseract):
+    cache_dir = str(tmp_path / "ocr")
+    OCRService(cache_dir).image_to_string(FakePage(b"page"))
+    (key,) = _cached_keys(cache_dir)
+    old = time.time() - 3600
+    os.utime(os.path.join(cache_dir, f"{key}.txt"), (old, old))
+
+    svc = OCRService(cache_dir, ttl_seconds=60)
+    assert _cached_keys(cache_dir) == []
+    assert svc.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, tesseract):
+    cache_dir = str(tmp_path / "ocr")
+    # Room for two 100-byte entries
+    svc = OCRService(cache_dir, max_bytes=250)
+    first, second, third = FakePage(b"1"), FakePage(b"2"), FakePage(b"3")
+    svc.image_to_string(first)
+    svc.image_to_string(second)
+    svc.image_to_string(first)  # first is now the most recently used
+    svc.image_to_string(third)
+
+    assert svc.stats()["evictions"] == 1
+    assert svc.stats()["bytes"] <= 250
+    assert svc.cache_key(second) not in _cached_keys(cache_dir)
+    assert svc.cache_key(first) in _cached_keys(cache_dir)
+
+    svc.image_to_string(first)
+    assert tesseract.calls == 3
+
+
+def test_errors_are_not_cached(tmp_path, tesseract):
+    svc = OCRService(str(tmp_path / "ocr"))
+    tesseract.fail = True
+    with pytest.raises(RuntimeError):
+        svc.image_to_string(FakePage(b"page"))
+    assert svc.stats()["errors"] == 1
+
+    tesseract.fail = False
+    assert svc.image_to_string(FakePage(b"page")) == tesseract.text
+    assert tesseract.calls == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_is_private(tmp_path, tesseract):
+    cache_dir = tmp_path / "ocr"
+    svc = OCRService(str(cache_dir))
+    svc.image_to_string(FakePage(b"page"))
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    for path in cache_dir.iterdir():
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    # An existing dir this process owns is tightened
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o755)
+    os.chmod(shared, 0o755)
+    OCRService(str(shared))
+    assert stat.S_IMODE(shared.stat().st_mode) == 0o700
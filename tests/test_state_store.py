@@ -0,0 +1,78 @@
+"""SQLite application state store: idempotent transitions, imports and metadata."""
+
+import threading
+
+import pytest
+
+# state_store imports botocore for the S3 backend
+pytest.importorskip("botocore")
+
+from state_store import (
+    STATUS_APPROVED,
+    STATUS_ESCALATED,
+    STATUS_NEW,
+    SQLiteApplicationStateStore,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteApplicationStateStore(str(tmp_path / "state.db"))
+
+
+def test_transition_is_idempotent(store):
+    assert store.transition("LID1", STATUS_NEW) is True
+    assert store.transition("LID1", STATUS_NEW) is False
+    assert store.get_status("LID1") == STATUS_NEW
+
+    assert store.transition("LID1", STATUS_APPROVED) is True
+    assert store.transition("LID1", STATUS_APPROVED) is False
+    assert store.get_status("LID1") == STATUS_APPROVED
+    assert store.list_by_status(STATUS_NEW) == []
+    assert store.list_by_status(STATUS_APPROVED) == ["LID1"]
+
+
+def test_repeated_transition_keeps_list_order(store):
+    store.transition("LID1", STATUS_ESCALATED)
+    store.transition("LID2", STATUS_ESCALATED)
+    # A no-op transition must not bump LID1 behind LID2
+    store.transition("LID1", STATUS_ESCALATED)
+    assert store.list_by_status(STATUS_ESCALATED) == ["LID1", "LID2"]
+
+
+def test_concurrent_transitions_apply_once(store):
+    results = []
+    lock = threading.Lock()
+
+    def approve():
+        changed = store.transition("LID1", STATUS_APPROVED)
+        with lock:
+            results.append(changed)
+
+    threads = [threading.Thread(target=approve) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(True) == 1
+    assert store.get_status("LID1") == STATUS_APPROVED
+
+
+def test_import_does_not_reset_known_ids(store):
+    store.transition("LID1", STATUS_APPROVED)
+    imported = store.import_lists({
+        STATUS_NEW: ["LID1", "LID2", "LID3"],
+        STATUS_ESCALATED: ["LID4"],
+    })
+    assert imported == 3
+    assert store.get_status("LID1") == STATUS_APPROVED
+    assert store.list_by_status(STATUS_NEW) == ["LID2", "LID3"]
+    assert store.import_lists({STATUS_NEW: ["LID2", "LID3"]}) == 0
+
+
+def test_meta_round_trip(store):
+    assert store.get_meta("legacy_s3_import_at") is None
+    store.set_meta("legacy_s3_import_at", "1")
+    store.set_meta("legacy_s3_import_at", "2")
+    assert store.get_meta("legacy_s3_import_at") == "2"